@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.api.v1 import deps
 from app import models
+from app.core.clients import get_embedding_cache
+from app.services.corpus_manager import corpus_manager
 
 router = APIRouter()
 
@@ -37,4 +39,38 @@ def get_all_users(
 ):
     """Lấy danh sách toàn bộ user"""
     users = db.query(models.User).offset(skip).limit(limit).all()
-    return users
\ No newline at end of file
+    return users
+
+
+@router.get("/corpus")
+def get_corpus_version(
+    current_user: models.User = Depends(deps.get_current_admin),
+):
+    """Phiên bản corpus luật đang phục vụ tìm kiếm"""
+    corpus_manager.get()
+    return corpus_manager.info()
+
+
+@router.get("/embedding-cache")
+def get_embedding_cache_stats(
+    current_user: models.User = Depends(deps.get_current_admin),
+):
+    """Tỉ lệ trúng cache embedding câu truy vấn (bộ nhớ và Redis) của worker này"""
+    return get_embedding_cache().stats()
+
+
+@router.post("/corpus/reload", status_code=202)
+async def reload_corpus(
+    background_tasks: BackgroundTasks,
+    current_user: models.User = Depends(deps.get_current_admin),
+):
+    """
+    Nạp lại corpus luật (snapshot hoặc JSON) ở background rồi hoán đổi nguyên tử.
+    Request đang chạy vẫn dùng phiên bản cũ cho đến khi kết thúc.
+    Các worker khác nhận yêu cầu qua file đánh dấu cạnh snapshot và nạp lại
+    trong vòng vài giây (RELOAD_POLL_INTERVAL); thông tin trả về là của worker này.
+    """
+    corpus_manager.request_reload()
+    if not corpus_manager.reloading:
+        background_tasks.add_task(corpus_manager.reload_async)
+    return corpus_manager.info()
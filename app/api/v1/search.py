@@ -1,30 +1,96 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import Optional, Literal
+from fastapi.responses import Response
+from typing import Optional, Literal, Set
 from sqlalchemy.orm import Session
 import json
 
-from app.schemas.search import SearchQuery, SearchResponse, LawDetailResponse
-from app.services.search_service import search_laws, get_law_detail
-from app.services.json_search_service import search_json_laws, get_json_law_detail
+from app.schemas.search import (
+    SearchQuery,
+    SearchResponse,
+    SearchFilters,
+    SuggestResponse,
+    LawDetailResponse,
+    LawItem,
+)
+from app.services.search_service import search_laws_page, get_law_detail
+from app.services.hybrid_search_service import hybrid_search_page
+from app.services.json_search_service import (
+    search_json_page,
+    search_citation_page,
+    suggest_json_laws,
+    get_json_law_detail,
+)
+from app.services.corpus_manager import corpus_manager
 from app.services.tracking_service import TrackingService
 from app.utils.slug_generator import create_law_slug
 from app import models
 from app.api.v1 import deps
 from app.core.redis_client import cache_search_results, get_cached_search
+from app.utils.search_cursor import InvalidCursorError
 
 router = APIRouter()
 
+# Result fields returned by view=compact: everything but the full article text
+COMPACT_FIELDS = set(LawItem.model_fields) - {"content"}
+
+
+def _result_fields(view: str, fields: Optional[str]) -> Optional[Set[str]]:
+    """
+    LawItem fields to serialize, or None for all of them.
+
+    Raises:
+        HTTPException: 422 listing the allowed fields when `fields` names
+            an unknown field or none at all
+    """
+    if fields:
+        names = {name.strip() for name in fields.split(",")} - {""}
+        unknown = names - set(LawItem.model_fields)
+        if unknown or not names:
+            raise HTTPException(status_code=422, detail={
+                "message": f"Unknown result fields: {', '.join(sorted(unknown))}" if unknown else "No result fields",
+                "allowed_fields": sorted(LawItem.model_fields),
+            })
+        return names
+    if view == "compact":
+        return COMPACT_FIELDS
+    return None
+
+
+def _search_response(response: SearchResponse, include: Optional[Set[str]]):
+    """Serialize only the requested result fields (full content is the bulk of a page)."""
+    if include is None:
+        return response
+    body = response.model_dump_json(include={
+        "results": {"__all__": include},
+        "total": True,
+        "total_exact": True,
+        "next_cursor": True,
+        "facets": True,
+        "filters_applied": True,
+        "source": True,
+    })
+    return Response(content=body, media_type="application/json")
+
 
 @router.post("/search", response_model=SearchResponse)
 async def search(
     keyword: str = Query(..., min_length=1),
-    mode: Literal["fast", "semantic"] = Query("fast", description="fast=JSON file, semantic=Qdrant"),
+    mode: Literal["fast", "semantic", "hybrid"] = Query(
+        "fast", description="fast=JSON file, semantic=Qdrant, hybrid=both fused by rank"
+    ),
     type_filter: Optional[str] = Query(None, description="Loại văn bản (Luật, Nghị định, etc.)"),
     year_filter: Optional[str] = Query(None, description="Năm ban hành"),
     authority_filter: Optional[str] = Query(None, description="Cơ quan ban hành"),
     article_filter: Optional[str] = Query(None, description="Số điều"),
+    law_filter: Optional[str] = Query(None, description="Tên văn bản (facet law_name, fast mode)"),
+    chapter_filter: Optional[str] = Query(None, description="Chương (facet chapter, fast mode)"),
+    article_range_filter: Optional[str] = Query(None, description="Khoảng điều (facet article_range, fast mode)"),
+    facets: bool = Query(False, description="Include hit counts per facet value (fast mode)"),
     skip: int = Query(0, ge=0, description="Number of results to skip"),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    view: Literal["full", "compact"] = Query("full", description="compact=omit full article content"),
+    fields: Optional[str] = Query(None, description="Comma-separated result fields, e.g. key,id,title,snippet"),
 ):
     """
     Search for laws with advanced filters
@@ -35,94 +101,181 @@ async def search(
     - Filter by year
     - Filter by authority
     - Filter by article number
+    - Filter by law, chapter and article range, with `facets=true` returning
+      the hit count of every value of those facets (fast mode)
+    - Pagination by skip/limit, or by passing back `next_cursor` as `cursor`
+      (each page then costs O(limit) instead of O(skip + limit))
+    
+    `total` counts matches across all pages (an estimate when `total_exact`
+    is false, as in semantic and hybrid mode).
+    
+    Hybrid mode runs the keyword index (articles sharing any term with the
+    keyword, so whole questions work) and Qdrant concurrently and merges
+    them with reciprocal rank fusion: exact statutory terms and paraphrases
+    are both found, in about the time of the slower search. Each ranking
+    goes at most 200 results deep, so hybrid pages past the fused
+    candidates are empty.
+    
+    A keyword that is only a citation ("Điều 123 Bộ luật Hình sự", "khoản 2
+    Điều 5 LDN") returns the cited article directly in any mode, with
+    the cited clause or point as its snippet (`source` is "citation"),
+    unless a filter is set: filtered citations are searched like any keyword.
+    
+    Each result carries a `snippet` around the query terms with `highlights`
+    offsets. Use `view=compact` to leave out the full `content`, or `fields`
+    to pick exactly which result fields are returned (unknown names are a
+    422 listing the allowed ones).
     
     Try to lookup by slug first if it looks like a slug (contains hyphens and lowercase)
     """
+    # Unknown field names are a client error, not an empty result
+    include = _result_fields(view, fields)
     try:
+        # Pin one corpus version for the whole request; keying the cache on it
+        # lets results from a previous version expire naturally after a reload
+        corpus = corpus_manager.get()
+        corpus_version = corpus.version if corpus else "none"
+        
         # Create cache key based on search parameters
-        cache_key = f"{keyword}|{mode}|{type_filter}|{year_filter}|{authority_filter}|{skip}|{limit}"
+        cache_key = (
+            f"{corpus_version}|{keyword}|{mode}|{type_filter}|{year_filter}|{authority_filter}"
+            f"|{law_filter}|{chapter_filter}|{article_range_filter}|{facets}|{skip}|{limit}|{cursor}"
+        )
+        filters_applied = SearchFilters(
+            law_name=law_filter,
+            document_type=type_filter,
+            article_number=article_filter,
+            year=year_filter,
+            chapter=chapter_filter,
+            article_range=article_range_filter,
+        )
+        
+        # Direct citations resolve by hash lookup, cheaper than a cache round trip.
+        # The cited article is returned as is, so only when no filter could exclude it
+        filtered = type_filter or year_filter or authority_filter or law_filter or chapter_filter or article_range_filter
+        if not (cursor or filtered):
+            page = search_citation_page(keyword, skip=skip, limit=limit, corpus_version=corpus)
+            if page is not None:
+                return _search_response(
+                    SearchResponse(**page.model_dump(), filters_applied=filters_applied, source="citation"), include
+                )
         
         # Check if results are in Redis cache
-        cached_results = get_cached_search(cache_key, mode)
-        if cached_results:
+        cached_page = get_cached_search(cache_key, mode)
+        if cached_page:
             print(f"✓ Search cache HIT for keyword: {keyword} (skip={skip})")
-            return SearchResponse(
-                results=cached_results,
-                total=len(cached_results),
-                source="redis_cache"
+            return _search_response(
+                SearchResponse(**cached_page, filters_applied=filters_applied, source="redis_cache"), include
             )
         
         print(f"○ Search cache MISS for keyword: {keyword} (skip={skip}), searching...")
         
         # Perform search
         if mode == "fast":
-            results = search_json_laws(
+            page = search_json_page(
+                keyword=keyword,
+                type_filter=type_filter,
+                year_filter=year_filter,
+                authority_filter=authority_filter,
+                skip=skip,
+                limit=limit,
+                cursor=cursor,
+                corpus_version=corpus,
+                facet_filters={
+                    "law_name": law_filter,
+                    "chapter": chapter_filter,
+                    "article_range": article_range_filter,
+                },
+                with_facets=facets,
+            )
+        elif mode == "hybrid":
+            page = await hybrid_search_page(
                 keyword=keyword,
                 type_filter=type_filter,
                 year_filter=year_filter,
                 authority_filter=authority_filter,
                 skip=skip,
                 limit=limit,
+                cursor=cursor,
+                corpus_version=corpus,
             )
         else:  # semantic
-            results = await search_laws(
+            page = await search_laws_page(
                 keyword=keyword,
                 type_filter=type_filter,
                 year_filter=year_filter,
                 authority_filter=authority_filter,
                 skip=skip,
                 limit=limit,
+                cursor=cursor,
             )
 
         # Cache results (1 hour TTL = 3600 seconds)
-        cache_search_results(cache_key, mode, results, ttl=3600)
+        cache_search_results(cache_key, mode, page.model_dump(), ttl=3600)
 
-        return SearchResponse(
-            results=results,
-            total=len(results),
-            source="search"
+        return _search_response(
+            SearchResponse(**page.model_dump(), filters_applied=filters_applied, source="search"), include
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search error: {str(e)}")
 
 
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=200, description="Partially typed query"),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """
+    Search-as-you-type completions from the in-memory corpus
+    
+    Completes law names, article ids ("Điều 12") and article titles by
+    prefix, ignoring diacritics. Answered from a sorted in-memory array
+    in microseconds, so it is not cached in Redis.
+    """
+    return SuggestResponse(query=q, suggestions=suggest_json_laws(q, limit))
+
+
 @router.get("/laws/{law_id}", response_model=LawDetailResponse)
 async def get_law(
     law_id: str,
     source: Literal["auto", "json", "qdrant"] = Query("auto", description="Where to fetch from"),
+    law_name: Optional[str] = Query(None, description="Tên văn bản, phân biệt các điều trùng số"),
     db: Session = Depends(deps.get_db),
 ):
     """
-    Get detail of a specific law by ID or slug
-    Supports both law_id (e.g., "Điều 1") and slug (e.g., "dieu-1", "dieu-1-pham-vi-dieu-chinh")
+    Get detail of a specific law by ID, canonical key or slug
+    Supports law_id (e.g., "Điều 1", optionally with law_name), the canonical
+    article key returned as `key` in search results (e.g., "dieu-1-luat-doanh-nghiep-2020")
+    and saved-law slugs
     """
     try:
         law = None
         actual_law_id = law_id
         
-        # Try to lookup by slug first if it looks like a slug (contains hyphens and lowercase)
-        if "-" in law_id and law_id.islower():
-            # This looks like a slug, try to find it in database
-            saved_law = db.query(models.SavedLaw).filter(
-                models.SavedLaw.slug == law_id
-            ).first()
+        # Canonical keys, slugs and (law_name, article_id) resolve in memory
+        if source in ("auto", "json"):
+            law = get_json_law_detail(law_id, law_name)
+        
+        # Otherwise, if it looks like a slug (contains hyphens and lowercase), try saved laws
+        if not law and "-" in law_id and law_id.islower():
+            saved_law = TrackingService.find_saved_law_by_slug(db, law_id)
             if saved_law:
-                actual_law_id = saved_law.law_id
+                # The saved slug is the canonical key; the bare law_id is ambiguous
+                actual_law_id = saved_law.slug
+                if source in ("auto", "json"):
+                    law = get_json_law_detail(saved_law.law_id, saved_law.law_title)
         
-        if source == "json":
-            law = get_json_law_detail(actual_law_id)
-        elif source == "qdrant":
-            law = await get_law_detail(actual_law_id)
-        else:  # auto
-            law = get_json_law_detail(actual_law_id)
-            if not law:
-                law = await get_law_detail(actual_law_id)
+        if not law and source in ("auto", "qdrant"):
+            law = await get_law_detail(actual_law_id, law_name)
 
         if not law:
             raise HTTPException(status_code=404, detail="Law not found")
 
         return LawDetailResponse(
             id=law.id,
+            key=law.key,
             title=law.title,
             type=law.type,
             content=law.content,
@@ -138,6 +291,7 @@ async def get_law(
 @router.post("/laws/{law_id}/save")
 async def save_law_and_create_session(
     law_id: str,
+    law_name: Optional[str] = Query(None, description="Tên văn bản, phân biệt các điều trùng số"),
     db: Session = Depends(deps.get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
@@ -147,18 +301,19 @@ async def save_law_and_create_session(
     """
     try:
         # Lấy law detail
-        law = get_json_law_detail(law_id)
+        law = get_json_law_detail(law_id, law_name)
         if not law:
-            law = await get_law_detail(law_id)
+            law = await get_law_detail(law_id, law_name)
         
         if not law:
             raise HTTPException(status_code=404, detail="Law not found")
         
-        # Save law (with slug generation)
+        # Save law (slug = canonical key, so equal article ids of other laws stay distinct)
         saved_law = TrackingService.save_law(
             db=db,
             user_id=current_user.id,
             law_id=law.id,
+            law_key=law.key,
             law_title=law.title,
             law_type=law.type,
             law_year=law.year,
@@ -166,11 +321,11 @@ async def save_law_and_create_session(
             law_content=law.content,
         )
         
-        # Create law-detail session
+        # Create law-detail session (canonical key keeps the chat context unambiguous)
         session = models.ChatSession(
             user_id=current_user.id,
             session_type="law-detail",
-            law_id=law_id,
+            law_id=law.key or law_id,
             title=f"Chat về {law.title}",
         )
         db.add(session)
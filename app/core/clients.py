@@ -8,25 +8,45 @@ Production-ready:
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Union
 import time
 
-from qdrant_client import QdrantClient
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http.exceptions import UnexpectedResponse, ResponseHandlingException
-from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_core.embeddings import Embeddings
 from langchain_openai import ChatOpenAI
 
 from app.core.config import settings
 from app.core import redis_client
+from app.core.embedding_backend import embedding_model_id, load_embeddings
+from app.core.embedding_batcher import EmbeddingBatcher
+from app.core.embedding_cache import EmbeddingCache
+from app.core.reranker import CrossEncoderReranker
+from app.core.qdrant_schema import ensure_payload_indexes
+from app.services.vector_index import LocalVectorIndex, VectorIndexError
 
 logger = logging.getLogger(__name__)
 
 
 _qdrant_client: Optional[QdrantClient] = None
-_embeddings: Optional[HuggingFaceEmbeddings] = None
+_async_qdrant_client: Optional[AsyncQdrantClient] = None
+_local_vector_index: Optional[LocalVectorIndex] = None
+_embeddings: Optional[Embeddings] = None
+_embedding_batcher: Optional[EmbeddingBatcher] = None
+_embedding_cache: Optional[EmbeddingCache] = None
+_reranker: Optional[CrossEncoderReranker] = None
 _llm: Optional[ChatOpenAI] = None
 
 
+def qdrant_http_limits() -> httpx.Limits:
+    """Connection pool of the async Qdrant client over REST (unused with gRPC)."""
+    return httpx.Limits(
+        max_connections=settings.QDRANT_POOL_SIZE,
+        max_keepalive_connections=settings.QDRANT_POOL_SIZE,
+    )
+
+
 def init_clients() -> None:
     """
     Initialize external services.
@@ -34,7 +54,7 @@ def init_clients() -> None:
     Must be called inside FastAPI lifespan startup.
     """
 
-    global _qdrant_client, _embeddings, _llm
+    global _qdrant_client, _async_qdrant_client, _local_vector_index, _embeddings, _embedding_batcher, _embedding_cache, _reranker, _llm
 
     # ---------------------------
     # Validate critical settings
@@ -50,7 +70,7 @@ def init_clients() -> None:
     # Initialize Qdrant (with retry)
     # ---------------------------
 
-    if _qdrant_client is None:
+    if _qdrant_client is None and settings.VECTOR_STORE != "local":
         max_retries = 5
         retry_delay = 2
         
@@ -59,7 +79,7 @@ def init_clients() -> None:
                 _qdrant_client = QdrantClient(
                     host=settings.QDRANT_HOST,
                     port=settings.QDRANT_PORT,
-                    timeout=5.0,
+                    timeout=settings.QDRANT_TIMEOUT,
                 )
 
                 # Test connection
@@ -73,6 +93,11 @@ def init_clients() -> None:
                     )
                 else:
                     logger.info(f"✓ Connected to Qdrant, found collection: {settings.COLLECTION_NAME}")
+                    try:
+                        # Collections imported before the indexes existed get them now
+                        ensure_payload_indexes(_qdrant_client, settings.COLLECTION_NAME)
+                    except Exception as e:
+                        logger.warning(f"Could not create Qdrant payload indexes: {str(e)}")
                 
                 break  # Successfully connected
 
@@ -86,18 +111,88 @@ def init_clients() -> None:
                 else:
                     logger.error(
                         f"Failed to connect to Qdrant after {max_retries} attempts. "
-                        f"Proceeding with JSON-based search only."
+                        f"Proceeding without Qdrant."
                     )
                     _qdrant_client = None  # Set to None so JSON search is used instead
 
+        if _qdrant_client is not None and _async_qdrant_client is None:
+            # Request path client: one shared connection pool (HTTP keep-alive
+            # or gRPC channels) for every request of this worker. Without
+            # explicit limits qdrant-client disables keep-alive for localhost.
+            _async_qdrant_client = AsyncQdrantClient(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+                grpc_port=settings.QDRANT_GRPC_PORT,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                timeout=settings.QDRANT_TIMEOUT,
+                limits=qdrant_http_limits(),
+            )
+            transport = "gRPC" if settings.QDRANT_PREFER_GRPC else "HTTP"
+            logger.info(f"✓ Async Qdrant client ready ({transport})")
+
+    # ---------------------------
+    # Initialize local vector index
+    # ---------------------------
+
+    use_local_index = settings.VECTOR_STORE == "local" or (
+        settings.VECTOR_STORE == "auto" and _async_qdrant_client is None
+    )
+    if _local_vector_index is None and use_local_index:
+        try:
+            _local_vector_index = LocalVectorIndex(
+                settings.VECTOR_INDEX_DIR,
+                expected_model=embedding_model_id(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND),
+            )
+            logger.info(
+                f"✓ Local vector index loaded: {_local_vector_index.count_points} points "
+                f"({_local_vector_index.meta['kind']})"
+            )
+        except VectorIndexError as e:
+            if settings.VECTOR_STORE == "local":
+                raise RuntimeError(f"VECTOR_STORE=local but the vector index is unusable: {str(e)}") from e
+            logger.error(f"No vector store: {str(e)}. Proceeding with JSON-based search only.")
+
     # ---------------------------
     # Initialize Embeddings
     # ---------------------------
 
     if _embeddings is None:
-        _embeddings = HuggingFaceEmbeddings(
-            model_name=settings.EMBEDDING_MODEL
+        _embeddings = load_embeddings(
+            settings.EMBEDDING_MODEL,
+            backend=settings.EMBEDDING_BACKEND,
+            onnx_dir=settings.EMBEDDING_ONNX_DIR,
         )
+        logger.info(f"✓ Embeddings initialized ({settings.EMBEDDING_BACKEND})")
+
+    if _embedding_batcher is None:
+        # Query embeddings of concurrent requests share forward passes
+        _embedding_batcher = EmbeddingBatcher(
+            _embeddings.embed_documents,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS,
+        )
+
+    if _embedding_cache is None:
+        # Repeated queries skip the model
+        _embedding_cache = EmbeddingCache(
+            _embedding_batcher.embed,
+            # Quantized vectors differ slightly, they are cached apart
+            model_name=embedding_model_id(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND),
+            max_entries=settings.EMBEDDING_CACHE_SIZE,
+            ttl=settings.EMBEDDING_CACHE_TTL,
+        )
+
+    # ---------------------------
+    # Initialize Re-ranker (optional)
+    # ---------------------------
+
+    if _reranker is None and settings.RERANKER_MODEL:
+        # Ships with sentence-transformers, installed for the embeddings
+        from sentence_transformers import CrossEncoder
+
+        cross_encoder = CrossEncoder(settings.RERANKER_MODEL, max_length=settings.RERANKER_MAX_LENGTH)
+        _reranker = CrossEncoderReranker(cross_encoder.predict, batch_size=settings.RERANK_BATCH_SIZE)
+        logger.info(f"✓ Re-ranker initialized: {settings.RERANKER_MODEL}")
 
     # ---------------------------
     # Initialize LLM
@@ -117,10 +212,23 @@ def init_clients() -> None:
     redis_client.init_redis()
 
 
-def close_clients() -> None:
+async def close_clients() -> None:
     """
     Gracefully close external resources.
     """
+    global _async_qdrant_client, _local_vector_index, _embedding_batcher, _embedding_cache, _reranker
+
+    if _async_qdrant_client is not None:
+        await _async_qdrant_client.close()
+        _async_qdrant_client = None
+    _local_vector_index = None
+    if _embedding_batcher is not None:
+        _embedding_batcher.close()
+        _embedding_batcher = None
+    _embedding_cache = None
+    if _reranker is not None:
+        _reranker.close()
+        _reranker = None
     redis_client.close_redis()
     logger.info("All clients closed")
 
@@ -130,12 +238,47 @@ def get_qdrant_client() -> QdrantClient:
     return _qdrant_client
 
 
-def get_embeddings() -> HuggingFaceEmbeddings:
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    if _async_qdrant_client is None:
+        raise RuntimeError("Async Qdrant client not initialized.")
+    return _async_qdrant_client
+
+
+def get_vector_store() -> Union[AsyncQdrantClient, LocalVectorIndex]:
+    """
+    Store serving vector search on the request path (VECTOR_STORE): the
+    async Qdrant client, or the local index, which answers the same calls.
+    """
+    if _async_qdrant_client is not None:
+        return _async_qdrant_client
+    if _local_vector_index is not None:
+        return _local_vector_index
+    raise RuntimeError("No vector store initialized (Qdrant unreachable, no local vector index).")
+
+
+def get_embeddings() -> Embeddings:
     if _embeddings is None:
         raise RuntimeError("Embeddings not initialized.")
     return _embeddings
 
 
+def get_embedding_batcher() -> EmbeddingBatcher:
+    if _embedding_batcher is None:
+        raise RuntimeError("Embedding batcher not initialized.")
+    return _embedding_batcher
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    if _embedding_cache is None:
+        raise RuntimeError("Embedding cache not initialized.")
+    return _embedding_cache
+
+
+def get_reranker() -> Optional[CrossEncoderReranker]:
+    """The re-ranker, None when RERANKER_MODEL is not set."""
+    return _reranker
+
+
 def get_llm() -> ChatOpenAI:
     if _llm is None:
         raise RuntimeError("LLM not initialized.")
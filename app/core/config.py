@@ -49,12 +49,43 @@ class Settings(BaseSettings):
     # Embeddings
     # -------------------------
     EMBEDDING_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    # torch: full precision PyTorch; onnx: int8 ONNX Runtime export of EMBEDDING_MODEL
+    # (scripts/export_onnx_embeddings.py) in EMBEDDING_ONNX_DIR
+    EMBEDDING_BACKEND: str = Field(default="torch", pattern="^(torch|onnx)$")
+    EMBEDDING_ONNX_DIR: str = "models/embedding-onnx"
+    EMBEDDING_BATCH_SIZE: int = 16  # Query texts per batched forward pass
+    EMBEDDING_BATCH_WAIT_MS: float = 5.0  # Wait for more queries after the first
+    EMBEDDING_CACHE_SIZE: int = 4096  # Query vectors kept in memory per worker
+    EMBEDDING_CACHE_TTL: int = 7 * 24 * 3600  # Seconds in Redis
 
     # -------------------------
     # Vector Database (Qdrant)
     # -------------------------
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_TIMEOUT: float = 5.0  # Seconds per request
+    QDRANT_POOL_SIZE: int = 32  # Keep-alive HTTP connections per worker
+    # qdrant: Qdrant only; local: in-process index only (no Qdrant connection);
+    # auto: Qdrant, or the in-process index when Qdrant cannot be reached
+    VECTOR_STORE: str = Field(default="auto", pattern="^(auto|qdrant|local)$")
+    VECTOR_INDEX_DIR: str = "models/vector-index"  # scripts/build_vector_index.py
+
+    # -------------------------
+    # Agent retrieval
+    # -------------------------
+    # dense=Qdrant only, hybrid=keyword index and Qdrant fused by rank
+    RETRIEVER_MODE: str = Field(default="hybrid", pattern="^(dense|hybrid)$")
+
+    # Cross-encoder re-ranking of retrieved documents (disabled when unset),
+    # e.g. "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    RERANKER_MODEL: str | None = None
+    RERANKER_MAX_LENGTH: int = 256  # Tokens per (query, passage) pair
+    RERANK_CANDIDATES: int = 12  # Documents retrieved for the re-ranker to choose from
+    RERANK_BATCH_SIZE: int = 4  # Small batches let a partly spent budget still score some
+    RERANK_BUDGET_MS: float = 300.0  # Per request; unscored documents keep retrieval order
+    RERANK_TOP_K: int = 3  # Documents passed on to the checker and writer
 
     # -------------------------
     # Cache (Redis)
@@ -63,6 +94,7 @@ class Settings(BaseSettings):
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: str | None = None
+    REDIS_RETRY_INTERVAL: float = 30.0  # Seconds before reconnecting to a Redis found down
 
     # -------------------------
     # Database
@@ -0,0 +1,130 @@
+"""
+Dynamic micro-batching of query embeddings.
+
+A transformer forward pass over 16 short queries costs little more than
+over one, but concurrent requests each embedding their own query pay it
+16 times, on the event loop thread. EmbeddingBatcher runs the model on
+a worker thread instead: queries submitted while it is busy, or within
+EMBEDDING_BATCH_WAIT_MS of the first one of a batch, go through one
+embed_documents call of at most EMBEDDING_BATCH_SIZE texts, and every
+caller's future is resolved with its own vector.
+
+The model's forward pass releases the GIL, so the event loop keeps
+serving requests while a batch runs.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+# (text, future, loop of the waiting coroutine)
+_Request = Tuple[str, asyncio.Future, asyncio.AbstractEventLoop]
+
+
+def _resolve(future: asyncio.Future, vector: Optional[Vector], error: Optional[BaseException]) -> None:
+    # The caller may have given up (timeout, cancelled request)
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(vector)
+
+
+class EmbeddingBatcher:
+    """
+    Worker thread coalescing concurrent embed requests into batches.
+
+    `embed_documents` maps a list of texts to their vectors in order
+    (HuggingFaceEmbeddings.embed_documents; for models without a query
+    instruction it computes the same vectors as embed_query).
+    """
+
+    def __init__(
+        self,
+        embed_documents: Callable[[List[str]], Sequence[Vector]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.embed_documents = embed_documents
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # Batches run and texts embedded, for logs and benchmarks
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    async def embed(self, text: str) -> Vector:
+        """Vector of one query text, computed in the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((text, future, loop))
+        return await future
+
+    def close(self) -> None:
+        """Finish the queued requests and stop the worker thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first: _Request) -> Tuple[List[_Request], bool]:
+        """
+        Requests of one batch: `first` plus those arriving within the wait
+        window, up to the batch size. The flag is set when close() was
+        requested meanwhile.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                # Requests queued while the previous batch ran are taken at once
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+
+            # Identical queries in one batch are embedded once
+            texts = list(dict.fromkeys(text for text, _, _ in batch))
+            vectors, error = None, None
+            try:
+                vectors = dict(zip(texts, self.embed_documents(texts)))
+            except Exception as e:
+                logger.error(f"Embedding batch of {len(texts)} failed: {str(e)}")
+                error = e
+            self.batches += 1
+            self.texts += len(texts)
+
+            for text, future, loop in batch:
+                vector = vectors[text] if vectors is not None else None
+                try:
+                    loop.call_soon_threadsafe(_resolve, future, vector, error)
+                except RuntimeError:
+                    # The caller's event loop is closed
+                    pass
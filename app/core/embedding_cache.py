@@ -0,0 +1,140 @@
+"""
+Two-tier cache of query embeddings.
+
+Popular queries ("thủ tục ly hôn") are searched and retrieved over and
+over; each repeat used to cost a transformer forward pass. Vectors are
+cached under the model name plus the normalized query text (case,
+Unicode form, whitespace and surrounding punctuation ignored), so
+"Thủ tục  ly hôn?" reuses the vector of "thủ tục ly hôn".
+
+Tiers:
+    memory  bounded LRU of this worker (EMBEDDING_CACHE_SIZE entries)
+    Redis   shared by workers and restarts, packed float32 bytes
+            (4 bytes per dimension, a fifth of the JSON size) with
+            EMBEDDING_CACHE_TTL
+Misses are computed by the embedding batcher and written to both tiers.
+Redis calls run on a worker thread, never on the event loop, and a
+Redis found down is not reconnected before REDIS_RETRY_INTERVAL.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.core import redis_client
+
+logger = logging.getLogger(__name__)
+
+Vector = List[float]
+
+_SPACES = re.compile(r"\s+")
+
+# Punctuation around a query does not change what is asked
+_EDGE_PUNCTUATION = " \t\n.,;:!?…\"'“”‘’()[]-–"
+
+
+def normalize_query(text: str) -> str:
+    """
+    Cache key form of a query.
+
+    Examples:
+        "  Thủ tục LY HÔN? " -> "thủ tục ly hôn"
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    return _SPACES.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+
+def pack_vector(vector: Vector) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def unpack_vector(data: bytes) -> Optional[Vector]:
+    """Vector of packed float32 bytes, None for a corrupt value."""
+    if not data or len(data) % 4:
+        return None
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    Query embedding lookups through memory, then Redis, then `compute`.
+
+    Used from the event loop only, so the LRU needs no lock. The vector
+    cached for a key is the one computed for the first query text that
+    normalized to it.
+    """
+
+    def __init__(
+        self,
+        compute: Callable[[str], Awaitable[Vector]],
+        model_name: str,
+        max_entries: int = 4096,
+        ttl: int = 7 * 24 * 3600,
+        use_redis: bool = True,
+    ):
+        self.compute = compute
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.use_redis = use_redis
+        # Keys of different models never collide
+        self._prefix = f"embedding:{hashlib.blake2b(model_name.encode(), digest_size=6).hexdigest()}:"
+        self._memory: "OrderedDict[str, Vector]" = OrderedDict()
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def redis_key(self, normalized: str) -> str:
+        return self._prefix + hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+    def _remember(self, normalized: str, vector: Vector) -> None:
+        self._memory[normalized] = vector
+        self._memory.move_to_end(normalized)
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def embed(self, text: str) -> Vector:
+        """Embedding of a query text, computed only on a miss of both tiers."""
+        normalized = normalize_query(text)
+
+        vector = self._memory.get(normalized)
+        if vector is not None:
+            self._memory.move_to_end(normalized)
+            self.memory_hits += 1
+            return vector
+
+        key = self.redis_key(normalized)
+        if self.use_redis:
+            vector = unpack_vector(await asyncio.to_thread(redis_client.cache_get_bytes, key))
+            if vector is not None:
+                self.redis_hits += 1
+                self._remember(normalized, vector)
+                return vector
+
+        self.misses += 1
+        vector = await self.compute(text)
+        self._remember(normalized, vector)
+        if self.use_redis:
+            await asyncio.to_thread(redis_client.cache_set_bytes, key, pack_vector(vector), self.ttl)
+        return vector
+
+    def stats(self) -> Dict[str, float]:
+        """Hit counters and hit rate since startup, for monitoring."""
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,145 @@
+"""
+Payload indexes of the law collection in Qdrant.
+
+Filters on an unindexed payload field make Qdrant scan every point's
+payload; with an index the filter is resolved first and the vector
+search only visits matching points. Created by scripts/import_local.py
+and checked again at startup for collections imported earlier.
+
+Fields:
+    so_hieu            article id ("Điều 5"): keyword, exact match
+    slug               canonical article key ("dieu-5-luat-doanh-nghiep-2020"):
+                       keyword, exact match on one law's article
+    loai_van_ban       law name / document type: full text, lowercased
+    nam                year, from the law name: keyword, exact match
+
+slug and nam are derived from the law name and article id
+(article_fields); collections imported before they existed get them
+once at startup (backfill_article_fields). raw_law_data.json carries no
+issuing authority, so co_quan_ban_hanh is neither written nor filtered on.
+"""
+
+import logging
+import re
+from typing import Dict, Optional, Union
+
+from qdrant_client import QdrantClient, models
+
+from app.utils.slug_generator import create_law_slug
+
+logger = logging.getLogger(__name__)
+
+# Points read and updated per request by the backfill
+BACKFILL_BATCH = 256
+
+_YEAR = re.compile(r"\b\d{4}\b")
+
+_TEXT_INDEX = models.TextIndexParams(
+    type="text",
+    tokenizer=models.TokenizerType.WORD,
+    lowercase=True,
+)
+
+PAYLOAD_INDEXES: Dict[str, Union[models.PayloadSchemaType, models.TextIndexParams]] = {
+    "so_hieu": models.PayloadSchemaType.KEYWORD,
+    "slug": models.PayloadSchemaType.KEYWORD,
+    "loai_van_ban": _TEXT_INDEX,
+    "nam": models.PayloadSchemaType.KEYWORD,
+}
+
+
+def law_year(law_name: str) -> str:
+    """
+    Year in a law's name, "" when it has none.
+
+    Examples:
+        "Luật Doanh nghiệp 2020" -> "2020"
+        "Bộ luật Hình sự (Văn bản hợp nhất 2017)" -> "2017"
+    """
+    years = _YEAR.findall(law_name or "")
+    return years[-1] if years else ""
+
+
+def article_fields(law_name: str, article_id: str) -> Dict[str, str]:
+    """Payload fields derived from an article's law name and id (slug, nam)."""
+    return {
+        # Same key as law_index.article_key and the saved-law slug
+        "slug": create_law_slug(article_id, law_name),
+        "nam": law_year(law_name),
+    }
+
+
+def backfill_article_fields(client: QdrantClient, collection_name: str) -> int:
+    """
+    Write slug and nam on the points imported without them.
+
+    Returns the number of points updated (0 once a collection is migrated).
+    """
+    missing = models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key="slug"))])
+    updated = 0
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=missing,
+            limit=BACKFILL_BATCH,
+            offset=offset,
+            with_payload=["so_hieu", "loai_van_ban"],
+            with_vectors=False,
+        )
+        by_article: Dict[tuple, list] = {}
+        for point in points:
+            payload = point.payload or {}
+            by_article.setdefault((payload.get("loai_van_ban", ""), payload.get("so_hieu", "")), []).append(point.id)
+        if by_article:
+            client.batch_update_points(
+                collection_name=collection_name,
+                update_operations=[
+                    models.SetPayloadOperation(set_payload=models.SetPayload(
+                        payload=article_fields(law_name, article_id), points=ids,
+                    ))
+                    for (law_name, article_id), ids in by_article.items()
+                ],
+            )
+            updated += len(points)
+        if offset is None:
+            break
+    if updated:
+        logger.info(f"✓ Added slug and nam to {updated} Qdrant points")
+    return updated
+
+
+def ensure_payload_indexes(client: QdrantClient, collection_name: str) -> None:
+    """Create the payload indexes missing from a collection and backfill their derived fields."""
+    existing = client.get_collection(collection_name).payload_schema or {}
+    for field_name, schema in PAYLOAD_INDEXES.items():
+        if field_name in existing:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=schema,
+        )
+        logger.info(f"✓ Created Qdrant payload index on '{field_name}'")
+    backfill_article_fields(client, collection_name)
+
+
+def build_filter(
+    type_filter: Optional[str] = None,
+    year_filter: Optional[str] = None,
+    authority_filter: Optional[str] = None,
+) -> Optional[models.Filter]:
+    """
+    Qdrant filter for the search parameters, None when none is set.
+
+    Document type matches by words, case-insensitively ("luật" matches
+    "Bộ luật Dân sự"); the year matches exactly. The authority is not
+    filtered on: no imported point has it, so the condition would empty
+    every page.
+    """
+    conditions = []
+    if type_filter:
+        conditions.append(models.FieldCondition(key="loai_van_ban", match=models.MatchText(text=type_filter)))
+    if year_filter:
+        conditions.append(models.FieldCondition(key="nam", match=models.MatchValue(value=year_filter.strip())))
+    return models.Filter(must=conditions) if conditions else None
@@ -10,8 +10,10 @@ Supports:
 
 import logging
 import json
-from typing import Any, Optional
+import time
+from typing import Any, Optional, Union
 from redis import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,14 +21,24 @@ logger = logging.getLogger(__name__)
 # Global Redis client
 _redis_client: Optional[Redis] = None
 
+# Client for binary values (packed vectors); the main one decodes to str
+_binary_redis_client: Optional[Redis] = None
+
+# Monotonic time before which Redis is not reconnected: a Redis found down
+# would otherwise cost a connect timeout on every cache call
+_retry_at = 0.0
+
 
 def init_redis() -> Optional[Redis]:
-    """Initialize Redis client."""
+    """Initialize Redis client (None while backing off after a failure)."""
     global _redis_client
     
     if _redis_client is not None:
         return _redis_client
     
+    if time.monotonic() < _retry_at:
+        return None
+    
     try:
         _redis_client = Redis(
             host=settings.REDIS_HOST,
@@ -34,6 +46,7 @@ def init_redis() -> Optional[Redis]:
             db=settings.REDIS_DB,
             decode_responses=True,
             socket_connect_timeout=5,
+            socket_timeout=5,
         )
         
         # Test connection
@@ -43,10 +56,26 @@ def init_redis() -> Optional[Redis]:
         
     except Exception as e:
         logger.error(f"✗ Redis connection failed: {str(e)}")
-        _redis_client = None
+        _mark_down()
         return None
 
 
+def _mark_down() -> None:
+    """Drop the clients and back off for REDIS_RETRY_INTERVAL seconds."""
+    global _redis_client, _binary_redis_client, _retry_at
+
+    _redis_client = None
+    _binary_redis_client = None
+    _retry_at = time.monotonic() + settings.REDIS_RETRY_INTERVAL
+
+
+def _handle_error(error: Exception) -> None:
+    """Back off after connection failures; other errors keep the clients."""
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+        logger.error(f"✗ Redis unavailable, retrying in {settings.REDIS_RETRY_INTERVAL:.0f}s: {str(error)}")
+        _mark_down()
+
+
 def get_redis() -> Optional[Redis]:
     """Get Redis client instance."""
     global _redis_client
@@ -57,9 +86,26 @@ def get_redis() -> Optional[Redis]:
     return _redis_client
 
 
+def get_binary_redis() -> Optional[Redis]:
+    """Get the Redis client returning raw bytes, None when Redis is down."""
+    global _binary_redis_client
+
+    if _binary_redis_client is None and get_redis() is not None:
+        _binary_redis_client = Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            decode_responses=False,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+        )
+
+    return _binary_redis_client
+
+
 def close_redis():
     """Close Redis connection."""
-    global _redis_client
+    global _redis_client, _binary_redis_client
     
     if _redis_client is not None:
         try:
@@ -70,6 +116,14 @@ def close_redis():
         finally:
             _redis_client = None
 
+    if _binary_redis_client is not None:
+        try:
+            _binary_redis_client.close()
+        except Exception as e:
+            logger.error(f"Error closing Redis: {str(e)}")
+        finally:
+            _binary_redis_client = None
+
 
 # ============================================
 # CACHE UTILITIES
@@ -90,6 +144,7 @@ def cache_get(key: str) -> Optional[Any]:
                 return value
         return None
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Cache get error: {str(e)}")
         return None
 
@@ -106,6 +161,35 @@ def cache_set(key: str, value: Any, ttl: int = 3600) -> bool:
         
         return redis.setex(key, ttl, value) is not None
     except Exception as e:
+        _handle_error(e)
+        logger.warning(f"Cache set error: {str(e)}")
+        return False
+
+
+def cache_get_bytes(key: str) -> Optional[bytes]:
+    """Get a binary value from cache."""
+    try:
+        redis = get_binary_redis()
+        if not redis:
+            return None
+
+        return redis.get(key)
+    except Exception as e:
+        _handle_error(e)
+        logger.warning(f"Cache get error: {str(e)}")
+        return None
+
+
+def cache_set_bytes(key: str, value: bytes, ttl: int = 3600) -> bool:
+    """Set a binary value in cache with TTL (seconds)."""
+    try:
+        redis = get_binary_redis()
+        if not redis:
+            return False
+
+        return redis.setex(key, ttl, value) is not None
+    except Exception as e:
+        _handle_error(e)
         logger.warning(f"Cache set error: {str(e)}")
         return False
 
@@ -119,6 +203,7 @@ def cache_delete(key: str) -> bool:
         
         return redis.delete(key) > 0
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Cache delete error: {str(e)}")
         return False
 
@@ -132,6 +217,7 @@ def cache_exists(key: str) -> bool:
         
         return redis.exists(key) > 0
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Cache exists error: {str(e)}")
         return False
 
@@ -148,6 +234,7 @@ def cache_clear_pattern(pattern: str) -> int:
             return redis.delete(*keys)
         return 0
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Cache clear pattern error: {str(e)}")
         return 0
 
@@ -194,13 +281,13 @@ def is_token_blacklisted(token: str) -> bool:
 # SEARCH CACHE UTILITIES
 # ============================================
 
-def cache_search_results(keyword: str, mode: str, results: list, ttl: int = 3600) -> bool:
-    """Cache search results."""
+def cache_search_results(keyword: str, mode: str, results: Union[list, dict], ttl: int = 3600) -> bool:
+    """Cache search results (a result list or a serialized page)."""
     key = f"search:{mode}:{keyword}"
     return cache_set(key, results, ttl)
 
 
-def get_cached_search(keyword: str, mode: str) -> Optional[list]:
+def get_cached_search(keyword: str, mode: str) -> Optional[Union[list, dict]]:
     """Get cached search results."""
     key = f"search:{mode}:{keyword}"
     return cache_get(key)
@@ -228,6 +315,7 @@ def increment_counter(key: str, ttl: int = 60) -> int:
             redis.expire(key, ttl)
         return value
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Counter increment error: {str(e)}")
         return 0
 
@@ -242,6 +330,7 @@ def get_counter(key: str) -> int:
         value = redis.get(key)
         return int(value) if value else 0
     except Exception as e:
+        _handle_error(e)
         logger.warning(f"Counter get error: {str(e)}")
         return 0
 
@@ -0,0 +1,72 @@
+"""
+Cross-encoder re-ranking under a latency budget.
+
+A cross-encoder reads the query and a passage together, so it ranks far
+better than embedding similarity, but it costs a forward pass per pair.
+CrossEncoderReranker scores the retrieved passages in batches on its own
+worker thread, in retrieval order, and stops at the request's deadline:
+passages scored by then are ordered by their scores ahead of the rest,
+which keep their retrieval order. A request whose first batch does not
+finish in time keeps the retrieval order unchanged.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoderReranker:
+    """
+    Budgeted re-ranking of passages for a query.
+
+    `predict` maps (query, passage) pairs to relevance scores
+    (sentence_transformers.CrossEncoder.predict). One worker thread runs
+    it, so a batch abandoned at a deadline delays later requests rather
+    than piling up threads.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[List[Tuple[str, str]]], Sequence[float]],
+        batch_size: int = 4,
+    ):
+        self.predict = predict
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+
+    async def rerank(self, query: str, passages: Sequence[str], budget_ms: float) -> Tuple[List[int], int]:
+        """
+        Indexes of `passages`, best first, and how many were scored.
+
+        Examples:
+            all scored in time   -> ([2, 0, 1], 3)
+            budget spent at once -> ([0, 1, 2], 0)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget_ms / 1000
+        scores: List[float] = []
+
+        for start in range(0, len(passages), self.batch_size):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            pairs = [(query, passage) for passage in passages[start:start + self.batch_size]]
+            try:
+                batch_scores = await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self.predict, pairs), remaining
+                )
+            except asyncio.TimeoutError:
+                break
+            except Exception as e:
+                logger.error(f"Re-ranking batch failed: {str(e)}")
+                break
+            scores.extend(float(score) for score in batch_scores)
+
+        scored = sorted(range(len(scores)), key=lambda position: scores[position], reverse=True)
+        return scored + list(range(len(scores), len(passages))), len(scores)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
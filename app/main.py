@@ -8,6 +8,7 @@ from app.core.limiter import limiter
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.clients import init_clients, close_clients
+from app.services.corpus_manager import corpus_manager
 from app.exceptions import setup_exception_handlers
 
 from contextlib import asynccontextmanager
@@ -22,11 +23,12 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     init_clients()
+    corpus_manager.get()  # Load the law corpus before the first search
 
     yield
 
     # Shutdown
-    close_clients()
+    await close_clients()
 
 
 app = FastAPI(
@@ -1,16 +1,19 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class LawItem(BaseModel):
     """Legal document item in search results"""
     id: Optional[str] = None
+    key: Optional[str] = None  # Canonical article key, unique across laws
     title: str
     type: str
     year: Optional[str] = None
     authority: Optional[str] = None
     description: Optional[str] = None
     content: Optional[str] = None
+    snippet: Optional[str] = None  # Teaser of content around the query terms
+    highlights: Optional[List[Tuple[int, int]]] = None  # [start, end) of query terms in snippet
     articles: Optional[List[str]] = None  # Danh sách số điều
 
 
@@ -28,19 +31,54 @@ class SearchFilters(BaseModel):
     document_type: Optional[str] = None  # Luật, Nghị định, etc.
     article_number: Optional[str] = None
     year: Optional[str] = None
+    chapter: Optional[str] = None  # Facet value, e.g. "Luật Doanh nghiệp 2020 - Chương II"
+    article_range: Optional[str] = None  # Facet value, e.g. "Điều 101-200"
+
+
+class FacetCount(BaseModel):
+    """Number of hits for one facet value"""
+    value: str
+    count: int
+
+
+class SearchPage(BaseModel):
+    """One page of search results"""
+    results: List[LawItem]
+    total: int  # Matches across all pages
+    total_exact: bool = True  # False when total is an estimate
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
+    facets: Optional[Dict[str, List[FacetCount]]] = None  # facet -> value counts
 
 
 class SearchResponse(BaseModel):
     """Search response"""
     results: List[LawItem]
     total: int
+    total_exact: bool = True
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, List[FacetCount]]] = None
     filters_applied: Optional[SearchFilters] = None
-    source: Optional[str] = None  # "redis_cache" or "search"
+    source: Optional[str] = None  # "redis_cache", "search" or "citation"
+
+
+class SuggestItem(BaseModel):
+    """One autocomplete completion"""
+    text: str
+    kind: str  # "law", "article" or "title"
+    law_name: Optional[str] = None
+    key: Optional[str] = None  # Canonical article key, for article and title completions
+
+
+class SuggestResponse(BaseModel):
+    """Autocomplete response"""
+    query: str
+    suggestions: List[SuggestItem]
 
 
 class LawDetailResponse(BaseModel):
     """Law detail response"""
     id: str
+    key: Optional[str] = None
     title: str
     type: str
     content: str
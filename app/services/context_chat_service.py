@@ -13,14 +13,17 @@ Features:
 import logging
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
 import hashlib
 
 from app import models, schemas
 from app.services.law_agent.graph import app as agent_app
 from app.services.law_agent.title_generator import generate_chat_title
-from app.services.json_search_service import get_json_law_detail
+from app.services.json_search_service import cite_json_laws, get_json_law_detail
+from app.services.formatters import format_sources_from_docs
+from app.services.corpus_manager import get_corpus_version
+from app.services.tracking_service import TrackingService
 from app.core.redis_client import cache_get, cache_set
 
 logger = logging.getLogger(__name__)
@@ -32,14 +35,20 @@ class ContextAwareChatService:
     SUMMARY_THRESHOLD = 5  # Summarize mỗi 5 tin nhắn
 
     @staticmethod
-    def _generate_cache_key(query: str, context_type: str, law_id: Optional[str] = None) -> str:
+    def _generate_cache_key(
+        query: str,
+        context_type: str,
+        law_id: Optional[str] = None,
+        corpus_version: str = "none",
+    ) -> str:
         """
         Tạo cache key cho chat response
-        Hash query để tạo key duy nhất
+        Hash query để tạo key duy nhất; gắn phiên bản corpus để câu trả lời
+        cũ tự hết hạn khi corpus được nạp lại
         
         Examples:
-            chat:law-detail:Điều 1:abc123def456...
-            chat:general:dân sự:xyz789uvw012...
+            chat:3f2a9c1b7d40:law-detail:Điều 1:abc123def456...
+            chat:3f2a9c1b7d40:general:xyz789uvw012...
         """
         # Normalize query (lowercase, strip whitespace)
         normalized_query = query.strip().lower()
@@ -48,9 +57,9 @@ class ContextAwareChatService:
         query_hash = hashlib.md5(normalized_query.encode()).hexdigest()[:12]
         
         if context_type == "law-detail" and law_id:
-            return f"chat:{context_type}:{law_id}:{query_hash}"
+            return f"chat:{corpus_version}:{context_type}:{law_id}:{query_hash}"
         else:
-            return f"chat:{context_type}:{query_hash}"
+            return f"chat:{corpus_version}:{context_type}:{query_hash}"
 
     @staticmethod
     async def process_context_chat(
@@ -109,6 +118,13 @@ class ContextAwareChatService:
                 db, current_user.id, input_data.law_id
             )
 
+        # Câu hỏi chỉ là trích dẫn ("Điều 5 Luật Doanh nghiệp"): trả lời bằng
+        # chính văn bản điều luật, không qua agent
+        citation_answer = ContextAwareChatService._answer_citation(
+            input_data.query,
+            law_id=input_data.law_id if input_data.context_type == "law-detail" else None,
+        )
+
         # -------------------------
         # 4. Build prompt với context
         # -------------------------
@@ -125,13 +141,17 @@ class ContextAwareChatService:
         cache_key = ContextAwareChatService._generate_cache_key(
             query=input_data.query,
             context_type=input_data.context_type,
-            law_id=input_data.law_id
+            law_id=input_data.law_id,
+            corpus_version=get_corpus_version(),
         )
         
-        cached_response = cache_get(cache_key)
+        cached_response = None if citation_answer else cache_get(cache_key)
         response_source = "agent"  # Track source for logging
         
-        if cached_response:
+        if citation_answer:
+            citation_title, final_answer, formatted_sources = citation_answer
+            response_source = "citation"
+        elif cached_response:
             # Cache hit! Use cached response
             print(f"✓ Chat cache HIT for query: {input_data.query[:50]}...")
             # Handle both dict and JSON string from cache
@@ -213,7 +233,9 @@ class ContextAwareChatService:
             # -------------------------
             # 8. Set title if first message
             # -------------------------
-            if not session.title:
+            if not session.title and citation_answer:
+                session.title = citation_title[:50]
+            elif not session.title:
                 try:
                     session.title = await generate_chat_title(input_data.query)
                 except Exception as e:
@@ -239,6 +261,40 @@ class ContextAwareChatService:
             source=response_source,
         )
 
+    @staticmethod
+    def _answer_citation(
+        query: str,
+        law_id: Optional[str] = None,
+    ) -> Optional[Tuple[str, str, List[str]]]:
+        """
+        Trả lời trực tiếp câu hỏi chỉ gồm trích dẫn điều luật
+        
+        Điều, khoản, điểm được tra cứu trong corpus; khi không nêu tên luật,
+        dùng luật của phiên law-detail (nếu có), nếu không thì liệt kê điều
+        đó trong mọi luật.
+        
+        Returns:
+            (title, answer, sources), hoặc None nếu không phải trích dẫn
+        """
+        default_law = None
+        if law_id:
+            law = get_json_law_detail(law_id)
+            default_law = law.title if law else None
+
+        citation, items = cite_json_laws(query, default_law=default_law)
+        if citation is None or not items:
+            return None
+
+        blocks = [
+            f"{citation.label(item.title)}:\n\n{item.snippet or item.content}"
+            for item in items
+        ]
+        sources = format_sources_from_docs(
+            [{"law_name": item.title, "law_id": item.id} for item in items]
+        )
+        title = citation.label(items[0].title if len(items) == 1 else None)
+        return title, "\n\n---\n\n".join(blocks), sources
+
     @staticmethod
     def _build_chat_history(db: Session, session_id: int) -> str:
         """Build chat history from last messages"""
@@ -253,11 +309,8 @@ class ContextAwareChatService:
     @staticmethod
     def _get_law_context(db: Session, user_id: int, law_id: str) -> str:
         """Lấy context của luật từ saved laws hoặc từ JSON data"""
-        # Thử lấy từ SavedLaw trước
-        saved_law = db.query(models.SavedLaw).filter(
-            models.SavedLaw.user_id == user_id,
-            models.SavedLaw.law_id == law_id
-        ).first()
+        # Thử lấy từ SavedLaw trước (law_id có thể là article_id hoặc canonical key/slug)
+        saved_law = TrackingService.find_saved_law(db, user_id, law_id)
 
         if saved_law and saved_law.law_content:
             return f"""
@@ -271,7 +324,7 @@ Nội dung:
 {saved_law.law_content[:2000]}...
 """
         
-        # Nếu không có trong SavedLaw, thử lấy từ JSON data
+        # Nếu không có trong SavedLaw, thử lấy từ JSON data (tra cứu O(1) theo key)
         try:
             law = get_json_law_detail(law_id)
             if law and law.content:
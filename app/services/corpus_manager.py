@@ -0,0 +1,336 @@
+"""
+Corpus version manager for the in-memory law corpus.
+
+Holds the active CorpusVersion (store + indexes) behind a single
+reference. A reload builds the next version off the request path and
+swaps the reference in one assignment, so requests that already took
+the old version keep reading it until they finish and the old version
+is freed once nothing references it.
+
+A reload requested from one worker reaches the others through a marker
+file next to the snapshot: request_reload() rewrites it, and every
+worker checks its modification time at most every RELOAD_POLL_INTERVAL
+seconds from get() and reloads when it changed. All workers serve the
+new version within about that interval plus the reload itself.
+
+Every worker process maps the same compiled snapshot, so the corpus
+and its indexes live once in the OS page cache however many workers
+run. When the snapshot is missing or stale the first worker to load
+compiles it (the others wait on a file lock, then map the result).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are still atomic, just not serialized
+    fcntl = None
+
+from app.services.law_index import (
+    InvertedIndex,
+    BM25FScorer,
+    LawCorpus,
+    ArticleLookup,
+    CitationResolver,
+    FacetIndex,
+    FuzzyTermMatcher,
+    LawSnapshot,
+    PrefixSuggester,
+    SnapshotError,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# BM25F boosts for (article_title, law_name, content): a title hit outweighs a body hit
+SEARCH_FIELD_WEIGHTS = (3.0, 1.5, 1.0)
+
+# Seconds between checks of the reload marker by each worker
+RELOAD_POLL_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class CorpusVersion:
+    """One immutable, fully built generation of the corpus and its indexes."""
+
+    version: str
+    corpus: LawCorpus
+    index: InvertedIndex
+    scorer: BM25FScorer
+    lookup: ArticleLookup
+    matcher: FuzzyTermMatcher
+    facets: FacetIndex
+    suggester: PrefixSuggester
+    citations: CitationResolver
+    source: str
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "articles": len(self.corpus),
+            "laws": len(self.corpus.law_names),
+            "terms": self.index.term_count,
+            "facet_values": {facet: len(values) for facet, values in self.facets.bitmaps.items()},
+            "loaded_at": self.loaded_at.isoformat(),
+        }
+
+
+def get_json_file_path() -> Path:
+    """Get the path to the raw law data JSON file."""
+    return Path(__file__).parent.parent / "core" / "raw_law_data.json"
+
+
+def get_snapshot_path() -> Path:
+    """Get the path to the compiled corpus snapshot."""
+    return Path(__file__).parent.parent / "core" / "law_corpus.snapshot"
+
+
+def content_version(file_path: Path) -> str:
+    """Short content hash identifying a corpus source file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def build_json_corpus(file_path: Path) -> Tuple[LawCorpus, InvertedIndex, ArticleLookup]:
+    """Parse the JSON file and build the store and its indexes."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        corpus = LawCorpus.from_records(json.load(f))
+
+    index = InvertedIndex.build(
+        corpus.search_fields(ordinal) for ordinal in range(len(corpus))
+    )
+    return corpus, index, ArticleLookup(corpus)
+
+
+def _open_snapshot(snapshot_path: Path, json_path: Path) -> Optional[LawSnapshot]:
+    """Map the compiled snapshot if it exists and matches the JSON file."""
+    if not snapshot_path.exists():
+        return None
+
+    try:
+        snapshot = LawSnapshot(snapshot_path)
+    except SnapshotError as e:
+        logger.warning(f"Ignoring corpus snapshot: {str(e)}")
+        return None
+
+    if not snapshot.is_fresh(json_path):
+        logger.warning(
+            f"Corpus snapshot {snapshot_path} is older than {json_path}"
+        )
+        return None
+
+    return snapshot
+
+
+class CorpusManager:
+    """
+    Owns the active corpus version.
+
+    Readers call get() once per request and use the returned version
+    for the whole request. reload() / reload_async() build a new version
+    and swap it in; only one reload runs at a time. request_reload()
+    makes every worker sharing the snapshot directory reload.
+    """
+
+    def __init__(self, json_path: Path, snapshot_path: Path, compile_snapshot: bool = True):
+        """
+        Args:
+            json_path: Source JSON file
+            snapshot_path: Compiled snapshot to map
+            compile_snapshot: Compile the snapshot from the JSON file when it
+                is missing or stale, instead of building the corpus on this
+                process's heap
+        """
+        self.json_path = json_path
+        self.snapshot_path = snapshot_path
+        self.compile_snapshot = compile_snapshot
+        self._active: Optional[CorpusVersion] = None
+        self._load_lock = threading.Lock()
+        self._reloading = False
+        self.last_error: Optional[str] = None
+        self.reload_marker_path = snapshot_path.with_name(snapshot_path.name + ".reload")
+        self._reload_seen = self._reload_stamp()
+        self._next_poll = 0.0
+        self._poll_lock = threading.Lock()
+
+    @property
+    def active(self) -> Optional[CorpusVersion]:
+        return self._active
+
+    @property
+    def reloading(self) -> bool:
+        return self._reloading
+
+    def load_version(self) -> CorpusVersion:
+        """Build a new version from the snapshot or JSON file, without activating it."""
+        snapshot = _open_snapshot(self.snapshot_path, self.json_path)
+        if snapshot is None and self.compile_snapshot and self.json_path.exists():
+            snapshot = self._compile_snapshot()
+
+        if snapshot is not None:
+            corpus, index, lookup = snapshot.corpus, snapshot.index, snapshot.lookup
+            matcher, suggester = snapshot.matcher, snapshot.suggester
+            version = snapshot.meta.get("corpus_version") or f"snapshot-{snapshot.meta['built_at']}"
+            source = f"snapshot {self.snapshot_path.name}"
+        elif self.json_path.exists():
+            corpus, index, lookup = build_json_corpus(self.json_path)
+            matcher, suggester = FuzzyTermMatcher(index), PrefixSuggester.build(corpus, lookup)
+            version = content_version(self.json_path)
+            source = f"JSON file {self.json_path.name}"
+        else:
+            raise FileNotFoundError(f"JSON file not found: {self.json_path}")
+
+        return CorpusVersion(
+            version=version,
+            corpus=corpus,
+            index=index,
+            scorer=BM25FScorer(index, SEARCH_FIELD_WEIGHTS),
+            lookup=lookup,
+            matcher=matcher,
+            facets=FacetIndex.build(corpus),
+            suggester=suggester,
+            citations=CitationResolver(corpus.law_names),
+            source=source,
+        )
+
+    def _compile_snapshot(self) -> Optional[LawSnapshot]:
+        """
+        Compile the snapshot from the JSON file and map it.
+
+        Serialized across processes by a lock file next to the snapshot;
+        a worker that waited maps what the previous holder compiled.
+        Returns None when the snapshot cannot be written (read-only
+        deployment), in which case this process loads the JSON itself.
+        """
+        lock_path = self.snapshot_path.with_name(self.snapshot_path.name + ".lock")
+        try:
+            with open(lock_path, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                snapshot = _open_snapshot(self.snapshot_path, self.json_path)
+                if snapshot is None:
+                    corpus, index, lookup = build_json_corpus(self.json_path)
+                    write_snapshot(
+                        self.snapshot_path, corpus, index, lookup,
+                        source_path=self.json_path,
+                        corpus_version=content_version(self.json_path),
+                    )
+                    logger.info(f"Compiled corpus snapshot {self.snapshot_path}")
+                    snapshot = LawSnapshot(self.snapshot_path)
+                return snapshot
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"Cannot compile corpus snapshot, loading JSON in this process: {str(e)}")
+            return None
+
+    def _reload_stamp(self) -> Optional[int]:
+        try:
+            return self.reload_marker_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def request_reload(self) -> None:
+        """
+        Ask every worker to reload by rewriting the reload marker.
+
+        The caller's own worker is not signalled; it reloads directly.
+        """
+        try:
+            self.reload_marker_path.write_text(datetime.now(timezone.utc).isoformat())
+            self._reload_seen = self._reload_stamp()
+        except OSError as e:
+            logger.warning(f"Cannot write corpus reload marker, only this worker reloads: {str(e)}")
+
+    def _poll_reload(self) -> None:
+        """Reload in the background when another worker requested it (one stat per interval)."""
+        now = time.monotonic()
+        if now < self._next_poll or self._reloading or not self._poll_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_poll = now + RELOAD_POLL_INTERVAL
+            stamp = self._reload_stamp()
+            if stamp != self._reload_seen:
+                self._reload_seen = stamp
+                threading.Thread(target=self.reload, name="corpus-reload", daemon=True).start()
+        finally:
+            self._poll_lock.release()
+
+    def get(self) -> Optional[CorpusVersion]:
+        """Active version, loading the first one on demand (None if unavailable)."""
+        current = self._active
+        if current is not None:
+            self._poll_reload()
+            return current
+
+        with self._load_lock:
+            if self._active is None:
+                try:
+                    self._activate(self.load_version())
+                except Exception as e:
+                    self.last_error = str(e)
+                    logger.error(f"Error loading law corpus: {str(e)}", exc_info=True)
+            return self._active
+
+    def reload(self) -> Optional[CorpusVersion]:
+        """
+        Build the next version and swap it in.
+
+        On failure the current version stays active. Returns the active
+        version afterwards.
+        """
+        with self._load_lock:
+            self._reloading = True
+            try:
+                self._activate(self.load_version())
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Corpus reload failed, keeping current version: {str(e)}", exc_info=True)
+            finally:
+                self._reloading = False
+            return self._active
+
+    async def reload_async(self) -> Optional[CorpusVersion]:
+        """reload() on a worker thread so the event loop keeps serving requests."""
+        return await asyncio.to_thread(self.reload)
+
+    def _activate(self, new_version: CorpusVersion) -> None:
+        previous = self._active
+        self.last_error = None
+        # Single reference assignment: readers see either version, never a mix
+        self._active = new_version
+        logger.info(
+            f"Activated corpus version {new_version.version} from {new_version.source} "
+            f"({len(new_version.corpus)} articles, {new_version.index.term_count} terms)"
+            + (f", replacing {previous.version}" if previous else "")
+        )
+
+    def info(self) -> dict:
+        current = self._active
+        return {
+            "active": current.info() if current else None,
+            "reloading": self._reloading,
+            "last_error": self.last_error,
+        }
+
+
+corpus_manager = CorpusManager(get_json_file_path(), get_snapshot_path())
+
+
+def get_corpus_version() -> str:
+    """Version id of the active corpus, for cache keys ("none" when unavailable)."""
+    current = corpus_manager.get()
+    return current.version if current else "none"
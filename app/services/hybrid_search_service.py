@@ -0,0 +1,151 @@
+"""
+Hybrid search: lexical and dense rankings fused by reciprocal rank.
+
+Dense retrieval finds paraphrases but misses exact statutory terms
+("trộm cắp", "Điều 173"); the lexical index finds those but not
+paraphrases. Both rankings are computed concurrently (the lexical one on
+a worker thread while Qdrant and the embedding model answer), so a
+hybrid search takes about as long as the slower of the two, and merged
+with reciprocal rank fusion.
+
+Results are keyed by corpus article: Qdrant chunks are mapped back to
+their article through the payload's so_hieu and law name, and chunks
+of an article not in the corpus are kept under their payload identity.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from app.schemas.search import LawItem, SearchPage
+from app.services.corpus_manager import CorpusVersion, corpus_manager
+from app.services.json_search_service import json_law_items, rank_json_laws
+from app.services.search_service import search_laws_page
+from app.utils.rank_fusion import reciprocal_rank_fusion
+from app.utils.search_cursor import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
+
+logger = logging.getLogger(__name__)
+
+# Results taken from each ranking before fusion, and how deep pages may
+# push that: a page never ranks more than HYBRID_MAX_DEPTH per side
+HYBRID_DEPTH = 50
+HYBRID_MAX_DEPTH = 200
+
+
+def _dense_key(current: Optional[CorpusVersion], item: LawItem) -> Hashable:
+    """Corpus ordinal of a Qdrant result, or its payload identity."""
+    if current is not None and current.corpus:
+        ordinal = current.lookup.resolve(item.id, item.title)
+        if ordinal is not None:
+            return ordinal
+    return (item.title, item.id)
+
+
+async def hybrid_rank(
+    keyword: str,
+    depth: int = HYBRID_DEPTH,
+    type_filter: Optional[str] = None,
+    year_filter: Optional[str] = None,
+    authority_filter: Optional[str] = None,
+    corpus_version: Optional[CorpusVersion] = None,
+) -> Tuple[List[Tuple[Hashable, float]], Dict[Hashable, LawItem]]:
+    """
+    Fused ranking of the top `depth` lexical and dense results.
+
+    Returns the fused (key, score) list, best first, and the Qdrant
+    result of every key the dense side found. Keys are corpus ordinals
+    or (law name, article id) for articles only Qdrant has.
+
+    The document filters are Qdrant payload filters; the corpus has no
+    such metadata, so with a filter set only articles that also passed
+    it on the dense side are kept.
+    """
+    current = corpus_version or corpus_manager.get()
+    lexical, dense = await asyncio.gather(
+        asyncio.to_thread(rank_json_laws, keyword, depth, current),
+        search_laws_page(
+            keyword,
+            type_filter=type_filter,
+            year_filter=year_filter,
+            authority_filter=authority_filter,
+            limit=depth,
+        ),
+    )
+
+    dense_items: Dict[Hashable, LawItem] = {}
+    dense_ranking = []
+    for item in dense.results:
+        key = _dense_key(current, item)
+        dense_items.setdefault(key, item)
+        dense_ranking.append(key)
+
+    if type_filter or year_filter or authority_filter:
+        lexical = [ordinal for ordinal in lexical if ordinal in dense_items]
+
+    return reciprocal_rank_fusion([lexical, dense_ranking]), dense_items
+
+
+async def hybrid_search_page(
+    keyword: str,
+    type_filter: Optional[str] = None,
+    year_filter: Optional[str] = None,
+    authority_filter: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    corpus_version: Optional[CorpusVersion] = None,
+) -> SearchPage:
+    """
+    One page of hybrid search results.
+
+    Corpus articles are returned whole with a snippet around the keyword
+    terms; articles only Qdrant has are returned as semantic search
+    returns them. `next_cursor` records the offset of the next page;
+    when `cursor` is given, `skip` is ignored.
+
+    Each side ranks max(HYBRID_DEPTH, offset + limit) results, capped at
+    HYBRID_MAX_DEPTH, so a page costs at most that however deep it is.
+    Hybrid results end with the fused candidates of the capped rankings:
+    pages past them are empty. `total` counts those candidates, so it is
+    approximate (`total_exact` is false).
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another query
+    """
+    fingerprint = query_fingerprint(keyword, "hybrid", type_filter, year_filter, authority_filter)
+    offset = skip
+    if cursor:
+        state = decode_cursor(cursor, fingerprint)
+        try:
+            offset = int(state["o"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCursorError("Malformed search cursor") from e
+
+    try:
+        current = corpus_version or corpus_manager.get()
+        fused, dense_items = await hybrid_rank(
+            keyword,
+            depth=min(max(HYBRID_DEPTH, offset + limit), HYBRID_MAX_DEPTH),
+            type_filter=type_filter,
+            year_filter=year_filter,
+            authority_filter=authority_filter,
+            corpus_version=current,
+        )
+
+        page = [key for key, _ in fused[offset:offset + limit]]
+        ordinals = [key for key in page if isinstance(key, int)]
+        corpus_items = dict(zip(ordinals, json_law_items(ordinals, keyword, current)))
+        results = [corpus_items.get(key) or dense_items[key] for key in page]
+
+        end = offset + len(page)
+        next_cursor = encode_cursor({"q": fingerprint, "o": end}) if end < len(fused) else None
+        return SearchPage(results=results, total=len(fused), total_exact=False, next_cursor=next_cursor)
+
+    except Exception as e:
+        logger.error(f"Hybrid search error: {str(e)}", exc_info=True)
+        return SearchPage(results=[], total=0)
@@ -1,48 +1,87 @@
 """
 JSON-based law search service for fast lookup.
-Loads law data from JSON file into memory for instant search.
+Loads law data from JSON file into a columnar in-memory store for
+instant search. An inverted index is built at load time so keyword
+search only touches the posting lists of the query terms, and matches
+are ranked with BM25F over article title, law name and content.
+
+When a compiled snapshot (scripts/build_law_snapshot.py) is present and
+matches the JSON file, the corpus and indexes are memory-mapped from it
+instead of being rebuilt. Loading and hot reload are handled by
+corpus_manager; each call here reads one corpus version throughout.
+
+Keywords may use query syntax (quoted phrases, AND/OR/NOT, parentheses
+and title:/law:/content: prefixes), evaluated on the positional index.
+Keywords that are only a citation ("Điều 123 Bộ luật Hình sự") resolve
+straight to the cited article. rank_json_laws ranks articles sharing any
+term with a keyword, for hybrid retrieval.
 """
 
-import json
 import logging
-from typing import List, Optional
-from pathlib import Path
-from app.schemas.search import LawItem
+from typing import Dict, List, Optional, Set, Tuple
+from app.schemas.search import FacetCount, LawItem, SearchPage, SuggestItem
+from app.services.corpus_manager import CorpusVersion, corpus_manager
+from app.services.law_index import (
+    Citation,
+    InvertedIndex,
+    LawCorpus,
+    QueryEvaluator,
+    SEARCH_FIELDS,
+    bitmap_from_ordinals,
+    bitmap_ordinals,
+    extract_provision,
+    make_snippet,
+    parse_query,
+)
+from app.utils.search_cursor import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
 
 logger = logging.getLogger(__name__)
 
-# Singleton cache for loaded JSON data
-_json_data_cache = None
-_json_file_path = None
+# Terms in more than this share of articles ("thì", "là") carry no signal
+# in an any-term query and would only make every article a candidate
+MAX_DISJUNCTIVE_DF = 0.5
 
 
-def _get_json_file_path() -> Path:
-    """Get the path to the raw law data JSON file."""
-    return Path(__file__).parent.parent / "core" / "raw_law_data.json"
+def _to_law_item(
+    current: CorpusVersion,
+    ordinal: int,
+    description_length: Optional[int] = None,
+    terms: Optional[Set[str]] = None,
+) -> LawItem:
+    """Build the response model for one article; `terms` adds a highlighted snippet."""
+    corpus = current.corpus
+    article_title = corpus.article_titles[ordinal]
+    content = corpus.contents[ordinal]
+    snippet, highlights = make_snippet(content, terms) if terms is not None else (None, None)
+    return LawItem(
+        id=corpus.article_ids[ordinal],
+        key=current.lookup.key_of(ordinal),
+        title=corpus.law_name(ordinal),
+        type="Luật",  # Default type from JSON
+        year=None,    # Not available in raw_law_data.json
+        authority=None,  # Not available in raw_law_data.json
+        description=article_title[:description_length] if description_length else article_title,
+        content=content,
+        snippet=snippet,
+        highlights=highlights,
+    )
 
 
-def load_json_data():
-    """Load law data from JSON file into memory."""
-    global _json_data_cache
-    
-    if _json_data_cache is not None:
-        return _json_data_cache
-    
-    try:
-        file_path = _get_json_file_path()
-        
-        if not file_path.exists():
-            logger.warning(f"JSON file not found: {file_path}")
-            return []
-        
-        with open(file_path, "r", encoding="utf-8") as f:
-            _json_data_cache = json.load(f)
-            logger.info(f"Loaded {len(_json_data_cache)} laws from JSON file")
-            return _json_data_cache
-    
-    except Exception as e:
-        logger.error(f"Error loading JSON data: {str(e)}", exc_info=True)
-        return []
+def load_json_data() -> LawCorpus:
+    """Get the active law corpus, loading it on first use."""
+    current = corpus_manager.get()
+    return current.corpus if current else LawCorpus()
+
+
+def get_json_index() -> Optional[InvertedIndex]:
+    """Get the inverted index of the active corpus."""
+    current = corpus_manager.get()
+    return current.index if current else None
 
 
 def search_json_laws(
@@ -52,99 +91,265 @@ def search_json_laws(
     authority_filter: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
+    corpus_version: Optional[CorpusVersion] = None,
 ) -> List[LawItem]:
     """
     Fast search in JSON data by keyword (title, content, law_name).
-    Returns exact matches and partial matches with pagination support.
+    Matches articles containing every keyword term (the last term may be
+    a prefix; terms typed without diacritics or with a small typo are
+    matched too), ranked by BM25F relevance, with pagination support.
+    Keywords using query syntax ("exact phrase", AND/OR/NOT, law:...)
+    are evaluated as boolean queries and ranked the same way.
+
+    Pass `corpus_version` to pin the search to the version a request
+    started with (e.g. the one its cache key was built from).
+    """
+    return search_json_page(
+        keyword,
+        type_filter=type_filter,
+        year_filter=year_filter,
+        authority_filter=authority_filter,
+        skip=skip,
+        limit=limit,
+        corpus_version=corpus_version,
+    ).results
+
+
+def search_json_page(
+    keyword: str,
+    type_filter: Optional[str] = None,
+    year_filter: Optional[str] = None,
+    authority_filter: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    corpus_version: Optional[CorpusVersion] = None,
+    facet_filters: Optional[Dict[str, str]] = None,
+    with_facets: bool = False,
+) -> SearchPage:
+    """
+    One page of fast search results with the exact total match count.
+
+    Matching and ranking are as in search_json_laws. `next_cursor`
+    resumes right after the last result of the page by its score
+    position; when `cursor` is given, `skip` is ignored.
+
+    `facet_filters` (facet -> value, see law_index.FACETS) restricts the
+    matches by intersecting them with the facet bitmaps; `with_facets`
+    adds hit counts per facet value for the matches.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, belongs to another
+            query or was issued for a corpus version no longer active
     """
+    facet_filters = {facet: value for facet, value in (facet_filters or {}).items() if value}
+    fingerprint = query_fingerprint(
+        keyword, "fast", type_filter, year_filter, authority_filter, sorted(facet_filters.items())
+    )
     try:
-        data = load_json_data()
+        current = corpus_version or corpus_manager.get()
         
-        if not data:
-            return []
+        if current is None or not current.corpus:
+            return SearchPage(results=[], total=0)
         
-        results: List[LawItem] = []
-        keyword_lower = keyword.lower()
+        after = None
+        if cursor:
+            state = decode_cursor(cursor, fingerprint)
+            if state.get("v") != current.version:
+                raise InvalidCursorError("Search cursor expired after a corpus reload")
+            try:
+                after = (float.fromhex(state["s"]), int(state["o"]))
+            except (KeyError, TypeError, ValueError) as e:
+                raise InvalidCursorError("Malformed search cursor") from e
+            skip = 0
         
-        # Track unique laws to avoid duplicates (same law can have multiple articles)
-        seen_laws = set()
+        # Accent-less and slightly misspelled tokens resolve to the real terms
+        query = parse_query(keyword, SEARCH_FIELDS)
+        if query is None:
+            groups = current.matcher.resolve_terms(keyword)
+            matches = current.index.iter_group_matches(groups)
+        else:
+            evaluator = QueryEvaluator(current.index, current.matcher.resolve_token)
+            matches = evaluator.evaluate(query)
+            groups = evaluator.term_groups(query)
         
-        for item in data:
-            # Extract fields from JSON
-            article_id = item.get("article_id", "")
-            article_title = item.get("article_title", "")
-            content = item.get("content", "")
-            law_name = item.get("law_name", "")
-            
-            # Search in article_title, law_name, and content
-            title_match = keyword_lower in article_title.lower()
-            name_match = keyword_lower in law_name.lower()
-            content_match = keyword_lower in content.lower()
-            
-            if not (title_match or name_match or content_match):
-                continue
-            
-            # Create unique key for this law
-            law_key = f"{article_id}_{law_name}"
-            
-            if law_key in seen_laws:
-                continue
-            seen_laws.add(law_key)
-            
-            law = LawItem(
-                id=article_id,
-                title=law_name,
-                type="Luật",  # Default type from JSON
-                year=None,    # Not available in raw_law_data.json
-                authority=None,  # Not available in raw_law_data.json
-                description=article_title[:200],  # First 200 chars as description
-                content=content,
-            )
-            
-            results.append(law)
-            
-            if len(results) >= skip + limit:
-                break
+        facets = None
+        if facet_filters or with_facets:
+            match_bitmap = bitmap_from_ordinals(matches, len(current.corpus))
+            if with_facets:
+                facets = {
+                    facet: [FacetCount(value=value, count=count) for value, count in counts]
+                    for facet, counts in current.facets.counts(match_bitmap, facet_filters).items()
+                }
+            selected = current.facets.filter_bitmap(facet_filters)
+            if selected is not None:
+                match_bitmap &= selected
+            matches = bitmap_ordinals(match_bitmap)
         
-        # Apply skip and limit
-        paginated_results = results[skip:skip + limit]
+        top, total, remaining = current.scorer.rank(groups, matches, skip + limit, after=after)
+        page = top[skip:skip + limit]
+        terms = {term for group in groups for term in group}
         
-        logger.info(f"JSON search for '{keyword}' returned {len(paginated_results)} results (skip={skip}, limit={limit})")
-        return paginated_results
+        # Only the requested page is materialized as LawItem objects
+        paginated_results = [
+            _to_law_item(current, ordinal, description_length=200, terms=terms)  # First 200 chars as description
+            for _, ordinal in page
+        ]
+        
+        next_cursor = None
+        if page and remaining > skip + len(page):
+            score, ordinal = page[-1]
+            next_cursor = encode_cursor({
+                "q": fingerprint,
+                "v": current.version,
+                "s": score.hex(),
+                "o": ordinal,
+            })
+        
+        logger.info(f"JSON search for '{keyword}' returned {len(paginated_results)} of {total} results (skip={skip}, limit={limit})")
+        return SearchPage(results=paginated_results, total=total, next_cursor=next_cursor, facets=facets)
     
+    except InvalidCursorError:
+        raise
     except Exception as e:
         logger.error(f"JSON search error: {str(e)}", exc_info=True)
+        return SearchPage(results=[], total=0)
+
+
+def rank_json_laws(
+    keyword: str,
+    limit: int = 50,
+    corpus_version: Optional[CorpusVersion] = None,
+    min_coverage: float = 0.0,
+) -> List[int]:
+    """
+    Ordinals of the best `limit` articles containing any keyword term.
+
+    Unlike search, an article need not contain every term, so a question
+    in natural language still ranks the articles sharing its rare terms
+    ("trộm", "xe máy") first, by BM25F. Terms are resolved as in search
+    (accent-less, typos). The lexical side of hybrid retrieval.
+
+    Articles matching less than `min_coverage` of the query's IDF weight
+    (BM25FScorer.coverage) are dropped, so one shared word does not make
+    an article relevant to an off-topic question.
+    """
+    current = corpus_version or corpus_manager.get()
+    if current is None or not current.corpus or limit <= 0:
+        return []
+
+    index = current.index
+    groups = [group for group in current.matcher.resolve_terms(keyword) if group]
+    max_df = MAX_DISJUNCTIVE_DF * index.doc_count
+    selective = [
+        group for group in groups
+        if sum(index.document_frequency(term) for term in group) <= max_df
+    ]
+    groups = selective or groups
+    if not groups:
+        return []
+
+    return [
+        ordinal for _, ordinal in current.scorer.rank_any(groups, limit)
+        if not min_coverage or current.scorer.coverage(ordinal, groups) >= min_coverage
+    ]
+
+
+def json_law_items(
+    ordinals: List[int],
+    keyword: str,
+    corpus_version: Optional[CorpusVersion] = None,
+) -> List[LawItem]:
+    """Response models of corpus articles, with snippets around the keyword terms."""
+    current = corpus_version or corpus_manager.get()
+    if current is None or not current.corpus:
         return []
 
+    terms = {term for group in current.matcher.resolve_terms(keyword) for term in group}
+    return [_to_law_item(current, ordinal, description_length=200, terms=terms) for ordinal in ordinals]
 
-def get_json_law_detail(law_id: str) -> Optional[LawItem]:
+
+def cite_json_laws(
+    keyword: str,
+    corpus_version: Optional[CorpusVersion] = None,
+    default_law: Optional[str] = None,
+) -> Tuple[Optional[Citation], List[LawItem]]:
     """
-    Get detail of a law by article_id from JSON.
+    Articles cited by a keyword that is nothing but a citation.
+
+    "Điều 123 Bộ luật Hình sự", "khoản 2 điều 5 LDN" or "Điều 5" (in
+    every law, or in `default_law`) resolve by hash lookup; the snippet
+    of each article is the cited clause or point. Returns (None, []) for
+    any other keyword, which is then searched as usual.
+    """
+    current = corpus_version or corpus_manager.get()
+    if current is None or not current.corpus:
+        return None, []
+
+    citation = current.citations.parse(keyword)
+    if citation is None or not citation.exact:
+        return None, []
+
+    items = []
+    for ordinal in current.citations.resolve(citation, current.lookup, default_law):
+        item = _to_law_item(current, ordinal, description_length=200)
+        if citation.clause or citation.point:
+            item.snippet = extract_provision(item.content, citation.clause, citation.point)
+            item.highlights = [] if item.snippet else None
+        items.append(item)
+    return citation, items
+
+
+def search_citation_page(
+    keyword: str,
+    skip: int = 0,
+    limit: int = 20,
+    corpus_version: Optional[CorpusVersion] = None,
+) -> Optional[SearchPage]:
+    """Search page for a citation keyword (see cite_json_laws), or None."""
+    citation, items = cite_json_laws(keyword, corpus_version)
+    if citation is None or not items:
+        return None
+    return SearchPage(results=items[skip:skip + limit], total=len(items))
+
+
+def suggest_json_laws(prefix: str, limit: int = 8) -> List[SuggestItem]:
+    """
+    Autocomplete a partially typed law name, article id or article title.
+
+    Diacritics and punctuation are ignored ("dieu 12", "hon nhan").
+    """
+    current = corpus_manager.get()
+    if current is None or not current.corpus:
+        return []
+
+    return [
+        SuggestItem(text=item.text, kind=item.kind, law_name=item.law_name, key=item.key)
+        for item in current.suggester.suggest(prefix, limit)
+    ]
+
+
+def get_json_law_detail(law_id: str, law_name: Optional[str] = None) -> Optional[LawItem]:
+    """
+    Get detail of a law article from JSON.
+
+    `law_id` may be the canonical article key, its slug or a bare
+    article_id ("Điều 1"); pass `law_name` to pick that law's article
+    when the article_id alone is ambiguous.
     """
     try:
-        data = load_json_data()
+        current = corpus_manager.get()
         
-        if not data:
+        if current is None or not current.corpus:
             return None
         
-        # Search for the article by article_id
-        for item in data:
-            if item.get("article_id", "").lower() == law_id.lower():
-                law = LawItem(
-                    id=item.get("article_id", ""),
-                    title=item.get("law_name", ""),
-                    type="Luật",
-                    year=None,
-                    authority=None,
-                    description=item.get("article_title", ""),
-                    content=item.get("content", ""),
-                )
-                return law
+        ordinal = current.lookup.resolve(law_id, law_name)
+        if ordinal is not None:
+            return _to_law_item(current, ordinal)
         
-        logger.info(f"Law detail not found for ID: {law_id}")
+        logger.info(f"Law detail not found for ID: {law_id} (law_name={law_name})")
         return None
     
     except Exception as e:
         logger.error(f"Get law detail error: {str(e)}", exc_info=True)
         return None
-
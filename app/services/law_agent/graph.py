@@ -16,6 +16,7 @@ from .state import LawAgentState
 from .nodes.contextualize_agent import contextualize_node
 from .nodes.router_agent import router_node
 from .nodes.retrieval_agent import retriever_node
+from .nodes.reranker_agent import reranker_node
 from .nodes.checker_agent import sufficiency_checker_node
 from .nodes.writer_agent import answer_node
 from .nodes.fallback_agent import fallback_node
@@ -35,6 +36,7 @@ workflow = StateGraph(LawAgentState)
 workflow.add_node("contextualize", contextualize_node)
 workflow.add_node("router", router_node)
 workflow.add_node("retriever", retriever_node)
+workflow.add_node("reranker", reranker_node)  # Pass-through unless RERANKER_MODEL is set
 workflow.add_node("checker", sufficiency_checker_node)
 workflow.add_node("answer", answer_node)
 workflow.add_node("fallback", fallback_node)
@@ -55,7 +57,8 @@ workflow.set_entry_point("contextualize")
 
 workflow.add_edge("contextualize", "router")
 workflow.add_edge("router", "retriever")
-workflow.add_edge("retriever", "checker")
+workflow.add_edge("retriever", "reranker")
+workflow.add_edge("reranker", "checker")
 
 
 # ----------------------
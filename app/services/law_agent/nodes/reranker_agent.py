@@ -0,0 +1,38 @@
+"""
+Re-ranker node for Legal Agentic RAG.
+
+Optional stage between the retriever and the checker (RERANKER_MODEL):
+a cross-encoder re-scores the retrieved documents against the query and
+only the best RERANK_TOP_K are passed on, so the checker and writer
+prompts stay short. Scoring stops at RERANK_BUDGET_MS; documents not
+scored by then keep their retrieval order.
+"""
+
+from app.core.clients import get_reranker
+from app.core.config import settings
+from app.services.law_agent.state import LawAgentState
+
+
+async def reranker_node(state: LawAgentState) -> LawAgentState:
+    reranker = get_reranker()
+    docs = state.retrieved_docs or []
+
+    if reranker is None or not docs:
+        state.node_trace.append("reranker")
+        return state
+
+    print(f"\n⚖️ [RERANKER]: Đang xếp hạng lại {len(docs)} văn bản...")
+    query = state.standalone_query or state.query
+
+    order, scored = await reranker.rerank(
+        query, [doc.content for doc in docs], settings.RERANK_BUDGET_MS
+    )
+    state.retrieved_docs = [docs[i] for i in order[:settings.RERANK_TOP_K]]
+
+    if scored < len(docs):
+        print(f"   ⚠️ Hết thời gian: chấm {scored}/{len(docs)} văn bản, phần còn lại giữ thứ tự truy xuất")
+    for doc in state.retrieved_docs:
+        print(f"   ✅ Giữ: {doc.law_id} ({doc.law_name})")
+
+    state.node_trace.append("reranker")
+    return state
@@ -7,14 +7,21 @@ Production-ready:
 - Safe failure
 """
 
+import asyncio
+
 from app.core.config import settings
-from typing import List
+from typing import Dict, Hashable, List, Optional, Sequence
 
-from app.core.clients import get_qdrant_client, get_embeddings
+from app.core.clients import get_embedding_cache, get_reranker, get_vector_store
+from app.services.corpus_manager import CorpusVersion, corpus_manager
+from app.services.json_search_service import rank_json_laws
+from app.services.law_index import make_snippet
 from app.services.law_agent.state import (
     LawAgentState,
     RetrievedDocument,
 )
+from app.utils.chunks import CHUNK_OVERFETCH, CHUNK_SIZE, collapse_by_article
+from app.utils.rank_fusion import reciprocal_rank_fusion
 
 # Production-grade retrieval thresholds
 HARD_THRESHOLD = 0.60  # Reject garbage results
@@ -29,10 +36,111 @@ DOMAIN_KEYWORDS = {
     "NO_SEARCH": [],  # Accept all domains
 }
 
+# Hybrid mode: results taken from each ranking before fusion
+HYBRID_CANDIDATES = 20
+
+# Keyword-only articles (no Qdrant hit passed HARD_THRESHOLD) must match
+# this share of the query's IDF weight and rank among the first
+# LEXICAL_ONLY_RANK keyword results; they have no similarity score to threshold
+LEXICAL_MIN_COVERAGE = 0.55
+LEXICAL_ONLY_RANK = 3
+
+
+async def _dense_search(query: str, limit: int) -> list:
+    """Points nearest to the query embedding, from Qdrant or the local vector index."""
+    store = get_vector_store()
+    embedding_cache = get_embedding_cache()
+
+    print("   📝 Embedding query...")
+    query_vector = await embedding_cache.embed(query)
+    print(f"   ✓ Vector dimension: {len(query_vector)}")
+
+    print(f"   🔎 Searching in {type(store).__name__} (collection: {settings.COLLECTION_NAME})...")
+    response = await asyncio.wait_for(
+        store.query_points(
+            collection_name=settings.COLLECTION_NAME,
+            query=query_vector,
+            limit=limit,
+            with_payload=True,
+        ),
+        settings.QDRANT_TIMEOUT,
+    )
+    return response.points
+
+
+def _fuse_documents(
+    query: str,
+    dense_hits: list,
+    lexical: Sequence[int],
+    corpus: Optional[CorpusVersion],
+    domain_filter: List[str],
+    limit: int,
+) -> List[RetrievedDocument]:
+    """
+    Top `limit` documents of the reciprocal rank fusion of the filtered
+    Qdrant hits and the keyword ranking; `score` is the fused score.
+
+    Articles Qdrant found keep their retrieved (merged) chunk. Keyword-only
+    articles get an excerpt around the query terms of about a chunk's
+    length, never the whole article, and only the first LEXICAL_ONLY_RANK
+    of them are eligible.
+    """
+    dense_documents: Dict[Hashable, RetrievedDocument] = {}
+    dense_keys = []
+    for hit in dense_hits:
+        payload = hit.payload or {}
+        law_id = payload.get("so_hieu", "Không rõ điều")
+        law_name = payload.get("loai_van_ban", "Không rõ văn bản")
+        ordinal = corpus.lookup.resolve(law_id, law_name) if corpus else None
+        key = ordinal if ordinal is not None else (law_name, law_id)
+        dense_documents.setdefault(key, RetrievedDocument(
+            law_id=law_id,
+            law_name=law_name,
+            content=payload.get("page_content") or payload.get("combine_Article_Content", ""),
+            score=hit.score,
+        ))
+        dense_keys.append(key)
+
+    if domain_filter and corpus:
+        lexical = [
+            ordinal for ordinal in lexical
+            if any(keyword in corpus.corpus.law_name(ordinal) for keyword in domain_filter)
+        ]
+
+    lexical_only = set(lexical[:LEXICAL_ONLY_RANK])
+    terms = {term for group in corpus.matcher.resolve_terms(query) for term in group} if corpus else set()
+
+    documents = []
+    for key, score in reciprocal_rank_fusion([lexical, dense_keys]):
+        if len(documents) == limit:
+            break
+        if key in dense_documents:
+            documents.append(dense_documents[key].model_copy(update={"score": score}))
+        elif key in lexical_only:
+            articles = corpus.corpus
+            excerpt, _ = make_snippet(articles.contents[key], terms, fragment_length=CHUNK_SIZE // 2)
+            documents.append(RetrievedDocument(
+                law_id=articles.article_ids[key],
+                law_name=articles.law_name(key),
+                content=excerpt,
+                score=score,
+            ))
+    return documents
+
 
-def retriever_node(state: LawAgentState) -> LawAgentState:
+async def retriever_node(state: LawAgentState) -> LawAgentState:
     """
     Retrieve relevant legal documents from Qdrant.
+
+    In hybrid mode (RETRIEVER_MODE) the keyword index ranks articles on a
+    worker thread while Qdrant answers, and both rankings are fused by
+    reciprocal rank, so exact statutory terms are not missed.
+
+    Chunks are collapsed by article, so `limit` counts distinct articles
+    and a long article's overlapping chunks reach the prompt once.
+
+    Async so the graph (run with ainvoke) does not block the event loop
+    while Qdrant answers.
     """
 
     try:
@@ -43,30 +151,33 @@ def retriever_node(state: LawAgentState) -> LawAgentState:
         # Consultation queries: limit to 4
         is_procedural = state.intent == "SEARCH_PROCEDURE"
         limit = state.search_limit or (3 if is_procedural else 4)
+        if get_reranker() is not None:
+            # The re-ranker picks the final few from a wider candidate set
+            limit = max(limit, settings.RERANK_CANDIDATES)
         
         print(f"   Query: {query}")
         print(f"   Intent: {state.intent}")
         print(f"   Limit: {limit}")
         print(f"   Hard threshold: {HARD_THRESHOLD}")
 
-        qdrant = get_qdrant_client()
-        embeddings = get_embeddings()
-        print("   ✓ Clients initialized")
-
-        # Embed query
-        print("   📝 Embedding query...")
-        query_vector = embeddings.embed_query(query)
-        print(f"   ✓ Vector dimension: {len(query_vector)}")
-
-        # Search in Qdrant
-        print(f"   🔎 Searching in Qdrant (collection: {settings.COLLECTION_NAME})...")
-        results = qdrant.query_points(
-    collection_name=settings.COLLECTION_NAME,
-    query=query_vector,
-    limit=limit,
-    with_payload=True,
-).points
-
+        hybrid = settings.RETRIEVER_MODE == "hybrid"
+        if hybrid:
+            corpus = corpus_manager.get()
+            print("   🔀 Hybrid: keyword index and Qdrant in parallel...")
+            lexical, results = await asyncio.gather(
+                asyncio.to_thread(rank_json_laws, query, HYBRID_CANDIDATES, corpus, LEXICAL_MIN_COVERAGE),
+                _dense_search(query, max(limit, HYBRID_CANDIDATES) * CHUNK_OVERFETCH),
+                return_exceptions=True,
+            )
+            if isinstance(lexical, BaseException):
+                raise lexical
+            if isinstance(results, BaseException):
+                # The keyword index alone still answers
+                print(f"   ⚠️ Qdrant search failed, keyword results only: {str(results)}")
+                results = []
+            print(f"   ✓ Keyword index: {len(lexical)} articles")
+        else:
+            results = await _dense_search(query, limit * CHUNK_OVERFETCH)
 
         documents: List[RetrievedDocument] = []
 
@@ -104,21 +215,32 @@ def retriever_node(state: LawAgentState) -> LawAgentState:
         # Sort by score (should already be sorted, but ensure it)
         filtered_results.sort(key=lambda x: x.score, reverse=True)
 
-        for hit in filtered_results:
-            score = hit.score
-            payload = hit.payload or {}
+        # One hit per article: best chunk merged with its retrieved neighbours
+        filtered_results = collapse_by_article(filtered_results)
+        print(f"   📚 {len(filtered_results)} distinct articles")
+
+        if hybrid:
+            documents = _fuse_documents(
+                query, filtered_results, lexical, corpus, DOMAIN_KEYWORDS.get(state.intent, []), limit
+            )
+            for doc in documents:
+                print(f"      🔀 Fused: {doc.score:.4f} | {doc.law_id} ({doc.law_name})")
+        else:
+            for hit in filtered_results[:limit]:
+                score = hit.score
+                payload = hit.payload or {}
             
-            # Extract content with fallback
-            content = payload.get("page_content") or payload.get("combine_Article_Content", "")
-
-            documents.append(
-                RetrievedDocument(
-                    law_id=payload.get("so_hieu", "Không rõ điều"),
-                    law_name=payload.get("loai_van_ban", "Không rõ văn bản"),
-                    content=content,
-                    score=score,
+                # Extract content with fallback
+                content = payload.get("page_content") or payload.get("combine_Article_Content", "")
+
+                documents.append(
+                    RetrievedDocument(
+                        law_id=payload.get("so_hieu", "Không rõ điều"),
+                        law_name=payload.get("loai_van_ban", "Không rõ văn bản"),
+                        content=content,
+                        score=score,
+                    )
                 )
-            )
 
         print(f"\n   📊 Final result: {len(documents)} documents after filtering (from {len(results)} initial results)")
         state.retrieved_docs = documents
@@ -1,8 +1,13 @@
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 from app.core.clients import get_llm
+from app.core.config import settings
 from app.services.law_agent.state import LawAgentState
 
+# Hybrid retrieval finds the specific article by its statutory terms,
+# dense retrieval alone needs a wide net to catch it
+PENAL_LIMIT = 6 if settings.RETRIEVER_MODE == "hybrid" else 10
+
 def router_node(state: LawAgentState) -> LawAgentState:
     """Node 1: Router Agent - Điều hướng và xác định số lượng tài liệu cần tìm"""
     llm = get_llm()
@@ -17,7 +22,7 @@ def router_node(state: LawAgentState) -> LawAgentState:
         
         1. "SEARCH_PENAL": Hình sự (Giết người, trộm cắp, ma túy, đánh nhau, án tù...).
            - Đặc điểm: Vector Search thường bị nhiễu bởi các điều luật về hình phạt chung (án treo, tử hình...).
-           - YÊU CẦU ĐẶC BIỆT: Set limit = 10 (Phải lấy rộng để chắc chắn bắt được đúng Điều luật cụ thể).
+           - YÊU CẦU ĐẶC BIỆT: Set limit = {penal_limit} (Phải lấy rộng để chắc chắn bắt được đúng Điều luật cụ thể).
            
         2. "SEARCH_CIVIL": Dân sự (Đất đai, hợp đồng, bồi thường, thừa kế...).
            - Yêu cầu: Set limit = 5
@@ -40,6 +45,7 @@ def router_node(state: LawAgentState) -> LawAgentState:
         }}
         """,
         input_variables=["query"],
+        partial_variables={"penal_limit": PENAL_LIMIT},
     )
     
     chain = prompt | llm | JsonOutputParser()
@@ -47,11 +53,11 @@ def router_node(state: LawAgentState) -> LawAgentState:
         decision = chain.invoke({"query": query})
     except Exception as e:
         print(f"⚠️ Lỗi Router: {e}")
-        # Fallback an toàn: Nếu lỗi thì mặc định tìm Hình sự với limit 10
-        decision = {"intent": "SEARCH_PENAL", "limit": 10}
+        # Fallback an toàn: Nếu lỗi thì mặc định tìm Hình sự với limit rộng
+        decision = {"intent": "SEARCH_PENAL", "limit": PENAL_LIMIT}
 
     state.intent = decision.get("intent", "SEARCH_PENAL")
-    state.search_limit = decision.get("limit", 10)
+    state.search_limit = decision.get("limit", PENAL_LIMIT)
     
     print(f"   -> Quyết định: {decision}")
     state.node_trace.append("router")
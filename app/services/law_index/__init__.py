@@ -0,0 +1,46 @@
+"""
+In-memory lexical indexes over the JSON law corpus.
+
+Used by json_search_service for fast-mode search.
+"""
+
+from .tokenizer import normalize_text, tokenize, token_spans
+from .inverted_index import InvertedIndex
+from .ranking import BM25FScorer
+from .corpus import LawCorpus, SEARCH_FIELDS
+from .lookup import ArticleLookup, article_key
+from .fuzzy import FuzzyTermMatcher
+from .query import QueryEvaluator, parse_query
+from .snippets import make_snippet
+from .facets import FACETS, FacetIndex, bitmap_from_ordinals, bitmap_ordinals
+from .suggest import PrefixSuggester, Suggestion
+from .citation import Citation, CitationResolver, extract_provision
+from .snapshot import LawSnapshot, SnapshotError, write_snapshot
+
+__all__ = [
+    "normalize_text",
+    "tokenize",
+    "token_spans",
+    "InvertedIndex",
+    "BM25FScorer",
+    "LawCorpus",
+    "SEARCH_FIELDS",
+    "ArticleLookup",
+    "article_key",
+    "FuzzyTermMatcher",
+    "QueryEvaluator",
+    "parse_query",
+    "make_snippet",
+    "FACETS",
+    "FacetIndex",
+    "bitmap_from_ordinals",
+    "bitmap_ordinals",
+    "PrefixSuggester",
+    "Suggestion",
+    "Citation",
+    "CitationResolver",
+    "extract_provision",
+    "LawSnapshot",
+    "SnapshotError",
+    "write_snapshot",
+]
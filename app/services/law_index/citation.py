@@ -0,0 +1,241 @@
+"""
+Structured legal citations ("điểm a khoản 2 Điều 123 BLHS").
+
+A query that is nothing but a reference to one provision does not need
+ranking, embeddings or an LLM: the article is found with two hash
+lookups. CitationResolver recognizes the article, clause and point
+numbers and the law (by full name, name without year, subject or
+initialism, with or without diacritics), and cuts the cited clause or
+point out of the article text.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from .fuzzy import fold
+from .lookup import ArticleLookup
+from .tokenizer import normalize_text, tokenize
+
+# Longest law alias, in tokens
+MAX_ALIAS_TOKENS = 10
+
+# Words that may surround a citation without making it a question
+# ("Điều 5 Luật Doanh nghiệp quy định gì?")
+FILLER_WORDS = frozenset(
+    "theo cua tai trong thuoc quy dinh noi dung gi la ve nhu the nao xem tra cuu".split()
+)
+
+# Point letters in statutory order (đ follows d, f/j/w/z are not used)
+POINT_LETTERS = "a b c d đ e g h i k l m n o p q r s t u v x y".split()
+
+# Clauses are numbered sequentially from 1
+CLAUSE_NUMBERS = [str(number) for number in range(1, 100)]
+
+# "2. " and "a) " at a word boundary
+_CLAUSE_MARKER = re.compile(r"(?<!\S)(\d{1,2})\.(?=\s)")
+_POINT_MARKER = re.compile(r"(?<!\S)([a-zđ])\)(?=\s)")
+
+# Cheap pre-check: no article number, no citation
+_ARTICLE_REFERENCE = re.compile(r"\b(?:điều|dieu)\s*\d")
+
+_YEAR = re.compile(r"\b\d{4}\b")
+_PARENTHETICAL = re.compile(r"\([^)]*\)")
+_LAW_TYPE = re.compile(r"^(?:bo\s+)?luat\s+")
+
+
+@dataclass(frozen=True)
+class Citation:
+    article: str
+    clause: Optional[str] = None
+    point: Optional[str] = None
+    law_name: Optional[str] = None
+    # No words besides the citation itself (and fillers) in the text
+    exact: bool = False
+
+    @property
+    def article_id(self) -> str:
+        return f"Điều {self.article}"
+
+    def label(self, law_name: Optional[str] = None) -> str:
+        """
+        Human-readable reference.
+
+        Examples:
+            "Điểm a khoản 2 Điều 123 Bộ luật Hình sự"
+        """
+        parts = []
+        if self.point:
+            parts.append(f"điểm {self.point}")
+        if self.clause:
+            parts.append(f"khoản {self.clause}")
+        parts.append(self.article_id)
+        law_name = law_name or self.law_name
+        if law_name:
+            parts.append(law_name)
+        text = " ".join(parts)
+        return text[0].upper() + text[1:]
+
+
+def _aliases(law_name: str) -> List[Tuple[str, ...]]:
+    """Folded token sequences a law may be cited by."""
+    full = tuple(fold(token) for token in tokenize(law_name))
+    bare = " ".join(fold(token) for token in tokenize(_YEAR.sub("", _PARENTHETICAL.sub("", law_name))))
+    subject = _LAW_TYPE.sub("", bare)
+
+    names = {bare, subject}
+    if subject != bare:
+        # "Luật Hình sự" for "Bộ luật Hình sự"
+        names.add(f"luat {subject}")
+    names |= {name.replace(" va ", " ") for name in names}
+
+    aliases = {full} | {tuple(name.split()) for name in names if name}
+    for name in names:
+        # Initialisms: "blhs", "ldn", "hngd"
+        initials = "".join(word[0] for word in name.split())
+        if len(initials) >= 3:
+            aliases.add((initials,))
+    return sorted(aliases)
+
+
+def _markers(text: str, pattern: Pattern, labels: Sequence[str]) -> List[Tuple[str, int]]:
+    """
+    (label, start) of the sequential markers "1." "2." or "a)" "b)" in
+    `text`. Each label is taken at its first occurrence after the
+    previous one, so numbers in the prose are skipped.
+    """
+    found: List[Tuple[str, int]] = []
+    for match in pattern.finditer(text):
+        if len(found) == len(labels):
+            break
+        if match.group(1) == labels[len(found)]:
+            found.append((match.group(1), match.start()))
+    return found
+
+
+def _section(text: str, pattern: Pattern, labels: Sequence[str], wanted: str) -> Optional[str]:
+    markers = _markers(text, pattern, labels)
+    for number, (label, start) in enumerate(markers):
+        if label == wanted:
+            end = markers[number + 1][1] if number + 1 < len(markers) else len(text)
+            return text[start:end].strip()
+    return None
+
+
+def extract_provision(content: str, clause: Optional[str] = None, point: Optional[str] = None) -> Optional[str]:
+    """
+    Text of a clause ("2. ...") or of a point of it ("a) ...") of an article.
+
+    Returns the whole content when neither is given, and None when the
+    cited clause or point is not found.
+    """
+    text = content
+    if clause:
+        text = _section(text, _CLAUSE_MARKER, CLAUSE_NUMBERS, clause)
+        if text is None:
+            return None
+    if point:
+        # A point without a clause refers to the article's only list
+        text = _section(text, _POINT_MARKER, POINT_LETTERS, point)
+    return text
+
+
+class CitationResolver:
+    """
+    Parse citations and resolve them to corpus ordinals.
+
+    Built once per corpus version from its law names.
+    """
+
+    def __init__(self, law_names: Sequence[str]):
+        self.law_names = list(law_names)
+        self._aliases: Dict[Tuple[str, ...], Optional[str]] = {}
+        for law_name in self.law_names:
+            for alias in _aliases(law_name):
+                # An alias shared by two laws identifies neither
+                if alias in self._aliases and self._aliases[alias] != law_name:
+                    self._aliases[alias] = None
+                else:
+                    self._aliases[alias] = law_name
+
+    def _match_law(self, folded: Sequence[str], start: int) -> Tuple[Optional[str], int]:
+        """Longest law alias at `start`: (law_name, tokens consumed)."""
+        for length in range(min(MAX_ALIAS_TOKENS, len(folded) - start), 0, -1):
+            alias = tuple(folded[start:start + length])
+            if alias in self._aliases:
+                return self._aliases[alias], length
+        return None, 0
+
+    def parse(self, text: str) -> Optional[Citation]:
+        """
+        Citation in `text`, or None when no article is referenced.
+
+        Examples:
+            "Điều 123 Bộ luật Hình sự" -> Citation("123", law_name=..., exact=True)
+            "điểm a khoản 2 điều 5 ldn" -> Citation("5", "2", "a", ..., exact=True)
+        """
+        text = normalize_text(text[:200])
+        if not _ARTICLE_REFERENCE.search(text):
+            return None
+
+        tokens = tokenize(text)
+        folded = [fold(token) for token in tokens]
+        parts: Dict[str, str] = {}
+        law_name = None
+        residual = 0
+
+        position = 0
+        while position < len(tokens):
+            word = folded[position]
+            following = tokens[position + 1] if position + 1 < len(tokens) else ""
+
+            if word in ("dieu", "khoan") and following.isdigit() and word not in parts:
+                parts[word] = following.lstrip("0") or "0"
+                position += 2
+                continue
+            if word == "diem" and following in POINT_LETTERS and word not in parts:
+                parts[word] = following
+                position += 2
+                continue
+
+            matched, length = self._match_law(folded, position)
+            if length and law_name is None:
+                law_name = matched
+                position += length
+                # "BLDS 2015"
+                if position < len(tokens) and _YEAR.fullmatch(tokens[position]):
+                    position += 1
+                continue
+
+            if word not in FILLER_WORDS:
+                residual += 1
+            position += 1
+
+        if "dieu" not in parts:
+            return None
+        return Citation(
+            article=parts["dieu"],
+            clause=parts.get("khoan"),
+            point=parts.get("diem"),
+            law_name=law_name,
+            exact=residual == 0,
+        )
+
+    def resolve(
+        self,
+        citation: Citation,
+        lookup: ArticleLookup,
+        default_law: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Ordinals of the cited article: in the cited law (else `default_law`),
+        or in every law that has it when no law is known.
+        """
+        law_name = citation.law_name or default_law
+        law_names = [law_name] if law_name else self.law_names
+        ordinals = []
+        for name in law_names:
+            ordinal = lookup.resolve(citation.article_id, name)
+            if ordinal is not None:
+                ordinals.append(ordinal)
+        return ordinals
@@ -0,0 +1,128 @@
+"""
+Columnar in-memory store for the law corpus.
+
+Articles are kept as parallel columns instead of one dict per article.
+Law names are interned into a small table and referenced by ordinal,
+text is NFC-normalized once at load, and the lowercased keys used for
+matching are precomputed so no request re-normalizes strings.
+"""
+
+import logging
+import sys
+import unicodedata
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .tokenizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Query-syntax names of the fields returned by LawCorpus.search_fields
+SEARCH_FIELDS = ("title", "law", "content")
+
+
+def _nfc(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "")
+
+
+class LawCorpus:
+    """
+    Parallel-array article store, addressed by article ordinal.
+
+    Columns:
+        article_ids: Display article id ("Điều 1")
+        article_titles: Display title
+        contents: Full article text
+        law_ordinals: Index into `law_names` per article
+        law_names: Distinct law names, interned
+        article_id_keys: Lowercased article id, for matching
+    """
+
+    __slots__ = (
+        "article_ids",
+        "article_titles",
+        "contents",
+        "law_ordinals",
+        "law_names",
+        "article_id_keys",
+    )
+
+    def __init__(self):
+        self.article_ids: Sequence[str] = []
+        self.article_titles: Sequence[str] = []
+        self.contents: Sequence[str] = []
+        self.law_ordinals: Sequence[int] = array("H")
+        self.law_names: List[str] = []
+        self.article_id_keys: Sequence[str] = []
+
+    @classmethod
+    def from_columns(
+        cls,
+        article_ids: Sequence[str],
+        article_titles: Sequence[str],
+        contents: Sequence[str],
+        law_ordinals: Sequence[int],
+        law_names: List[str],
+        article_id_keys: Sequence[str],
+    ) -> "LawCorpus":
+        """Wrap prebuilt columns, e.g. views over a memory-mapped snapshot."""
+        corpus = cls()
+        corpus.article_ids = article_ids
+        corpus.article_titles = article_titles
+        corpus.contents = contents
+        corpus.law_ordinals = law_ordinals
+        corpus.law_names = law_names
+        corpus.article_id_keys = article_id_keys
+        return corpus
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "LawCorpus":
+        """
+        Build the store from raw JSON records.
+
+        A record repeating an earlier (article_id, law_name) pair is
+        dropped so every ordinal is a distinct article.
+        """
+        corpus = cls()
+        law_table: Dict[str, int] = {}
+        seen_laws = set()
+        duplicates = 0
+
+        for record in records:
+            article_id = sys.intern(_nfc(record.get("article_id", "")))
+            law_name = sys.intern(_nfc(record.get("law_name", "")))
+
+            if (article_id, law_name) in seen_laws:
+                duplicates += 1
+                continue
+            seen_laws.add((article_id, law_name))
+
+            law_ordinal = law_table.get(law_name)
+            if law_ordinal is None:
+                law_ordinal = law_table[law_name] = len(corpus.law_names)
+                corpus.law_names.append(law_name)
+
+            corpus.article_ids.append(article_id)
+            corpus.article_titles.append(_nfc(record.get("article_title", "")))
+            corpus.contents.append(_nfc(record.get("content", "")))
+            corpus.law_ordinals.append(law_ordinal)
+            corpus.article_id_keys.append(sys.intern(normalize_text(article_id)))
+
+        if duplicates:
+            logger.info(f"Dropped {duplicates} duplicate articles while loading corpus")
+
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self.article_ids)
+
+    def law_name(self, ordinal: int) -> str:
+        return self.law_names[self.law_ordinals[ordinal]]
+
+    def search_fields(self, ordinal: int) -> Tuple[str, str, str]:
+        """(article_title, law_name, content) of one article, for indexing."""
+        return (
+            self.article_titles[ordinal],
+            self.law_name(ordinal),
+            self.contents[ordinal],
+        )
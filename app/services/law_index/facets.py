@@ -0,0 +1,168 @@
+"""
+Facet bitmaps over the law corpus.
+
+Every facet value (a law, a chapter of a law, a range of article
+numbers) owns a bitmap of the article ordinals that carry it. Bitmaps
+are Python ints, one bit per article, so intersecting a result set with
+a facet value is a single `&` and counting it a `bit_count()`, both
+running in C over machine words.
+
+Chapters are not a column of the JSON data: the heading of the next
+chapter ("Chương II THÀNH LẬP DOANH NGHIỆP") trails the content of the
+last article of the previous one, so chapters are recovered by walking
+each law's articles in order.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .corpus import LawCorpus
+
+# Facet names, in response order
+FACET_LAW = "law_name"
+FACET_CHAPTER = "chapter"
+FACET_ARTICLE_RANGE = "article_range"
+FACETS = (FACET_LAW, FACET_CHAPTER, FACET_ARTICLE_RANGE)
+
+# Width of an article-number bucket ("Điều 1-100", "Điều 101-200", ...)
+ARTICLE_RANGE_WIDTH = 100
+
+_CHAPTER_HEADING = re.compile(r"Chương ([IVXLC]+)\s+(\w+)")
+_ARTICLE_NUMBER = re.compile(r"\d+")
+
+
+def bitmap_from_ordinals(ordinals: Iterable[int], size: int) -> int:
+    """Bitmap with the bits of `ordinals` set (all below `size`)."""
+    bits = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, "little")
+
+
+def bitmap_ordinals(bitmap: int) -> Iterator[int]:
+    """Set bits of `bitmap`, ascending."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for position, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            yield (position << 3) + low.bit_length() - 1
+            byte ^= low
+
+
+def chapter_of(heading_numeral: str, law_name: str) -> str:
+    """Facet value of a chapter, qualified by its law (chapter numbers repeat across laws)."""
+    return f"{law_name} - Chương {heading_numeral}"
+
+
+def article_range_of(article_id: str) -> Optional[str]:
+    """
+    Facet value of the article-number bucket of an article id.
+
+    Examples:
+        "Điều 123" -> "Điều 101-200"
+    """
+    match = _ARTICLE_NUMBER.search(article_id)
+    if not match:
+        return None
+    low = (int(match.group()) - 1) // ARTICLE_RANGE_WIDTH * ARTICLE_RANGE_WIDTH + 1
+    return f"Điều {low}-{low + ARTICLE_RANGE_WIDTH - 1}"
+
+
+def _next_chapter(content: str) -> Optional[str]:
+    """Numeral of the last chapter heading trailing an article's content."""
+    numeral = None
+    for match in _CHAPTER_HEADING.finditer(content):
+        # Headings are followed by an upper-case title; "Chương V của Luật
+        # này" is a cross-reference
+        title_word = match.group(2)
+        if len(title_word) > 1 and title_word.isupper():
+            numeral = match.group(1)
+    return numeral
+
+
+class FacetIndex:
+    """
+    facet -> value -> bitmap of article ordinals.
+
+    Built once per corpus version (values are derived from the columns,
+    so nothing needs to be stored in the snapshot).
+    """
+
+    def __init__(self, bitmaps: Dict[str, Dict[str, int]], doc_count: int):
+        self.bitmaps = bitmaps
+        self.doc_count = doc_count
+
+    @classmethod
+    def build(cls, corpus: LawCorpus) -> "FacetIndex":
+        doc_count = len(corpus)
+        ordinals: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACETS}
+        chapters: Dict[int, str] = {}
+
+        for ordinal in range(doc_count):
+            law_ordinal = corpus.law_ordinals[ordinal]
+            law_name = corpus.law_names[law_ordinal]
+            ordinals[FACET_LAW].setdefault(law_name, []).append(ordinal)
+
+            numeral = chapters.get(law_ordinal, "I")
+            ordinals[FACET_CHAPTER].setdefault(chapter_of(numeral, law_name), []).append(ordinal)
+            following = _next_chapter(corpus.contents[ordinal])
+            if following:
+                chapters[law_ordinal] = following
+
+            article_range = article_range_of(corpus.article_ids[ordinal])
+            if article_range:
+                ordinals[FACET_ARTICLE_RANGE].setdefault(article_range, []).append(ordinal)
+
+        bitmaps = {
+            facet: {
+                value: bitmap_from_ordinals(members, doc_count)
+                for value, members in values.items()
+            }
+            for facet, values in ordinals.items()
+        }
+        return cls(bitmaps, doc_count)
+
+    def filter_bitmap(self, filters: Mapping[str, str], exclude: Optional[str] = None) -> Optional[int]:
+        """
+        Intersection of the bitmaps of the selected facet values.
+
+        `exclude` leaves one facet's own selection out, which is how its
+        counts are computed. Returns None when nothing is selected.
+        """
+        bitmap = None
+        for facet, value in filters.items():
+            if facet == exclude or not value:
+                continue
+            selected = self.bitmaps.get(facet, {}).get(value, 0)
+            bitmap = selected if bitmap is None else bitmap & selected
+        return bitmap
+
+    def counts(
+        self,
+        matches: int,
+        filters: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Hits per facet value for a result bitmap, largest first.
+
+        Each facet is counted with the other facets' filters applied but
+        not its own, so every value shows how many hits choosing it gives.
+        """
+        filters = filters or {}
+        result: Dict[str, List[Tuple[str, int]]] = {}
+
+        for facet in FACETS:
+            base = matches
+            others = self.filter_bitmap(filters, exclude=facet)
+            if others is not None:
+                base &= others
+
+            values = [
+                (value, count)
+                for value, bitmap in self.bitmaps[facet].items()
+                if (count := (bitmap & base).bit_count())
+            ]
+            values.sort(key=lambda item: (-item[1], item[0]))
+            result[facet] = values
+
+        return result
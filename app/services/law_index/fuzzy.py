@@ -0,0 +1,250 @@
+"""
+Diacritic-insensitive and typo-tolerant term resolution.
+
+Works on the index vocabulary rather than on article text: every term
+is folded with the slug generator's normalize_text ("hôn" -> "hon",
+"đơn" -> "don") and the folded forms get a character-trigram index.
+A query token is then resolved to the original terms that fold to it,
+or, failing that, to the terms within a small edit distance of it.
+The resulting term groups feed the normal posting-list intersection
+and BM25F ranking, so accent-less or misspelled queries cost about as
+much as exact ones.
+"""
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.utils.slug_generator import normalize_text as strip_diacritics
+
+from .inverted_index import InvertedIndex, MAX_PREFIX_EXPANSIONS
+from .tokenizer import tokenize
+
+# Cap on original terms a single query token may expand to
+MAX_TERM_EXPANSIONS = 64
+
+
+@lru_cache(maxsize=1 << 16)
+def fold(term: str) -> str:
+    """
+    Fold a normalized term to its accent-less form.
+
+    Examples:
+        "phương" -> "phuong"
+        "đơn" -> "don"
+    """
+    return strip_diacritics(term).lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams ("$$ab$" style), so short terms still get some."""
+    padded = f"$${text}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(token: str) -> int:
+    """Typo budget by token length: Vietnamese syllables are short and easily confused."""
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Levenshtein distance between `a` and `b`, or None when above `limit`.
+
+    Only the diagonal band of width 2 * limit + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if a == b:
+        return 0
+
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        current = [limit + 1] * (len(b) + 1)
+        current[0] = i if i <= limit else limit + 1
+        for j in range(low, high + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+        if min(current[max(0, low - 1):high + 1]) > limit:
+            return None
+        previous = current
+
+    distance = previous[len(b)]
+    return distance if distance <= limit else None
+
+
+def _csr(groups: Dict[str, List[int]]) -> Tuple[List[str], array, array]:
+    """Sorted keys with their id lists flattened: (keys, offsets, ids)."""
+    keys = sorted(groups)
+    offsets = array("I", [0])
+    ids = array("I")
+    for key in keys:
+        ids.extend(groups[key])
+        offsets.append(len(ids))
+    return keys, offsets, ids
+
+
+def _find(keys: Sequence[str], key: str) -> Optional[int]:
+    """Position of `key` in sorted `keys`, or None."""
+    position = bisect_left(keys, key)
+    return position if position < len(keys) and keys[position] == key else None
+
+
+class FuzzyTermMatcher:
+    """
+    Folded-vocabulary and trigram index over an InvertedIndex's terms.
+
+    Built once per corpus version; the vocabulary is small compared to
+    the corpus (one entry per distinct syllable), so this is cheap. Both
+    tables are sorted keys with flat id arrays, so a snapshot can store
+    them and workers map them instead of each building its own dicts.
+
+    Tables:
+        folded_terms: sorted distinct folded terms
+        folded_offsets, folded_term_ids: term ids per folded term
+        grams: sorted trigrams of the folded terms
+        gram_offsets, gram_folded_ids: folded-term positions per trigram
+    """
+
+    def __init__(
+        self,
+        index: InvertedIndex,
+        folded_terms: Optional[Sequence[str]] = None,
+        folded_offsets: Optional[Sequence[int]] = None,
+        folded_term_ids: Optional[Sequence[int]] = None,
+        grams: Optional[Sequence[str]] = None,
+        gram_offsets: Optional[Sequence[int]] = None,
+        gram_folded_ids: Optional[Sequence[int]] = None,
+    ):
+        self.index = index
+
+        if folded_terms is None:
+            by_folded: Dict[str, List[int]] = {}
+            for term_id in range(index.term_count):
+                by_folded.setdefault(fold(index.terms[term_id]), []).append(term_id)
+            folded_terms, folded_offsets, folded_term_ids = _csr(by_folded)
+
+            by_gram: Dict[str, List[int]] = {}
+            for folded_id, folded in enumerate(folded_terms):
+                for gram in trigrams(folded):
+                    by_gram.setdefault(gram, []).append(folded_id)
+            grams, gram_offsets, gram_folded_ids = _csr(by_gram)
+
+        self.folded_terms = folded_terms
+        self.folded_offsets = folded_offsets
+        self.folded_term_ids = folded_term_ids
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_folded_ids = gram_folded_ids
+
+    def _terms_of(self, folded_id: int) -> List[str]:
+        """Original terms folding to folded term `folded_id`."""
+        terms = self.index.terms
+        start, end = self.folded_offsets[folded_id], self.folded_offsets[folded_id + 1]
+        return [terms[term_id] for term_id in self.folded_term_ids[start:end]]
+
+    def folded_matches(self, token: str) -> List[str]:
+        """Original terms whose folded form equals the folded token."""
+        folded_id = _find(self.folded_terms, fold(token))
+        return self._terms_of(folded_id)[:MAX_TERM_EXPANSIONS] if folded_id is not None else []
+
+    def folded_prefix_matches(self, prefix: str) -> List[str]:
+        """Original terms whose folded form starts with the folded prefix."""
+        folded_prefix = fold(prefix)
+        start = bisect_left(self.folded_terms, folded_prefix)
+        end = min(start + MAX_PREFIX_EXPANSIONS, len(self.folded_terms))
+        terms: List[str] = []
+
+        for position in range(start, end):
+            if not self.folded_terms[position].startswith(folded_prefix):
+                break
+            terms.extend(self._terms_of(position))
+
+        return terms[:MAX_TERM_EXPANSIONS]
+
+    def typo_matches(self, token: str) -> List[str]:
+        """
+        Original terms within the token's edit budget, closest first.
+
+        Trigram overlap generates candidates (an edit touches at most
+        three trigrams); edit distance on the folded forms verifies them.
+        Only the terms at the smallest distance found are returned.
+        """
+        folded_token = fold(token)
+        limit = max_edits(folded_token)
+        if limit == 0:
+            return []
+
+        token_grams = trigrams(folded_token)
+        min_shared = max(1, len(token_grams) - 3 * limit)
+
+        shared: Dict[int, int] = {}
+        for gram in token_grams:
+            gram_id = _find(self.grams, gram)
+            if gram_id is None:
+                continue
+            start, end = self.gram_offsets[gram_id], self.gram_offsets[gram_id + 1]
+            for folded_id in self.gram_folded_ids[start:end]:
+                shared[folded_id] = shared.get(folded_id, 0) + 1
+
+        best = limit + 1
+        matches: List[str] = []
+        for folded_id, count in shared.items():
+            if count < min_shared:
+                continue
+            folded = self.folded_terms[folded_id]
+            distance = bounded_edit_distance(folded_token, folded, min(limit, best))
+            if distance is None:
+                continue
+            if distance < best:
+                best = distance
+                matches = []
+            matches.extend(self._terms_of(folded_id))
+
+        return matches[:MAX_TERM_EXPANSIONS]
+
+    def resolve_token(self, token: str, is_last: bool = False) -> List[str]:
+        """
+        Original terms satisfying one normalized query token.
+
+        A token typed with diacritics matches exactly; otherwise, as for an
+        accent-less or mis-accented token, it matches every term that folds
+        to the same form. The last token may also be an unfinished prefix.
+        Typo correction is the fallback.
+        """
+        has_diacritics = fold(token) != token
+
+        if has_diacritics:
+            if self.index.term_id(token) is not None:
+                return [token]
+            if is_last:
+                terms = self.index.prefix_terms(token)
+                if terms:
+                    return terms
+        terms = self.folded_matches(token)
+        if terms:
+            return terms
+        if is_last:
+            terms = self.folded_prefix_matches(token)
+            if terms:
+                return terms
+        return self.typo_matches(token)
+
+    def resolve_terms(self, query: str) -> List[List[str]]:
+        """Term groups for a query, as InvertedIndex.resolve_terms but fuzzy."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        return [
+            self.resolve_token(token, is_last=(position == len(tokens) - 1))
+            for position, token in enumerate(tokens)
+        ]
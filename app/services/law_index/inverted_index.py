@@ -0,0 +1,313 @@
+"""
+Inverted index: term -> sorted posting list of article ordinals.
+
+Built once when the corpus is loaded. A query is answered by
+intersecting the posting lists of its terms, so its cost depends on
+the length of the rarest term's list instead of the corpus size.
+
+Documents are indexed as a tuple of fields (e.g. article title, law
+name, content). Per-field term frequencies and field lengths are kept
+alongside the postings for relevance scoring, and the token positions
+of every posting for phrase queries.
+
+Storage is a flat CSR layout (sorted terms, offsets, postings,
+frequencies) held in memoryviews, so the same index runs over arrays
+built in memory or over sections of a memory-mapped snapshot.
+"""
+
+from array import array
+from bisect import bisect_left
+from itertools import compress, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .tokenizer import tokenize
+
+# Upper bound on vocabulary terms a trailing prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+# Term frequencies are stored as unsigned shorts
+_MAX_FREQUENCY = 0xFFFF
+
+# A position is stored as (field << POSITION_BITS) | token position, so
+# adjacent tokens of one field have consecutive positions
+POSITION_BITS = 24
+_MAX_POSITION = (1 << POSITION_BITS) - 1
+
+
+def encode_position(field: int, position: int) -> int:
+    return (field << POSITION_BITS) | position
+
+
+def position_field(encoded: int) -> int:
+    return encoded >> POSITION_BITS
+
+
+def intersect_postings(postings: List[Sequence[int]]) -> Iterator[int]:
+    """
+    Lazily intersect sorted posting lists, driven by the rarest one.
+
+    Each candidate from the shortest list is located in the others with
+    bisect from a moving cursor, so producing the first k matches costs
+    O(k * log n) no matter how long the lists are.
+    """
+    if not postings:
+        return
+
+    driver, *others = sorted(postings, key=len)
+    cursors = [0] * len(others)
+
+    for ordinal in driver:
+        for i, other in enumerate(others):
+            position = bisect_left(other, ordinal, cursors[i])
+            if position == len(other):
+                return
+            cursors[i] = position
+            if other[position] != ordinal:
+                break
+        else:
+            yield ordinal
+
+
+class InvertedIndex:
+    """
+    Term -> posting list index over a sequence of fielded documents.
+
+    Layout (t = term id, i = global posting number, f = field):
+        terms: sorted vocabulary, term id = position
+        offsets[t]:offsets[t + 1]: slice of `postings` for term t
+        postings[i]: article ordinal, ascending within a term
+        frequencies[i * field_count + f]: term frequency in field f
+        field_lengths[f][ordinal]: token count of field f
+        position_offsets[i]:position_offsets[i + 1]: slice of `positions`
+            for posting i, ascending encoded positions (see encode_position)
+
+    Positions are optional; without them phrase queries are unavailable.
+    """
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        offsets: Sequence[int],
+        postings: Sequence[int],
+        frequencies: Sequence[int],
+        field_lengths: List[Sequence[int]],
+        doc_count: int,
+        position_offsets: Optional[Sequence[int]] = None,
+        positions: Optional[Sequence[int]] = None,
+    ):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings_data = postings
+        self.frequencies = frequencies
+        self.field_lengths = field_lengths
+        self.field_count = len(field_lengths)
+        self.doc_count = doc_count
+        self.position_offsets = position_offsets
+        self.positions = positions
+        self.avg_field_lengths = [
+            (sum(lengths) / doc_count) if doc_count else 0.0
+            for lengths in field_lengths
+        ]
+
+    @classmethod
+    def build(cls, documents: Iterable[Sequence[str]]) -> "InvertedIndex":
+        """Index each document's fields under its position in `documents`."""
+        postings: Dict[str, array] = {}
+        frequencies: Dict[str, array] = {}
+        positions: Dict[str, array] = {}
+        position_counts: Dict[str, array] = {}
+        field_lengths: List[array] = []
+        doc_count = 0
+
+        for ordinal, fields in enumerate(documents):
+            if not field_lengths:
+                field_lengths = [array("I") for _ in fields]
+
+            counts: Dict[str, List[int]] = {}
+            doc_positions: Dict[str, List[int]] = {}
+            for field, text in enumerate(fields):
+                tokens = tokenize(text)
+                field_lengths[field].append(len(tokens))
+                for position, term in enumerate(tokens):
+                    term_counts = counts.get(term)
+                    if term_counts is None:
+                        term_counts = counts[term] = [0] * len(fields)
+                        doc_positions[term] = []
+                    term_counts[field] += 1
+                    if position <= _MAX_POSITION:
+                        doc_positions[term].append(encode_position(field, position))
+
+            for term, term_counts in counts.items():
+                posting_list = postings.get(term)
+                if posting_list is None:
+                    posting_list = postings[term] = array("I")
+                    frequencies[term] = array("H")
+                    positions[term] = array("I")
+                    position_counts[term] = array("I")
+                posting_list.append(ordinal)
+                frequencies[term].extend(min(c, _MAX_FREQUENCY) for c in term_counts)
+                positions[term].extend(doc_positions[term])
+                position_counts[term].append(len(doc_positions[term]))
+
+            doc_count += 1
+
+        # Flatten into the CSR layout
+        terms = sorted(postings)
+        flat_offsets = array("I", [0])
+        flat_postings = array("I")
+        flat_frequencies = array("H")
+        flat_position_offsets = array("I", [0])
+        flat_positions = array("I")
+        for term in terms:
+            flat_postings.extend(postings[term])
+            flat_frequencies.extend(frequencies[term])
+            flat_offsets.append(len(flat_postings))
+            flat_positions.extend(positions[term])
+            for count in position_counts[term]:
+                flat_position_offsets.append(flat_position_offsets[-1] + count)
+
+        return cls(
+            terms,
+            memoryview(flat_offsets),
+            memoryview(flat_postings),
+            memoryview(flat_frequencies),
+            [memoryview(lengths) for lengths in field_lengths],
+            doc_count,
+            memoryview(flat_position_offsets),
+            memoryview(flat_positions),
+        )
+
+    @property
+    def term_count(self) -> int:
+        return len(self.terms)
+
+    def term_id(self, term: str) -> Optional[int]:
+        """Position of `term` in the sorted vocabulary, or None."""
+        position = bisect_left(self.terms, term)
+        if position < len(self.terms) and self.terms[position] == term:
+            return position
+        return None
+
+    def _term_postings(self, term_id: int) -> Sequence[int]:
+        return self.postings_data[self.offsets[term_id]:self.offsets[term_id + 1]]
+
+    def postings(self, term: str) -> Sequence[int]:
+        """Posting list for an already-normalized term (empty if unknown)."""
+        term_id = self.term_id(term)
+        return self._term_postings(term_id) if term_id is not None else ()
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_id(term)
+        return self.offsets[term_id + 1] - self.offsets[term_id] if term_id is not None else 0
+
+    def field_frequencies(self, term: str, ordinal: int) -> Optional[Sequence[int]]:
+        """Per-field frequencies of `term` in document `ordinal`, or None."""
+        term_id = self.term_id(term)
+        if term_id is None:
+            return None
+        return self.term_field_frequencies(term_id, ordinal)
+
+    def posting_index(self, term_id: int, ordinal: int) -> Optional[int]:
+        """Global posting number of (term, document), or None if absent."""
+        start = self.offsets[term_id]
+        end = self.offsets[term_id + 1]
+        position = bisect_left(self.postings_data, ordinal, start, end)
+        if position == end or self.postings_data[position] != ordinal:
+            return None
+        return position
+
+    def term_field_frequencies(self, term_id: int, ordinal: int) -> Optional[Sequence[int]]:
+        """Same as field_frequencies, for an already-resolved term id."""
+        position = self.posting_index(term_id, ordinal)
+        if position is None:
+            return None
+
+        start = position * self.field_count
+        return self.frequencies[start:start + self.field_count]
+
+    @property
+    def has_positions(self) -> bool:
+        return self.positions is not None
+
+    def term_positions(self, term_id: int, ordinal: int) -> Sequence[int]:
+        """Encoded positions of a term in one document (empty if absent)."""
+        position = self.posting_index(term_id, ordinal)
+        if position is None or self.positions is None:
+            return ()
+        return self.positions[self.position_offsets[position]:self.position_offsets[position + 1]]
+
+    def field_postings(self, term: str, field: int) -> List[int]:
+        """Ordinals of documents containing `term` in field `field`."""
+        term_id = self.term_id(term)
+        if term_id is None:
+            return []
+
+        start = self.offsets[term_id]
+        end = self.offsets[term_id + 1]
+        in_field = self.frequencies[start * self.field_count + field:end * self.field_count:self.field_count]
+        return list(compress(self.postings_data[start:end], in_field))
+
+    def prefix_terms(self, prefix: str) -> List[str]:
+        """Vocabulary terms starting with `prefix` (bounded)."""
+        start = bisect_left(self.terms, prefix)
+        end = min(start + MAX_PREFIX_EXPANSIONS, len(self.terms))
+        terms = []
+
+        for position in range(start, end):
+            term = self.terms[position]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+
+        return terms
+
+    def union_postings(self, terms: Sequence[str]) -> Sequence[int]:
+        """Sorted union of the posting lists of `terms`."""
+        if len(terms) == 1:
+            return self.postings(terms[0])
+
+        merged = set()
+        for term in terms:
+            merged.update(self.postings(term))
+        return sorted(merged)
+
+    def prefix_postings(self, prefix: str) -> Sequence[int]:
+        """Union of the posting lists of every term starting with `prefix`."""
+        return self.union_postings(self.prefix_terms(prefix))
+
+    def resolve_terms(self, query: str) -> List[List[str]]:
+        """
+        Map query tokens to the vocabulary terms that satisfy them.
+
+        Every token resolves to itself, except the last one which may be
+        incomplete while the user is still typing: when it is not a known
+        term it expands to the terms it prefixes. An empty group means
+        the token cannot match anything.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        groups: List[List[str]] = []
+
+        for position, token in enumerate(tokens):
+            if self.term_id(token) is not None:
+                groups.append([token])
+            elif position == len(tokens) - 1:
+                groups.append(self.prefix_terms(token))
+            else:
+                groups.append([])
+
+        return groups
+
+    def iter_matches(self, query: str) -> Iterator[int]:
+        """Ordinals of documents matching every query token, in corpus order."""
+        return self.iter_group_matches(self.resolve_terms(query))
+
+    def iter_group_matches(self, groups: List[List[str]]) -> Iterator[int]:
+        """Ordinals of documents containing a term of every group, in corpus order."""
+        if not groups or not all(groups):
+            return iter(())
+
+        return intersect_postings([self.union_postings(terms) for terms in groups])
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """First `limit` matching ordinals (all of them when limit is None)."""
+        return list(islice(self.iter_matches(query), limit))
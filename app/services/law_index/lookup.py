@@ -0,0 +1,96 @@
+"""
+Hash lookups from article identifiers to corpus ordinals.
+
+Every code restarts its numbering at "Điều 1", so a bare article id is
+ambiguous. Each article therefore also gets a canonical global key: the
+same slug TrackingService stores for a saved law
+("dieu-1-luat-doanh-nghiep-2020"), which is unique across the corpus.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.utils.slug_generator import create_law_slug, fold_legacy_slug, generate_slug
+
+from .corpus import LawCorpus
+from .tokenizer import normalize_text
+
+
+def article_key(law_name: str, article_id: str) -> str:
+    """
+    Canonical global key of an article.
+
+    Examples:
+        ("Luật Doanh nghiệp 2020", "Điều 1") -> "dieu-1-luat-doanh-nghiep-2020"
+    """
+    return create_law_slug(article_id, law_name)
+
+
+class ArticleLookup:
+    """
+    Constant-time article resolution built once per corpus.
+
+    Indexes:
+        by canonical key: article_key(law_name, article_id)
+        by (law_name, article_id): both compared case-insensitively
+        by article id or its slug ("Điều 1", "dieu-1"): first article in
+            corpus order, kept for callers that do not know the law
+    """
+
+    def __init__(self, corpus: LawCorpus, keys: Optional[Sequence[str]] = None):
+        """
+        Args:
+            corpus: Store to index
+            keys: Precomputed canonical keys per ordinal (from a snapshot);
+                computed from the corpus when omitted
+        """
+        self.keys: Sequence[str] = keys if keys is not None else []
+        self._by_key: Dict[str, int] = {}
+        self._by_law_article: Dict[Tuple[str, str], int] = {}
+        self._by_article_id: Dict[str, int] = {}
+
+        law_name_keys = [normalize_text(law_name) for law_name in corpus.law_names]
+
+        for ordinal in range(len(corpus)):
+            article_id_key = corpus.article_id_keys[ordinal]
+            law_ordinal = corpus.law_ordinals[ordinal]
+
+            if keys is None:
+                key = article_key(corpus.law_names[law_ordinal], corpus.article_ids[ordinal])
+                self.keys.append(key)
+            else:
+                key = keys[ordinal]
+
+            self._by_key.setdefault(key, ordinal)
+            self._by_law_article.setdefault((law_name_keys[law_ordinal], article_id_key), ordinal)
+
+            # Article ids repeat across laws: slug each distinct id once
+            if article_id_key not in self._by_article_id:
+                self._by_article_id[article_id_key] = ordinal
+                self._by_article_id.setdefault(generate_slug(corpus.article_ids[ordinal]), ordinal)
+
+    def resolve(self, law_id: str, law_name: Optional[str] = None) -> Optional[int]:
+        """
+        Ordinal of the article identified by `law_id`, or None.
+
+        `law_id` may be a canonical key, a slug or an article id. When
+        `law_name` is given the (law_name, article_id) pair is used so
+        "Điều 1" resolves to that law's article and not the first one.
+        """
+        if not law_id:
+            return None
+
+        law_id_key = normalize_text(law_id.strip())
+
+        if law_name:
+            return self._by_law_article.get((normalize_text(law_name.strip()), law_id_key))
+
+        # Slugs made before Đ/đ folding ("đieu-1-...") resolve in their current form
+        for index in (self._by_key, self._by_article_id):
+            for key in (law_id_key, fold_legacy_slug(law_id_key)):
+                ordinal = index.get(key)
+                if ordinal is not None:
+                    return ordinal
+        return None
+
+    def key_of(self, ordinal: int) -> str:
+        return self.keys[ordinal]
@@ -0,0 +1,350 @@
+"""
+Phrase and boolean queries over a positional InvertedIndex.
+
+Syntax (operators are upper-case, AND is implied between clauses;
+NOT applies to the words up to the next operator as one phrase, since
+a Vietnamese word such as "thế vị" spans several syllables):
+    ly hôn                       both terms
+    "tài sản chung của vợ chồng" exact phrase
+    thừa kế AND di chúc NOT thế vị
+    (di chúc OR thừa kế) tài sản grouping
+    title:"ly hôn" law:"hình sự" field prefixes
+
+Every clause evaluates to a sorted list of article ordinals; AND, OR
+and NOT are merges of those lists, and phrases are verified on the
+positions of the documents that contain all of their terms.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .inverted_index import InvertedIndex, intersect_postings, position_field
+from .tokenizer import tokenize
+
+_LEXER = re.compile(
+    r'"(?P<phrase>[^"]*)"?'
+    r"|(?P<open>\()"
+    r"|(?P<close>\))"
+    r"|(?P<field>\w+):(?=\S)"
+    r'|(?P<word>[^\s()"]+)'
+)
+
+
+@dataclass(frozen=True)
+class TermQuery:
+    token: str
+    field: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class PhraseQuery:
+    tokens: Tuple[str, ...]
+    field: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class AndQuery:
+    children: Tuple["QueryNode", ...]
+
+
+@dataclass(frozen=True)
+class OrQuery:
+    children: Tuple["QueryNode", ...]
+
+
+@dataclass(frozen=True)
+class NotQuery:
+    child: "QueryNode"
+
+
+QueryNode = Union[TermQuery, PhraseQuery, AndQuery, OrQuery, NotQuery]
+
+
+class _Parser:
+    """Recursive-descent parser; malformed input degrades instead of failing."""
+
+    def __init__(self, text: str, fields: Sequence[str]):
+        self.fields: Dict[str, int] = {name: field for field, name in enumerate(fields)}
+        self.tokens: List[Tuple[str, str]] = [
+            (match.lastgroup, match.group(match.lastgroup) or "")
+            for match in _LEXER.finditer(text)
+        ]
+        self.position = 0
+        self.depth = 0
+        self.uses_syntax = False
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _is_operator(self, name: str) -> bool:
+        token = self._peek()
+        return token is not None and token == ("word", name)
+
+    def parse(self) -> Optional["QueryNode"]:
+        return self._parse_or(None)
+
+    def _parse_or(self, field: Optional[int]) -> Optional["QueryNode"]:
+        children = [self._parse_and(field)]
+        while self._is_operator("OR"):
+            self.uses_syntax = True
+            self.position += 1
+            children.append(self._parse_and(field))
+
+        children = [child for child in children if child is not None]
+        if len(children) <= 1:
+            return children[0] if children else None
+        return OrQuery(tuple(children))
+
+    def _parse_and(self, field: Optional[int]) -> Optional["QueryNode"]:
+        children = []
+        while True:
+            token = self._peek()
+            if token is None or token == ("word", "OR"):
+                break
+            if token[0] == "close":
+                if self.depth:
+                    break
+                # Stray closing parenthesis at top level
+                self.position += 1
+                continue
+            if token == ("word", "AND"):
+                self.uses_syntax = True
+                self.position += 1
+                continue
+
+            child = self._parse_unary(field)
+            if child is not None:
+                children.append(child)
+
+        if len(children) <= 1:
+            return children[0] if children else None
+        return AndQuery(tuple(children))
+
+    def _parse_unary(self, field: Optional[int]) -> Optional["QueryNode"]:
+        if self._is_operator("NOT"):
+            self.uses_syntax = True
+            self.position += 1
+            words = self._take_words()
+            child = self._words_query(" ".join(words), field) if words else self._parse_unary(field)
+            return NotQuery(child) if child is not None else None
+        return self._parse_primary(field)
+
+    def _take_words(self) -> List[str]:
+        """Consume bare words up to the next operator, quote, field or parenthesis."""
+        words = []
+        while True:
+            token = self._peek()
+            if token is None or token[0] != "word" or token[1] in ("AND", "OR", "NOT"):
+                return words
+            words.append(token[1])
+            self.position += 1
+
+    def _words_query(self, text: str, field: Optional[int]) -> Optional["QueryNode"]:
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        if len(tokens) == 1:
+            return TermQuery(tokens[0], field)
+        # A quoted phrase, or a word the tokenizer splits ("doanh-nghiệp")
+        return PhraseQuery(tuple(tokens), field)
+
+    def _parse_primary(self, field: Optional[int]) -> Optional["QueryNode"]:
+        token = self._peek()
+        if token is None or token[0] == "close":
+            # Dangling operator or field prefix
+            return None
+        kind, value = token
+        self.position += 1
+
+        if kind == "open":
+            self.uses_syntax = True
+            self.depth += 1
+            node = self._parse_or(field)
+            self.depth -= 1
+            if self._peek() is not None and self._peek()[0] == "close":
+                self.position += 1
+            return node
+
+        if kind == "field":
+            if value.lower() in self.fields:
+                self.uses_syntax = True
+                return self._parse_primary(self.fields[value.lower()])
+            kind = "word"
+
+        if kind == "phrase":
+            self.uses_syntax = True
+        return self._words_query(value, field)
+
+
+def parse_query(text: str, fields: Sequence[str] = ()) -> Optional["QueryNode"]:
+    """
+    Parse query syntax; `fields` names the index fields in order.
+
+    Returns None when the text uses no syntax at all (no quotes,
+    operators, parentheses or known field prefixes), so callers can keep
+    their plain keyword matching for it.
+    """
+    parser = _Parser(text, fields)
+    node = parser.parse()
+    return node if parser.uses_syntax else None
+
+
+def _union(lists: Iterable[Sequence[int]]) -> List[int]:
+    """Merge sorted ordinal lists, dropping duplicates."""
+    merged: List[int] = []
+    for ordinal in heapq.merge(*lists):
+        if not merged or merged[-1] != ordinal:
+            merged.append(ordinal)
+    return merged
+
+
+def _difference(include: Sequence[int], exclude: Sequence[int]) -> List[int]:
+    """Ordinals of sorted `include` that are not in sorted `exclude`."""
+    result: List[int] = []
+    j = 0
+    for ordinal in include:
+        while j < len(exclude) and exclude[j] < ordinal:
+            j += 1
+        if j == len(exclude) or exclude[j] != ordinal:
+            result.append(ordinal)
+    return result
+
+
+class QueryEvaluator:
+    """
+    Evaluate parsed queries against an index.
+
+    Args:
+        index: Index to evaluate against (needs positions for phrases)
+        resolve_token: Maps one query token to the vocabulary terms that
+            satisfy it; exact match by default. Pass
+            FuzzyTermMatcher.resolve_token for accent-insensitive queries.
+    """
+
+    def __init__(
+        self,
+        index: InvertedIndex,
+        resolve_token: Optional[Callable[[str], List[str]]] = None,
+    ):
+        self.index = index
+        self.resolve_token = resolve_token or self._exact_terms
+
+    def _exact_terms(self, token: str) -> List[str]:
+        return [token] if self.index.term_id(token) is not None else []
+
+    def evaluate(self, node: "QueryNode") -> List[int]:
+        """Sorted ordinals of the documents matching `node`."""
+        if isinstance(node, TermQuery):
+            return self._term_postings(self.resolve_token(node.token), node.field)
+        if isinstance(node, PhraseQuery):
+            return self._evaluate_phrase(node)
+        if isinstance(node, AndQuery):
+            return self._evaluate_and(node)
+        if isinstance(node, OrQuery):
+            return _union(self.evaluate(child) for child in node.children)
+        if isinstance(node, NotQuery):
+            return _difference(range(self.index.doc_count), self.evaluate(node.child))
+        raise TypeError(f"Unknown query node: {node!r}")
+
+    def term_groups(self, node: "QueryNode") -> List[List[str]]:
+        """Resolved term groups of the non-negated clauses, for ranking."""
+        groups: List[List[str]] = []
+        seen = set()
+
+        def collect(current: "QueryNode") -> None:
+            if isinstance(current, TermQuery):
+                tokens: Tuple[str, ...] = (current.token,)
+            elif isinstance(current, PhraseQuery):
+                tokens = current.tokens
+            elif isinstance(current, (AndQuery, OrQuery)):
+                for child in current.children:
+                    collect(child)
+                return
+            else:
+                return
+
+            for token in tokens:
+                if token not in seen:
+                    seen.add(token)
+                    groups.append(self.resolve_token(token))
+
+        collect(node)
+        return [group for group in groups if group]
+
+    def _term_postings(self, terms: List[str], field: Optional[int]) -> Sequence[int]:
+        if field is None:
+            return self.index.union_postings(terms) if terms else []
+        if len(terms) == 1:
+            return self.index.field_postings(terms[0], field)
+        return _union(self.index.field_postings(term, field) for term in terms)
+
+    def _evaluate_and(self, node: AndQuery) -> List[int]:
+        # Phrases are verified last, only on documents matching everything else
+        positives = sorted(
+            (child for child in node.children if not isinstance(child, NotQuery)),
+            key=lambda child: isinstance(child, PhraseQuery),
+        )
+        negatives = [child.child for child in node.children if isinstance(child, NotQuery)]
+
+        result: Optional[Sequence[int]] = None
+        for child in positives:
+            if isinstance(child, PhraseQuery):
+                result = self._evaluate_phrase(child, within=result)
+            else:
+                ordinals = self.evaluate(child)
+                result = ordinals if result is None else list(intersect_postings([result, ordinals]))
+            if not result:
+                return []
+        if result is None:
+            result = range(self.index.doc_count)
+
+        for child in negatives:
+            if not result:
+                break
+            if isinstance(child, PhraseQuery):
+                excluded = self._evaluate_phrase(child, within=result)
+            else:
+                excluded = self.evaluate(child)
+            result = _difference(result, excluded)
+        return list(result)
+
+    def _evaluate_phrase(self, node: PhraseQuery, within: Optional[Sequence[int]] = None) -> List[int]:
+        """Documents containing the phrase, optionally among sorted `within` only."""
+        if not self.index.has_positions:
+            raise ValueError("Phrase queries need an index built with positions")
+
+        groups = [self.resolve_token(token) for token in node.tokens]
+        if not all(groups):
+            return []
+
+        term_ids = [
+            [term_id for term_id in map(self.index.term_id, terms) if term_id is not None]
+            for terms in groups
+        ]
+        lists = [self._term_postings(terms, node.field) for terms in groups]
+        if within is not None:
+            lists.append(within)
+        return [
+            ordinal
+            for ordinal in intersect_postings(lists)
+            if self._phrase_at(ordinal, term_ids, node.field)
+        ]
+
+    def _phrase_at(self, ordinal: int, term_ids: List[List[int]], field: Optional[int]) -> bool:
+        """Whether token k of the phrase occurs at start + k for some start."""
+        index = self.index
+
+        def positions(ids: List[int]) -> Iterable[int]:
+            if len(ids) == 1:
+                return index.term_positions(ids[0], ordinal)
+            return _union(index.term_positions(term_id, ordinal) for term_id in ids)
+
+        following = [set(positions(ids)) for ids in term_ids[1:]]
+        for start in positions(term_ids[0]):
+            if field is not None and position_field(start) != field:
+                continue
+            if all(start + offset in later for offset, later in enumerate(following, 1)):
+                return True
+        return False
@@ -0,0 +1,196 @@
+"""
+BM25F relevance scoring over an InvertedIndex.
+
+Each field's term frequency is length-normalized and weighted before
+the BM25 saturation is applied, so a hit in an article title counts
+for more than the same hit buried in a long article body.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .inverted_index import InvertedIndex
+
+
+class BM25FScorer:
+    """
+    BM25F scorer with a bounded top-k heap.
+
+    Args:
+        index: Index whose per-field frequencies and lengths are used
+        field_weights: Boost per field, in the index's field order
+        k1: Term frequency saturation
+        b: Length normalization strength (0 = none, 1 = full)
+    """
+
+    def __init__(
+        self,
+        index: InvertedIndex,
+        field_weights: Sequence[float],
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        if len(field_weights) != index.field_count:
+            raise ValueError(
+                f"Expected {index.field_count} field weights, got {len(field_weights)}"
+            )
+
+        self.index = index
+        self.field_weights = list(field_weights)
+        self.k1 = k1
+        self.b = b
+
+    def idf(self, term: str) -> float:
+        """Robertson-Sparck Jones IDF, floored at zero by the +1."""
+        n = self.index.doc_count
+        df = self.index.document_frequency(term)
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, ordinal: int, term_groups: List[List[str]]) -> float:
+        """
+        Score one document for resolved query terms.
+
+        A group holds the vocabulary terms that satisfy one query token
+        (several when a trailing prefix was expanded); each present term
+        contributes.
+        """
+        return self._score(ordinal, self._term_idfs(term_groups))
+
+    def coverage(self, ordinal: int, term_groups: List[List[str]]) -> float:
+        """
+        Share of the query's IDF weight that one document matches.
+
+        A group weighs the IDF of its rarest term and is matched when the
+        document holds any of its terms: 1.0 means every query token
+        matched, however often.
+        """
+        index = self.index
+        total = matched = 0.0
+        for terms in term_groups:
+            term_ids = [term_id for term_id in map(index.term_id, terms) if term_id is not None]
+            if not term_ids:
+                continue
+            weight = max(self.idf(term) for term in terms)
+            total += weight
+            if any(index.posting_index(term_id, ordinal) is not None for term_id in term_ids):
+                matched += weight
+        return matched / total if total else 0.0
+
+    def _term_idfs(self, term_groups: List[List[str]]) -> List[Tuple[int, float]]:
+        """(term id, idf) of every known term, resolved once per query."""
+        term_idfs = []
+        for terms in term_groups:
+            for term in terms:
+                term_id = self.index.term_id(term)
+                if term_id is not None:
+                    term_idfs.append((term_id, self.idf(term)))
+        return term_idfs
+
+    def _score(self, ordinal: int, term_idfs: List[Tuple[int, float]]) -> float:
+        index = self.index
+        total = 0.0
+
+        for term_id, idf in term_idfs:
+            frequencies = index.term_field_frequencies(term_id, ordinal)
+            if frequencies is None:
+                continue
+
+            weighted_tf = 0.0
+            for field, tf in enumerate(frequencies):
+                if not tf:
+                    continue
+                avg_length = index.avg_field_lengths[field] or 1.0
+                length = index.field_lengths[field][ordinal]
+                norm = 1.0 - self.b + self.b * length / avg_length
+                weighted_tf += self.field_weights[field] * tf / norm
+
+            total += idf * weighted_tf * (self.k1 + 1.0) / (self.k1 + weighted_tf)
+
+        return total
+
+    def top_k(
+        self,
+        term_groups: List[List[str]],
+        candidates: Iterable[int],
+        k: int,
+    ) -> List[Tuple[float, int]]:
+        """
+        Best `k` candidates as (score, ordinal), highest score first.
+
+        Keeps a min-heap of size k, so the cost is O(n log k) over n
+        candidates instead of sorting every match. Ties keep corpus order.
+        """
+        return self.rank(term_groups, candidates, k)[0]
+
+    def rank(
+        self,
+        term_groups: List[List[str]],
+        candidates: Iterable[int],
+        k: int,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> Tuple[List[Tuple[float, int]], int, int]:
+        """
+        Top-k page of the ranking, plus match counts.
+
+        `after` is the (score, ordinal) of the last result of the previous
+        page: only candidates ranked below it compete for this page, so a
+        deep page keeps a heap of k entries instead of skip + k.
+
+        Returns:
+            (page, total, remaining): the page as top_k returns it, the
+            number of candidates, and how many rank after `after`
+        """
+        term_idfs = self._term_idfs(term_groups)
+        bound = (after[0], -after[1]) if after is not None else None
+        heap: List[Tuple[float, int]] = []
+        total = remaining = 0
+
+        for ordinal in candidates:
+            total += 1
+            entry = (self._score(ordinal, term_idfs), -ordinal)
+            if bound is not None and entry >= bound:
+                continue
+            remaining += 1
+            if k <= 0:
+                continue
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        page = [(score, -neg) for score, neg in sorted(heap, reverse=True)]
+        return page, total, remaining
+
+    def rank_any(self, term_groups: List[List[str]], k: int) -> List[Tuple[float, int]]:
+        """
+        Best `k` documents containing any of the terms, as top_k returns them.
+
+        Scored term at a time: each term's posting list is walked once,
+        adding its contribution to a per-document accumulator, instead of
+        a posting lookup per (term, candidate) pair. Scores equal those
+        of `score`.
+        """
+        index = self.index
+        field_count = index.field_count
+        frequencies = index.frequencies
+        postings = index.postings_data
+        field_weights = self.field_weights
+        avg_lengths = [length or 1.0 for length in index.avg_field_lengths]
+        k1, b = self.k1, self.b
+        scores: Dict[int, float] = {}
+
+        for term_id, idf in self._term_idfs(term_groups):
+            for position in range(index.offsets[term_id], index.offsets[term_id + 1]):
+                ordinal = postings[position]
+                base = position * field_count
+                weighted_tf = 0.0
+                for field in range(field_count):
+                    tf = frequencies[base + field]
+                    if tf:
+                        norm = 1.0 - b + b * index.field_lengths[field][ordinal] / avg_lengths[field]
+                        weighted_tf += field_weights[field] * tf / norm
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * weighted_tf * (k1 + 1.0) / (k1 + weighted_tf)
+
+        top = heapq.nlargest(k, ((score, -ordinal) for ordinal, score in scores.items()))
+        return [(score, -neg) for score, neg in top]
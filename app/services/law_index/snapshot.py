@@ -0,0 +1,328 @@
+"""
+Versioned binary snapshot of the corpus and its search indexes.
+
+The snapshot is compiled once by scripts/build_law_snapshot.py and
+memory-mapped at startup: columns and postings are served straight from
+the mapping through memoryviews and strings are decoded on access, so a
+worker neither parses JSON nor copies the corpus onto its own heap, and
+workers on one host share the file's pages through the OS page cache.
+The fuzzy-matching and autocomplete tables are stored too, so the
+per-worker heap holds only small hash lookups.
+
+Layout (little-endian, every section 8-byte aligned):
+    header:   magic (8s), format version (u32), section count (u32)
+    sections: name (8s), offset (u64), length (u64) per section
+    META      JSON: article/field counts, corpus version, source file
+              stat, build time
+    STRPOOL   UTF-8 bytes of every distinct string
+    STROFFS   u64 offset of string i in STRPOOL (count + 1 entries)
+    ARTID, ARTTITLE, CONTENT, ARTKEY, ARTIDKEY
+              u32 string id per article (ARTKEY = canonical article key)
+    LAWORD    u16 law ordinal per article
+    LAWNAME   u32 string id per law
+    TERMS     u32 string id per vocabulary term, sorted
+    POSTOFF   u32 posting offsets per term (term count + 1 entries)
+    POSTINGS  u32 article ordinals
+    FREQS     u16 per-field term frequencies
+    FLDLEN    u32 field lengths, field-major (field_count * article_count)
+    POSOFF    u32 position offsets per posting (posting count + 1 entries)
+    POSITNS   u32 encoded token positions
+    FOLDTERM  u32 string id per distinct folded term, sorted
+    FOLDOFF, FOLDIDS
+              u32 offsets / term ids of the terms folding to each
+    TRIGRAM   u32 string id per folded-term trigram, sorted
+    TRIOFF, TRIIDS
+              u32 offsets / FOLDTERM positions per trigram
+    SUGKEY    u32 string id per autocomplete key, sorted
+    SUGKIND   u8 completion kind per key (suggest.KINDS position)
+    SUGORD    u32 law or article ordinal per key
+    SUGLEN    u16 key length per key
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .corpus import LawCorpus
+from .fuzzy import FuzzyTermMatcher
+from .inverted_index import InvertedIndex
+from .lookup import ArticleLookup
+from .suggest import PrefixSuggester
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"VNLAWSNP"
+SNAPSHOT_FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<8sQQ")
+_ALIGN = 8
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or incompatible."""
+
+
+class StringColumn(Sequence[str]):
+    """
+    Column of strings stored as ids into a shared UTF-8 pool.
+
+    Strings are decoded on access, so only the values a request reads
+    are ever materialized.
+    """
+
+    __slots__ = ("_pool", "_offsets", "_ids")
+
+    def __init__(self, pool: memoryview, offsets: memoryview, ids: memoryview):
+        self._pool = pool
+        self._offsets = offsets
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        string_id = self._ids[index]
+        return str(self._pool[self._offsets[string_id]:self._offsets[string_id + 1]], "utf-8")
+
+
+class _StringPool:
+    """Interning string pool used while writing a snapshot."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.data = bytearray()
+        self.offsets = array("Q", [0])
+
+    def add(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.offsets) - 1
+            self.data += text.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return string_id
+
+    def add_all(self, texts: Sequence[str]) -> array:
+        return array("I", (self.add(text) for text in texts))
+
+
+def _as_bytes(values) -> bytes:
+    """Raw bytes of an array or memoryview (snapshots are little-endian)."""
+    return values.tobytes()
+
+
+def write_snapshot(
+    path: Path,
+    corpus: LawCorpus,
+    index: InvertedIndex,
+    lookup: ArticleLookup,
+    source_path: Optional[Path] = None,
+    corpus_version: Optional[str] = None,
+    matcher: Optional[FuzzyTermMatcher] = None,
+    suggester: Optional[PrefixSuggester] = None,
+) -> int:
+    """
+    Compile a corpus and its indexes into a snapshot file.
+
+    The fuzzy matcher and suggester tables are built here unless given.
+
+    Written to a temporary file and renamed into place, so a running
+    server never maps a half-written snapshot. Returns the file size.
+    """
+    if sys.byteorder != "little":
+        raise SnapshotError("Snapshots can only be written on little-endian hosts")
+
+    pool = _StringPool()
+    article_count = len(corpus)
+    matcher = matcher or FuzzyTermMatcher(index)
+    suggester = suggester or PrefixSuggester.build(corpus, lookup)
+
+    meta = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "article_count": article_count,
+        "field_count": index.field_count,
+        "built_at": int(time.time()),
+        "corpus_version": corpus_version,
+        "source": None,
+    }
+    if source_path is not None and source_path.exists():
+        stat = source_path.stat()
+        meta["source"] = {
+            "path": source_path.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    sections: List[Tuple[bytes, bytes]] = [
+        (b"ARTID", _as_bytes(pool.add_all(corpus.article_ids))),
+        (b"ARTTITLE", _as_bytes(pool.add_all(corpus.article_titles))),
+        (b"CONTENT", _as_bytes(pool.add_all(corpus.contents))),
+        (b"ARTKEY", _as_bytes(pool.add_all(lookup.keys))),
+        (b"ARTIDKEY", _as_bytes(pool.add_all(corpus.article_id_keys))),
+        (b"LAWORD", _as_bytes(array("H", corpus.law_ordinals))),
+        (b"LAWNAME", _as_bytes(pool.add_all(corpus.law_names))),
+        (b"TERMS", _as_bytes(pool.add_all(index.terms))),
+        (b"POSTOFF", _as_bytes(index.offsets)),
+        (b"POSTINGS", _as_bytes(index.postings_data)),
+        (b"FREQS", _as_bytes(index.frequencies)),
+        (b"FLDLEN", b"".join(_as_bytes(lengths) for lengths in index.field_lengths)),
+    ]
+    if index.has_positions:
+        sections += [
+            (b"POSOFF", _as_bytes(index.position_offsets)),
+            (b"POSITNS", _as_bytes(index.positions)),
+        ]
+    sections += [
+        (b"FOLDTERM", _as_bytes(pool.add_all(matcher.folded_terms))),
+        (b"FOLDOFF", _as_bytes(array("I", matcher.folded_offsets))),
+        (b"FOLDIDS", _as_bytes(array("I", matcher.folded_term_ids))),
+        (b"TRIGRAM", _as_bytes(pool.add_all(matcher.grams))),
+        (b"TRIOFF", _as_bytes(array("I", matcher.gram_offsets))),
+        (b"TRIIDS", _as_bytes(array("I", matcher.gram_folded_ids))),
+        (b"SUGKEY", _as_bytes(pool.add_all(suggester.keys))),
+        (b"SUGKIND", _as_bytes(array("B", suggester.kinds))),
+        (b"SUGORD", _as_bytes(array("I", suggester.ordinals))),
+        (b"SUGLEN", _as_bytes(array("H", suggester.key_lengths))),
+    ]
+    sections = [
+        (b"META", json.dumps(meta).encode("utf-8")),
+        (b"STRPOOL", bytes(pool.data)),
+        (b"STROFFS", _as_bytes(pool.offsets)),
+    ] + sections
+
+    header_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = -(-header_size // _ALIGN) * _ALIGN
+    table = []
+    for name, data in sections:
+        table.append((name, offset, len(data)))
+        offset += -(-len(data) // _ALIGN) * _ALIGN
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(sections)))
+        for name, section_offset, length in table:
+            f.write(_SECTION.pack(name, section_offset, length))
+        for (_, data), (_, section_offset, _) in zip(sections, table):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(data)
+        size = f.tell()
+
+    os.replace(tmp_path, path)
+    return size
+
+
+class LawSnapshot:
+    """
+    Memory-mapped snapshot exposing the corpus, index, lookup, fuzzy
+    matcher and suggester.
+
+    The mapping stays open for as long as this object (or any column
+    view taken from it) is referenced.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot map snapshot {path}: {e}") from e
+
+        if sys.byteorder != "little":
+            raise SnapshotError("Snapshots are little-endian; big-endian hosts must load JSON")
+
+        buffer = memoryview(self._mmap)
+        magic, version, section_count = _HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{path} is not a law snapshot")
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(
+                f"Snapshot format {version} is not supported (expected {SNAPSHOT_FORMAT_VERSION})"
+            )
+
+        self._sections: Dict[str, memoryview] = {}
+        for i in range(section_count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + i * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = buffer[offset:offset + length]
+
+        self.meta = json.loads(str(self._sections["META"], "utf-8"))
+        self.corpus, self.index, self.lookup = self._open()
+        self.matcher, self.suggester = self._open_tables()
+
+    def _array(self, name: str, typecode: str) -> memoryview:
+        return self._sections[name].cast(typecode)
+
+    def _strings(self, name: str) -> StringColumn:
+        return StringColumn(self._sections["STRPOOL"], self._array("STROFFS", "Q"), self._array(name, "I"))
+
+    def _open(self) -> Tuple[LawCorpus, InvertedIndex, ArticleLookup]:
+        corpus = LawCorpus.from_columns(
+            article_ids=self._strings("ARTID"),
+            article_titles=self._strings("ARTTITLE"),
+            contents=self._strings("CONTENT"),
+            law_ordinals=self._array("LAWORD", "H"),
+            law_names=list(self._strings("LAWNAME")),
+            article_id_keys=self._strings("ARTIDKEY"),
+        )
+
+        article_count = self.meta["article_count"]
+        field_count = self.meta["field_count"]
+        field_lengths = self._array("FLDLEN", "I")
+        index = InvertedIndex(
+            terms=self._strings("TERMS"),
+            offsets=self._array("POSTOFF", "I"),
+            postings=self._array("POSTINGS", "I"),
+            frequencies=self._array("FREQS", "H"),
+            field_lengths=[
+                field_lengths[field * article_count:(field + 1) * article_count]
+                for field in range(field_count)
+            ],
+            doc_count=article_count,
+            position_offsets=self._array("POSOFF", "I") if "POSOFF" in self._sections else None,
+            positions=self._array("POSITNS", "I") if "POSITNS" in self._sections else None,
+        )
+
+        lookup = ArticleLookup(corpus, keys=self._strings("ARTKEY"))
+        return corpus, index, lookup
+
+    def _open_tables(self) -> Tuple[FuzzyTermMatcher, PrefixSuggester]:
+        matcher = FuzzyTermMatcher(
+            self.index,
+            folded_terms=self._strings("FOLDTERM"),
+            folded_offsets=self._array("FOLDOFF", "I"),
+            folded_term_ids=self._array("FOLDIDS", "I"),
+            grams=self._strings("TRIGRAM"),
+            gram_offsets=self._array("TRIOFF", "I"),
+            gram_folded_ids=self._array("TRIIDS", "I"),
+        )
+        suggester = PrefixSuggester(
+            self.corpus,
+            self.lookup,
+            keys=self._strings("SUGKEY"),
+            kinds=self._array("SUGKIND", "B"),
+            ordinals=self._array("SUGORD", "I"),
+            key_lengths=self._array("SUGLEN", "H"),
+        )
+        return matcher, suggester
+
+    def is_fresh(self, source_path: Path) -> bool:
+        """Whether the snapshot was compiled from the current source file."""
+        if not source_path.exists():
+            # Deployments may ship the snapshot without the JSON source
+            return True
+
+        source = self.meta.get("source")
+        if not source:
+            return False
+
+        stat = source_path.stat()
+        return source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns
@@ -0,0 +1,146 @@
+"""
+Query-dependent snippets with highlight offsets.
+
+Query terms are located in the normalized text with one compiled
+pattern (matching whole tokens only, like the index tokenizer), and
+the windows covering the most distinct terms are cut out as fragments. Highlights are returned as
+(start, end) offsets into the snippet rather than markup, so clients
+render them without trusting HTML from article text.
+"""
+
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import islice
+from typing import Collection, Dict, FrozenSet, List, Pattern, Tuple
+
+from .tokenizer import normalize_text
+
+ELLIPSIS = "…"
+FRAGMENT_SEPARATOR = f" {ELLIPSIS} "
+
+
+@lru_cache(maxsize=256)
+def _terms_pattern(terms: FrozenSet[str]) -> Pattern:
+    # Longest first, so a term is not shadowed by one of its prefixes
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b")
+
+
+def _match_spans(text: str, terms: Collection[str]) -> List[Tuple[int, int, str]]:
+    """(start, end, term) of every token of `text` that is a query term."""
+    normalized = normalize_text(text)
+    if not terms or len(normalized) != len(text):
+        # Offsets only carry over when normalization keeps the length,
+        # as it does for the NFC corpus text
+        return []
+    pattern = _terms_pattern(frozenset(terms))
+    return [(match.start(), match.end(), match.group()) for match in pattern.finditer(normalized)]
+
+
+def _best_window(
+    spans: List[Tuple[int, int, str]],
+    width: int,
+) -> Tuple[int, int]:
+    """Index range [i, j) of spans fitting in `width` chars with the most distinct terms."""
+    best = (0, 1)
+    best_key = (0, 0)
+    counts: Dict[str, int] = {}
+    j = 0
+    for i in range(len(spans)):
+        if j <= i:
+            j = i
+            counts.clear()
+        while j < len(spans) and (j == i or spans[j][1] - spans[i][0] <= width):
+            counts[spans[j][2]] = counts.get(spans[j][2], 0) + 1
+            j += 1
+        key = (len(counts), j - i)
+        if key > best_key:
+            best, best_key = (i, j), key
+
+        term = spans[i][2]
+        counts[term] -= 1
+        if not counts[term]:
+            del counts[term]
+    return best
+
+
+def _expand(text: str, start: int, end: int, width: int) -> Tuple[int, int]:
+    """Grow [start, end) to about `width` chars, centred, snapped to spaces."""
+    slack = max(0, width - (end - start))
+    left = max(0, start - slack // 2)
+    right = min(len(text), max(end, left + width))
+    left = max(0, min(left, right - width))
+
+    if left > 0:
+        space = text.find(" ", left, start)
+        left = space + 1 if space != -1 else left
+    if right < len(text):
+        space = text.rfind(" ", end, right)
+        right = space if space != -1 else right
+    return left, right
+
+
+def make_snippet(
+    text: str,
+    terms: Collection[str],
+    fragment_length: int = 160,
+    max_fragments: int = 2,
+) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Cut highlighted fragments of `text` around normalized query `terms`.
+
+    Returns:
+        (snippet, highlights): fragments joined by an ellipsis, and the
+        (start, end) offsets of every term occurrence within the snippet.
+        Without matches the snippet is the start of the text.
+    """
+    if not text:
+        return "", []
+
+    spans = _match_spans(text, terms)
+    if not spans:
+        _, right = _expand(text, 0, 0, fragment_length)
+        return text[:right] + (" " + ELLIPSIS if right < len(text) else ""), []
+
+    ranges: List[Tuple[int, int]] = []
+    remaining = spans
+    while remaining and len(ranges) < max_fragments:
+        i, j = _best_window(remaining, fragment_length)
+        ranges.append(_expand(text, remaining[i][0], remaining[j - 1][1], fragment_length))
+        left, right = ranges[-1]
+        remaining = [span for span in remaining if span[1] <= left or span[0] >= right]
+
+    # Windows expanded towards each other may overlap; join them
+    ranges.sort()
+    merged = [ranges[0]]
+    for left, right in ranges[1:]:
+        if left <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], right))
+        else:
+            merged.append((left, right))
+    ranges = merged
+
+    starts = [span[0] for span in spans]
+    parts: List[str] = []
+    highlights: List[Tuple[int, int]] = []
+    length = 0
+
+    if ranges[0][0] > 0:
+        parts.append(ELLIPSIS + " ")
+        length += 2
+    for number, (left, right) in enumerate(ranges):
+        if number:
+            parts.append(FRAGMENT_SEPARATOR)
+            length += len(FRAGMENT_SEPARATOR)
+        for start, end, _ in islice(spans, bisect_left(starts, left), None):
+            if start >= right:
+                break
+            if end <= right:
+                highlights.append((length + start - left, length + end - left))
+        parts.append(text[left:right])
+        length += right - left
+    if ranges[-1][1] < len(text):
+        parts.append(" " + ELLIPSIS)
+
+    return "".join(parts), highlights
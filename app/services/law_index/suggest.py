@@ -0,0 +1,158 @@
+"""
+Prefix autocomplete over law names, article ids and article titles.
+
+Every completion is stored under a diacritic-folded, token-normalized
+key ("Điều 51. Quyền yêu cầu" -> "dieu 51 quyen yeu cau") in one sorted
+array. A prefix selects a contiguous range found with two bisects, and
+only a bounded head of that range is ranked, so a lookup costs a few
+microseconds no matter how many entries share the prefix.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .corpus import LawCorpus
+from .fuzzy import fold
+from .lookup import ArticleLookup
+from .tokenizer import tokenize
+
+# Completion kinds, in ranking order (stored as their position)
+KIND_LAW = "law"
+KIND_ARTICLE = "article"
+KIND_TITLE = "title"
+KINDS = (KIND_LAW, KIND_ARTICLE, KIND_TITLE)
+
+# Entries of a prefix range considered for ranking
+MAX_CANDIDATES = 128
+
+# Characters of a completion that are keyed; nobody types further ahead
+MAX_KEY_LENGTH = 64
+
+# "Điều 51. " at the start of an article title
+_ARTICLE_PREFIX = re.compile(r"^\s*Điều\s+\w+\s*[.:]\s*", re.IGNORECASE)
+
+# "Bộ luật " / "Luật " at the start of a law name
+_LAW_PREFIX = re.compile(r"^\s*(?:Bộ\s+)?luật\s+", re.IGNORECASE)
+
+
+def suggest_key(text: str) -> str:
+    """
+    Folded, token-joined form used for keys and queries.
+
+    Examples:
+        "Điều 51. Quyền yêu cầu" -> "dieu 51 quyen yeu cau"
+    """
+    # Folding token by token hits fold's cache: the vocabulary is small
+    return " ".join(fold(token) for token in tokenize(text[:MAX_KEY_LENGTH]))
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    text: str
+    kind: str
+    law_name: Optional[str] = None
+    key: Optional[str] = None  # Canonical article key, for articles and titles
+
+
+class PrefixSuggester:
+    """
+    Sorted completion keys answering prefix completions.
+
+    Position i completes to the law (KIND_LAW) or article of
+    `ordinals[i]`, as `kinds[i]` says, and `key_lengths[i]` is the length
+    of its key, so a range is ranked without decoding keys. Entries are
+    materialized only for the completions returned, so the arrays can
+    come from a snapshot.
+    """
+
+    def __init__(
+        self,
+        corpus: LawCorpus,
+        lookup: ArticleLookup,
+        keys: Sequence[str],
+        kinds: Sequence[int],
+        ordinals: Sequence[int],
+        key_lengths: Sequence[int],
+    ):
+        self.corpus = corpus
+        self.lookup = lookup
+        self.keys = keys
+        self.kinds = kinds
+        self.ordinals = ordinals
+        self.key_lengths = key_lengths
+
+    @classmethod
+    def build(cls, corpus: LawCorpus, lookup: ArticleLookup) -> "PrefixSuggester":
+        law, article, title = range(len(KINDS))
+        rows: List[Tuple[str, int, int]] = []
+
+        for law_ordinal, law_name in enumerate(corpus.law_names):
+            rows.append((suggest_key(law_name), law, law_ordinal))
+            # "hôn nhân" completes "Luật Hôn nhân và Gia đình 2014"
+            subject = _LAW_PREFIX.sub("", law_name, count=1)
+            if subject != law_name:
+                rows.append((suggest_key(subject), law, law_ordinal))
+
+        for ordinal in range(len(corpus)):
+            rows.append((suggest_key(corpus.article_ids[ordinal]), article, ordinal))
+
+            article_title = corpus.article_titles[ordinal]
+            rows.append((suggest_key(article_title), title, ordinal))
+            # Titles are typed by subject more often than by number
+            subject = _ARTICLE_PREFIX.sub("", article_title, count=1)
+            if subject != article_title:
+                rows.append((suggest_key(subject), title, ordinal))
+
+        rows = sorted(row for row in rows if row[0])
+        return cls(
+            corpus,
+            lookup,
+            keys=[key for key, _, _ in rows],
+            kinds=array("B", (kind for _, kind, _ in rows)),
+            ordinals=array("I", (ordinal for _, _, ordinal in rows)),
+            key_lengths=array("H", (len(key) for key, _, _ in rows)),
+        )
+
+    def _entry(self, kind: int, ordinal: int) -> Suggestion:
+        corpus = self.corpus
+        if KINDS[kind] == KIND_LAW:
+            return Suggestion(corpus.law_names[ordinal], KIND_LAW)
+        text = corpus.article_ids[ordinal] if KINDS[kind] == KIND_ARTICLE else corpus.article_titles[ordinal]
+        return Suggestion(text, KINDS[kind], corpus.law_name(ordinal), self.lookup.key_of(ordinal))
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """
+        Ranked completions of `prefix` (diacritics and punctuation ignored).
+
+        Exact key matches first, then laws before article ids before
+        titles, then shorter completions.
+        """
+        query = suggest_key(prefix)
+        if not query or limit <= 0:
+            return []
+
+        kinds, lengths = self.kinds, self.key_lengths
+        start = bisect_left(self.keys, query)
+        end = bisect_left(self.keys, query + "\uffff", start)
+        # Keys in the range start with the query: equal ones have its length
+        candidates = (
+            (lengths[position] != len(query), kinds[position], lengths[position], position)
+            for position in range(start, min(end, start + MAX_CANDIDATES))
+        )
+
+        suggestions: List[Suggestion] = []
+        seen = set()
+        for *_, position in heapq.nsmallest(limit * 2, candidates):
+            kind, ordinal = self.kinds[position], self.ordinals[position]
+            # Titles and laws are keyed twice
+            if (kind, ordinal) in seen:
+                continue
+            seen.add((kind, ordinal))
+            suggestions.append(self._entry(kind, ordinal))
+            if len(suggestions) == limit:
+                break
+        return suggestions
@@ -0,0 +1,54 @@
+"""
+Tokenizer shared by every lexical index.
+
+Text is NFC-normalized and lowercased once, then split on word
+boundaries so index terms and query terms always agree.
+"""
+
+import re
+import unicodedata
+from typing import List, Tuple
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for indexing.
+
+    Examples:
+        "Điều 1. Phạm vi" -> "điều 1. phạm vi"
+    """
+    if not text:
+        return ""
+    return unicodedata.normalize("NFC", text).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized word tokens.
+
+    Examples:
+        "Ly hôn đơn phương" -> ["ly", "hôn", "đơn", "phương"]
+    """
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+def token_spans(text: str) -> List[Tuple[int, int, str]]:
+    """
+    Normalized tokens of `text` with their (start, end) offsets in it.
+
+    Offsets refer to `text` itself only when normalization keeps its
+    length (true for NFC text such as the loaded corpus); otherwise no
+    spans are returned rather than misplaced ones.
+
+    Examples:
+        "Ly hôn" -> [(0, 2, "ly"), (3, 6, "hôn")]
+    """
+    normalized = normalize_text(text)
+    if len(normalized) != len(text):
+        return []
+    return [
+        (match.start(), match.end(), match.group())
+        for match in _TOKEN_PATTERN.finditer(normalized)
+    ]
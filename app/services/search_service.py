@@ -1,16 +1,56 @@
 """
 Search service layer.
-Handles full-text search in Qdrant vector database.
+Handles semantic search in the vector store: Qdrant, or the in-process
+vector index when Qdrant is unavailable (VECTOR_STORE).
 """
 
+import asyncio
 import logging
-from typing import List, Optional
-from app.core.clients import get_qdrant_client, get_embeddings
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set
+from qdrant_client import models
+from app.core.clients import get_embedding_cache, get_vector_store
 from app.core.config import settings
-from app.schemas.search import LawItem
+from app.core.qdrant_schema import build_filter
+from app.schemas.search import LawItem, SearchPage
+from app.services.law_index import make_snippet, tokenize
+from app.utils.chunks import CHUNK_OVERFETCH, chunk_article_key, collapse_by_article, merge_chunks
+from app.utils.slug_generator import create_law_slug, fold_legacy_slug
+from app.utils.search_cursor import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    query_fingerprint,
+)
 
 logger = logging.getLogger(__name__)
 
+# Points fetched per scroll request when reassembling an article
+DETAIL_SCROLL_BATCH = 256
+
+_ARTICLE_ID = re.compile(r"^\s*điều\s+(\w+)\s*$", re.IGNORECASE)
+_ARTICLE_SLUG = re.compile(r"^dieu-(\w+)$")
+
+
+def _article_slug(payload: dict) -> str:
+    """Canonical key of a point's article (payload slug, derived for points without it)."""
+    return payload.get("slug") or create_law_slug(payload.get("so_hieu", ""), payload.get("loai_van_ban", ""))
+
+
+def _to_law_item(payload: dict) -> LawItem:
+    """Build the response model from a Qdrant point payload."""
+    return LawItem(
+        id=payload.get("so_hieu", ""),
+        key=_article_slug(payload),
+        title=payload.get("loai_van_ban", ""),
+        type=payload.get("loai_van_ban", "Văn bản"),
+        content=payload.get("page_content") or payload.get("combine_Article_Content", ""),
+        year=payload.get("nam", ""),
+        authority=payload.get("co_quan_ban_hanh", ""),
+        description=payload.get("tom_tat", ""),
+    )
+
 
 async def search_laws(
     keyword: str,
@@ -23,113 +63,294 @@ async def search_laws(
     """
     Search laws from Qdrant database with pagination support.
     """
-    try:
-        qdrant = get_qdrant_client()
-        embeddings = get_embeddings()
+    page = await search_laws_page(
+        keyword,
+        type_filter=type_filter,
+        year_filter=year_filter,
+        authority_filter=authority_filter,
+        skip=skip,
+        limit=limit,
+    )
+    return page.results
 
-        # Embed query
-        query_vector = embeddings.embed_query(keyword)
 
-        # Fetch more results to account for skip offset
-        fetch_limit = skip + limit
+@dataclass(frozen=True)
+class ArticlePage:
+    """
+    One page of articles read from a chunk rank of a vector search.
+
+    articles: one collapsed point per article, best first
+    next_start: chunk rank the next page starts from
+    more: whether chunks past the page remain
+    chunks_read / articles_seen: fetched chunks and their distinct articles
+    """
+    articles: List[Any]
+    next_start: int
+    more: bool
+    chunks_read: int
+    articles_seen: int
+
 
-        # Search in Qdrant
-        results = qdrant.query_points(
-            collection_name=settings.COLLECTION_NAME,
+async def _returned_before(store, query_vector: List[float], firsts: Sequence[Any]) -> Set[Hashable]:
+    """
+    Articles, among those first seen past a page's start, that an earlier
+    page returned.
+
+    `firsts` holds the first chunk of each article from the start. An
+    article whose best chunk is another one had that chunk ranked above
+    the start, so an earlier page returned it.
+    """
+    # One article per request, by its keyword-indexed canonical key
+    requests = [
+        models.QueryRequest(
             query=query_vector,
-            limit=fetch_limit,
-            with_payload=True,
-        ).points
+            filter=models.Filter(must=[
+                models.FieldCondition(key="slug", match=models.MatchValue(value=_article_slug(point.payload or {}))),
+            ]),
+            limit=1,
+            with_payload=False,
+        )
+        for point in firsts
+    ]
+    responses = await asyncio.wait_for(
+        store.query_batch_points(collection_name=settings.COLLECTION_NAME, requests=requests),
+        settings.QDRANT_TIMEOUT,
+    )
+    return {
+        chunk_article_key(point.payload or {})
+        for point, response in zip(firsts, responses)
+        if response.points and response.points[0].id != point.id
+    }
 
-        laws: List[LawItem] = []
 
-        for result in results:
-            payload = result.payload or {}
-
-            # Extract data from Qdrant payload
-            law = LawItem(
-                id=payload.get("so_hieu", ""),
-                title=payload.get("loai_van_ban", ""),
-                type=payload.get("loai_van_ban", "Văn bản"),
-                content=payload.get("page_content") or payload.get("combine_Article_Content", ""),
-                year=payload.get("nam", ""),
-                authority=payload.get("co_quan_ban_hanh", ""),
-                description=payload.get("tom_tat", ""),
-            )
+async def fetch_article_page(
+    store,
+    query_vector: List[float],
+    query_filter: Optional[models.Filter],
+    start: int,
+    limit: int,
+) -> ArticlePage:
+    """
+    The next `limit` articles of a vector search, from chunk rank `start`.
+
+    Chunks are read with the store's native offset, CHUNK_OVERFETCH per
+    wanted article at a time, until `limit` articles that no earlier page
+    returned are found (checked with one batched query per read). A
+    page's cost depends on its size, not its depth, and a page is only
+    short at the end of the results.
+    """
+    batch = limit * CHUNK_OVERFETCH
+    chunks: List[Any] = []
+    seen: Set[Hashable] = set()
+    kept: List[tuple] = []  # (article, rank of its first chunk)
+    exhausted = False
+
+    while len(kept) < limit and not exhausted:
+        response = await asyncio.wait_for(
+            store.query_points(
+                collection_name=settings.COLLECTION_NAME,
+                query=query_vector,
+                query_filter=query_filter,
+                limit=batch,
+                offset=start + len(chunks),
+                with_payload=True,
+            ),
+            settings.QDRANT_TIMEOUT,
+        )
+        points = response.points
+        exhausted = len(points) < batch
+
+        firsts = []
+        for rank, point in enumerate(points, start=start + len(chunks)):
+            key = chunk_article_key(point.payload or {})
+            if key not in seen:
+                seen.add(key)
+                firsts.append((key, rank, point))
+        chunks.extend(points)
 
-            # Apply filters
-            if type_filter and type_filter.lower() not in law.type.lower():
-                continue
-            if year_filter and law.year != year_filter:
-                continue
-            if authority_filter and authority_filter.lower() not in (law.authority or "").lower():
-                continue
+        returned = set()
+        if start and firsts:  # From the top no article can have been returned yet
+            returned = await _returned_before(store, query_vector, [point for _, _, point in firsts])
+        kept.extend((key, rank) for key, rank, _ in firsts if key not in returned)
 
+    page_keys = {key for key, _ in kept[:limit]}
+    articles = [point for point in collapse_by_article(chunks) if chunk_article_key(point.payload or {}) in page_keys]
+
+    if len(kept) > limit:
+        # The next page starts at the first chunk of its first article
+        next_start, more = kept[limit][1], True
+    else:
+        next_start, more = start + len(chunks), not exhausted
+    return ArticlePage(articles, next_start, more, len(chunks), len(seen))
+
+
+async def search_laws_page(
+    keyword: str,
+    type_filter: Optional[str] = None,
+    year_filter: Optional[str] = None,
+    authority_filter: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> SearchPage:
+    """
+    One page of semantic search results, one result per article.
+
+    Filters are evaluated by Qdrant on indexed payload fields, so every
+    returned point is a match: a filtered page costs the same as an
+    unfiltered one. Chunks are collapsed by article (best chunk merged
+    with the retrieved chunks next to it), see fetch_article_page.
+    `next_cursor` records the chunk rank the next page resumes from, so
+    each cursor page costs O(limit); `skip` reads its articles from the
+    top. When `cursor` is given, `skip` is ignored.
+
+    `total` estimates the matching articles from Qdrant's approximate
+    count of the matching chunks, requested concurrently with the page.
+    Each Qdrant call is bounded by QDRANT_TIMEOUT. The local vector index
+    answers the same calls in-process.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or belongs to another query
+    """
+    fingerprint = query_fingerprint(keyword, "semantic", type_filter, year_filter, authority_filter)
+    try:
+        offset, start = skip, 0
+        if cursor:
+            state = decode_cursor(cursor, fingerprint)
+            try:
+                offset, start = int(state["o"]), int(state["c"])
+            except (KeyError, TypeError, ValueError) as e:
+                raise InvalidCursorError("Malformed search cursor") from e
+
+        store = get_vector_store()
+        query_filter = build_filter(type_filter, year_filter, authority_filter)
+
+        # Embed query (cached; misses batched with concurrent requests)
+        query_vector = await get_embedding_cache().embed(keyword)
+        # Without a cursor the skipped articles are read from the top
+        wanted = limit if cursor else skip + limit
+
+        fetched, counted = await asyncio.gather(
+            fetch_article_page(store, query_vector, query_filter, start, wanted),
+            asyncio.wait_for(
+                store.count(
+                    collection_name=settings.COLLECTION_NAME,
+                    count_filter=query_filter,
+                    exact=False,
+                ),
+                settings.QDRANT_TIMEOUT,
+            ),
+        )
+        page = fetched.articles if cursor else fetched.articles[skip:]
+
+        terms = set(tokenize(keyword))
+        laws: List[LawItem] = []
+        for point in page:
+            law = _to_law_item(point.payload or {})
+            law.snippet, law.highlights = make_snippet(law.content or "", terms)
             laws.append(law)
 
-        # Apply skip and limit
-        paginated_laws = laws[skip:skip + limit]
+        end = offset + len(page)
+        next_cursor = (
+            encode_cursor({"q": fingerprint, "o": end, "c": fetched.next_start})
+            if page and fetched.more else None
+        )
+        # Matching chunks times the articles per chunk read
+        chunks_read = fetched.chunks_read
+        total = round(counted.count * fetched.articles_seen / chunks_read) if chunks_read else 0
 
-        return paginated_laws
+        return SearchPage(
+            results=laws,
+            total=max(total, end),
+            total_exact=False,
+            next_cursor=next_cursor,
+        )
 
+    except InvalidCursorError:
+        raise
     except Exception as e:
         logger.error(f"Search error: {str(e)}", exc_info=True)
-        return []
+        return SearchPage(results=[], total=0)
 
 
-async def get_law_detail(law_id: str) -> Optional[LawItem]:
+def _article_id(law_id: str) -> Optional[str]:
     """
-    Get detail of a specific law by ID (so_hieu).
-    Search by law_id as keyword to find the exact law.
+    so_hieu of a bare article id, None for anything else (a canonical key).
+
+    Examples:
+        "điều  5" -> "Điều 5"
+        "dieu-5" -> "Điều 5"
+        "dieu-5-luat-doanh-nghiep-2020" -> None
     """
-    try:
-        qdrant = get_qdrant_client()
-        embeddings = get_embeddings()
+    match = _ARTICLE_ID.match(law_id) or _ARTICLE_SLUG.match(fold_legacy_slug(law_id.strip().lower()))
+    return f"Điều {match.group(1)}" if match else None
 
-        # Embed the law_id as query
-        query_vector = embeddings.embed_query(law_id)
 
-        # Search for the specific law in Qdrant
-        results = qdrant.query_points(
-            collection_name=settings.COLLECTION_NAME,
-            query=query_vector,
-            limit=10,
-            with_payload=True,
-        ).points
+async def get_law_detail(law_id: str, law_name: Optional[str] = None) -> Optional[LawItem]:
+    """
+    Get detail of a law article by canonical key, or by article id and law name.
 
-        if not results:
-            return None
+    `law_id` is the canonical key returned as `key` in search results
+    ("dieu-1-luat-doanh-nghiep-2020", slugs made before Đ/đ folding too)
+    or an article id ("Điều 1", "dieu-1"). The article's chunks are
+    fetched with a filtered scroll on the indexed slug payload field, no
+    embedding or vector search involved, and reassembled in order.
+
+    An article id without `law_name` is ambiguous when several laws have
+    that article (every code has an "Điều 1"): None is returned then,
+    as for an unknown article.
+    """
+    try:
+        store = get_vector_store()
 
-        # Find exact match by so_hieu
-        for result in results:
-            payload = result.payload or {}
-            if payload.get("so_hieu", "").strip().lower() == law_id.strip().lower():
-                return LawItem(
-                    id=payload.get("so_hieu", ""),
-                    title=payload.get("loai_van_ban", ""),
-                    type=payload.get("loai_van_ban", "Văn bản"),
-                    content=payload.get("page_content") or payload.get("combine_Article_Content", ""),
-                    year=payload.get("nam", ""),
-                    authority=payload.get("co_quan_ban_hanh", ""),
-                    description=payload.get("tom_tat", ""),
-                )
-
-        # If no exact match, return the best match
-        if results:
-            payload = results[0].payload or {}
-            return LawItem(
-                id=payload.get("so_hieu", ""),
-                title=payload.get("loai_van_ban", ""),
-                type=payload.get("loai_van_ban", "Văn bản"),
-                content=payload.get("page_content") or payload.get("combine_Article_Content", ""),
-                year=payload.get("nam", ""),
-                authority=payload.get("co_quan_ban_hanh", ""),
-                description=payload.get("tom_tat", ""),
+        article_id = _article_id(law_id)
+        if article_id is None:
+            key = fold_legacy_slug(law_id.strip().lower())
+        elif law_name:
+            key = create_law_slug(article_id, law_name)
+        else:
+            key = None
+
+        if key is not None:
+            condition = models.FieldCondition(key="slug", match=models.MatchValue(value=key))
+        else:
+            condition = models.FieldCondition(key="so_hieu", match=models.MatchValue(value=article_id))
+        scroll_filter = models.Filter(must=[condition])
+
+        chunks: Dict[str, List[dict]] = {}
+        offset = None
+        while True:
+            points, offset = await asyncio.wait_for(
+                store.scroll(
+                    collection_name=settings.COLLECTION_NAME,
+                    scroll_filter=scroll_filter,
+                    limit=DETAIL_SCROLL_BATCH,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                ),
+                settings.QDRANT_TIMEOUT,
             )
+            for point in points:
+                payload = point.payload or {}
+                chunks.setdefault(_article_slug(payload), []).append(payload)
+            if offset is None:
+                break
 
-        return None
+        if len(chunks) != 1:
+            if chunks:
+                logger.info(f"Law detail for {law_id} is ambiguous without law_name: {sorted(chunks)}")
+            return None
+
+        payloads = next(iter(chunks.values()))
+        # Imports before chunk_index existed keep the scroll order
+        payloads.sort(key=lambda payload: payload.get("chunk_index", 0))
+        law = _to_law_item(payloads[0])
+        law.content = merge_chunks(
+            [payload.get("page_content") or payload.get("combine_Article_Content", "") for payload in payloads]
+        )
+        return law
 
     except Exception as e:
         logger.error(f"Get law detail error: {str(e)}", exc_info=True)
         return None
-
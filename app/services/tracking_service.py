@@ -3,15 +3,72 @@ User Tracking Service
 Xử lý việc lưu luật, lưu câu hỏi, v.v.
 """
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app import models, schemas
-from app.utils.slug_generator import create_law_slug
-from typing import List, Optional
+from app.utils.slug_generator import create_law_slug, fold_legacy_slug
+from typing import List, Optional, Tuple
 
 
 class TrackingService:
     """Service xử lý user tracking"""
 
+    @staticmethod
+    def find_saved_law_by_slug(
+        db: Session,
+        slug: str,
+        user_id: Optional[int] = None,
+    ) -> Optional[models.SavedLaw]:
+        """
+        Tìm luật đã lưu theo slug, dạng hiện tại hoặc dạng cũ.
+
+        Link cũ có slug chưa gộp Đ/đ ("đieu-1-...") tìm theo dạng hiện tại;
+        slug đã lưu được chuyển sang dạng hiện tại một lần bởi
+        migrate_legacy_slugs (scripts/migrate_saved_law_slugs.py). Chỉ so
+        sánh bằng trên cột slug, dùng được index.
+        """
+        query = db.query(models.SavedLaw)
+        if user_id is not None:
+            query = query.filter(models.SavedLaw.user_id == user_id)
+        return query.filter(models.SavedLaw.slug.in_({slug, fold_legacy_slug(slug)})).first()
+
+    @staticmethod
+    def find_saved_law(db: Session, user_id: int, law_id: str) -> Optional[models.SavedLaw]:
+        """
+        Luật đã lưu theo canonical key/slug
+
+        article_id trần ("Điều 1") chỉ khớp bản ghi không có tên luật: với
+        tên luật, "Điều 1" của các bộ luật khác nhau là các luật khác nhau.
+        """
+        return TrackingService.find_saved_law_by_slug(db, law_id, user_id) or db.query(models.SavedLaw).filter(
+            models.SavedLaw.user_id == user_id,
+            models.SavedLaw.law_id == law_id,
+            or_(models.SavedLaw.law_title.is_(None), models.SavedLaw.law_title == ""),
+        ).first()
+
+    @staticmethod
+    def migrate_legacy_slugs(db: Session) -> Tuple[int, List[str]]:
+        """
+        Chuyển slug đã lưu trước khi gộp Đ/đ sang dạng hiện tại (chạy một lần).
+
+        Returns:
+            Số bản ghi đã chuyển, và các slug cũ giữ nguyên vì dạng hiện tại
+            đã có bản ghi khác (slug là unique)
+        """
+        legacy = db.query(models.SavedLaw).filter(models.SavedLaw.slug.like("%đ%")).all()
+        migrated, conflicts = 0, []
+        for saved_law in legacy:
+            current = fold_legacy_slug(saved_law.slug)
+            taken = db.query(models.SavedLaw.id).filter(models.SavedLaw.slug == current).first()
+            if taken is not None:
+                conflicts.append(saved_law.slug)
+                continue
+            saved_law.slug = current
+            db.flush()
+            migrated += 1
+        db.commit()
+        return migrated, conflicts
+
     @staticmethod
     def save_law(
         db: Session,
@@ -23,21 +80,24 @@ class TrackingService:
         law_authority: Optional[str] = None,
         law_content: Optional[str] = None,
         notes: Optional[str] = None,
+        law_key: Optional[str] = None,
     ) -> models.SavedLaw:
-        """Lưu một luật"""
+        """
+        Lưu một luật
+
+        Trùng lặp được kiểm tra theo slug (canonical key của điều luật),
+        không theo article_id: "Điều 1" của hai bộ luật là hai luật khác nhau.
+        """
+        
+        # Generate slug for the law (the canonical article key when known)
+        slug = law_key or create_law_slug(law_id, law_title)
         
         # Kiểm tra xem đã lưu chưa
-        existing = db.query(models.SavedLaw).filter(
-            models.SavedLaw.user_id == user_id,
-            models.SavedLaw.law_id == law_id
-        ).first()
+        existing = TrackingService.find_saved_law_by_slug(db, slug, user_id)
         
         if existing:
             return existing
         
-        # Generate slug for the law
-        slug = create_law_slug(law_id, law_title)
-        
         saved_law = models.SavedLaw(
             user_id=user_id,
             law_id=law_id,
@@ -57,10 +117,7 @@ class TrackingService:
     @staticmethod
     def unsave_law(db: Session, user_id: int, law_id: str) -> bool:
         """Xóa một luật đã lưu"""
-        saved_law = db.query(models.SavedLaw).filter(
-            models.SavedLaw.user_id == user_id,
-            models.SavedLaw.law_id == law_id
-        ).first()
+        saved_law = TrackingService.find_saved_law(db, user_id, law_id)
         
         if saved_law:
             db.delete(saved_law)
@@ -78,11 +135,7 @@ class TrackingService:
     @staticmethod
     def is_law_saved(db: Session, user_id: int, law_id: str) -> bool:
         """Kiểm tra xem luật đã được lưu chưa"""
-        saved = db.query(models.SavedLaw).filter(
-            models.SavedLaw.user_id == user_id,
-            models.SavedLaw.law_id == law_id
-        ).first()
-        return saved is not None
+        return TrackingService.find_saved_law(db, user_id, law_id) is not None
 
     @staticmethod
     def save_question(
@@ -0,0 +1,28 @@
+"""
+In-process vector index of the law chunks.
+
+Serves semantic search and agent retrieval without Qdrant.
+"""
+
+from .filters import payload_matcher
+from .hnsw import HnswGraph, build_hnsw
+from .store import (
+    FLAT,
+    HNSW,
+    HNSW_MIN_POINTS,
+    LocalVectorIndex,
+    VectorIndexError,
+    write_vector_index,
+)
+
+__all__ = [
+    "payload_matcher",
+    "HnswGraph",
+    "build_hnsw",
+    "FLAT",
+    "HNSW",
+    "HNSW_MIN_POINTS",
+    "LocalVectorIndex",
+    "VectorIndexError",
+    "write_vector_index",
+]
@@ -0,0 +1,62 @@
+"""
+Qdrant payload filters evaluated against local payloads.
+
+Covers what the API builds (app/core/qdrant_schema.py, get_law_detail):
+a Filter whose `must` conditions match a payload field exactly
+(MatchValue) or by words (MatchText), with the semantics of the
+collection's payload indexes: text fields are lowercased and split into
+words, and a text match needs every word of the query.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+
+from qdrant_client import models
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> set:
+    return set(_WORD.findall(str(text).lower()))
+
+
+def must_conditions(payload_filter: models.Filter) -> list:
+    must = payload_filter.must or []
+    return must if isinstance(must, list) else [must]
+
+
+def _condition_matcher(condition: models.FieldCondition) -> Callable[[dict], bool]:
+    if not isinstance(condition, models.FieldCondition):
+        raise ValueError(f"Unsupported payload condition: {type(condition).__name__}")
+    key, match = condition.key, condition.match
+    if isinstance(match, models.MatchValue):
+        return lambda payload: payload.get(key) == match.value
+    if isinstance(match, models.MatchText):
+        wanted = _words(match.text)
+        return lambda payload: wanted <= _words(payload.get(key, ""))
+    raise ValueError(f"Unsupported payload condition on '{key}': {type(match).__name__}")
+
+
+def payload_matcher(payload_filter: Optional[models.Filter]) -> Optional[Callable[[dict], bool]]:
+    """
+    Predicate over payloads for a filter, None when there is no filter.
+
+    Raises:
+        ValueError: For filter clauses other than `must` field matches
+    """
+    if payload_filter is None:
+        return None
+    if payload_filter.should or payload_filter.must_not or payload_filter.min_should:
+        raise ValueError("Only `must` payload filters are supported by the local index")
+    matchers = [_condition_matcher(condition) for condition in must_conditions(payload_filter)]
+    return lambda payload: all(matcher(payload) for matcher in matchers)
+
+
+def group_by_field(payloads: Sequence[dict], key: str) -> Dict[str, List[int]]:
+    """Point positions per value of a keyword field, for exact lookups."""
+    groups: Dict[str, List[int]] = {}
+    for position, payload in enumerate(payloads):
+        value = payload.get(key)
+        if value is not None:
+            groups.setdefault(value, []).append(position)
+    return groups
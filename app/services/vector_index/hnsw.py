@@ -0,0 +1,168 @@
+"""
+Hierarchical navigable small world graph (Malkov & Yashunin, 2018).
+
+Approximate nearest neighbour search for indexes too large to scan: a
+query descends greedily through sparse upper layers to a good entry
+point, then a best-first search with a beam of `ef` candidates walks the
+dense bottom layer. Each search visits a few hundred vectors, however
+many are indexed.
+
+Vectors are L2-normalized, so similarity is the inner product. The
+graph is built once in Python by scripts/build_vector_index.py and
+stored as fixed-width neighbour tables (-1 padded), which search reads
+straight from memory-mapped arrays:
+    layer 0   neighbours of every point, 2 * m wide
+    layer l   sorted ids of the points reaching layer l, and their
+              neighbours, m wide
+"""
+
+import heapq
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 100
+HNSW_EF_SEARCH = 128
+
+# (ids of the points on the layer, None for all; neighbour table)
+Layer = Tuple[Optional[np.ndarray], np.ndarray]
+
+
+def _search_layer(
+    vectors: np.ndarray,
+    query: np.ndarray,
+    entry_points: Sequence[int],
+    ef: int,
+    neighbors: Callable[[int], Sequence[int]],
+) -> List[Tuple[float, int]]:
+    """The `ef` most similar points reachable from the entry points, as (similarity, id)."""
+    visited = set(entry_points)
+    similarities = (vectors[list(entry_points)] @ query).tolist()
+    candidates = [(-similarity, point) for similarity, point in zip(similarities, entry_points)]
+    heapq.heapify(candidates)
+    results = [(similarity, point) for similarity, point in zip(similarities, entry_points)]
+    heapq.heapify(results)
+
+    while candidates:
+        negative, point = heapq.heappop(candidates)
+        if len(results) >= ef and -negative < results[0][0]:
+            break
+        fresh = [neighbor for neighbor in neighbors(point) if neighbor not in visited]
+        if not fresh:
+            continue
+        visited.update(fresh)
+        for similarity, neighbor in zip((vectors[fresh] @ query).tolist(), fresh):
+            if len(results) < ef or similarity > results[0][0]:
+                heapq.heappush(candidates, (-similarity, neighbor))
+                heapq.heappush(results, (similarity, neighbor))
+                if len(results) > ef:
+                    heapq.heappop(results)
+    return results
+
+
+def _select_neighbors(vectors: np.ndarray, base: np.ndarray, candidates: Sequence[int], m: int) -> List[int]:
+    """
+    Up to `m` candidates, nearest first, skipping any that is closer to
+    an already selected one than to `base`: links then reach out in
+    different directions, which keeps clusters connected to each other.
+    """
+    candidates = list(candidates)
+    order = np.argsort(-(vectors[candidates] @ base))
+    selected: List[int] = []
+    for i in order.tolist():
+        candidate = candidates[i]
+        if selected:
+            to_selected = vectors[selected] @ vectors[candidate]
+            if to_selected.max() > float(vectors[candidate] @ base):
+                continue
+        selected.append(candidate)
+        if len(selected) == m:
+            break
+    return selected
+
+
+class HnswGraph:
+    """Search over a built graph; arrays may be memory-mapped."""
+
+    def __init__(self, vectors: np.ndarray, layers: List[Layer], entry_point: int):
+        self.vectors = vectors
+        self.layers = layers
+        self.entry_point = entry_point
+
+    def neighbors(self, point: int, level: int) -> List[int]:
+        ids, table = self.layers[level]
+        row = point if ids is None else int(np.searchsorted(ids, point))
+        links = table[row]
+        return links[links >= 0].tolist()
+
+    def search(self, query: np.ndarray, k: int, ef: int = HNSW_EF_SEARCH) -> List[Tuple[float, int]]:
+        """Approximate top `k` (similarity, id), best first."""
+        if len(self.vectors) == 0:
+            return []
+        entry = self.entry_point
+        for level in range(len(self.layers) - 1, 0, -1):
+            nearest = _search_layer(
+                self.vectors, query, [entry], 1, lambda point: self.neighbors(point, level)
+            )
+            entry = max(nearest)[1]
+        found = _search_layer(
+            self.vectors, query, [entry], max(ef, k), lambda point: self.neighbors(point, 0)
+        )
+        return heapq.nlargest(k, found)
+
+
+def build_hnsw(
+    vectors: np.ndarray,
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+    seed: int = 0,
+) -> HnswGraph:
+    """
+    Graph over L2-normalized vectors, points inserted in order.
+
+    Each point links to up to `m` of the nearest points found on every
+    layer it reaches; a point whose links overflow (2 * m on layer 0, m
+    above) selects among them again.
+    """
+    count = len(vectors)
+    rng = np.random.default_rng(seed)
+    levels = np.floor(-np.log(1.0 - rng.random(count)) / math.log(m)).astype(np.int64)
+    top_level = int(levels.max()) if count else 0
+    graph: List[Dict[int, List[int]]] = [{} for _ in range(top_level + 1)]
+
+    entry, entry_level = 0, -1
+    for point in range(count):
+        level = int(levels[point])
+        query = vectors[point]
+        nearest = entry
+        for layer in range(entry_level, level, -1):
+            nearest = max(_search_layer(vectors, query, [nearest], 1, graph[layer].__getitem__))[1]
+
+        for layer in range(min(level, entry_level), -1, -1):
+            found = _search_layer(vectors, query, [nearest], ef_construction, graph[layer].__getitem__)
+            capacity = 2 * m if layer == 0 else m
+            chosen = _select_neighbors(vectors, query, [neighbor for _, neighbor in found], m)
+            graph[layer][point] = chosen
+            for neighbor in chosen:
+                links = graph[layer][neighbor]
+                links.append(point)
+                if len(links) > capacity:
+                    graph[layer][neighbor] = _select_neighbors(vectors, vectors[neighbor], links, capacity)
+            nearest = max(found)[1]
+
+        for layer in range(max(entry_level + 1, 0), level + 1):
+            graph[layer][point] = []
+        if level > entry_level:
+            entry, entry_level = point, level
+
+    layers: List[Layer] = []
+    for layer, links in enumerate(graph):
+        width = 2 * m if layer == 0 else m
+        ids = np.array(sorted(links), dtype=np.int32)
+        table = np.full((len(ids), width), -1, dtype=np.int32)
+        for row, point in enumerate(ids.tolist()):
+            table[row, :len(links[point])] = links[point]
+        layers.append((None if layer == 0 else ids, table))
+    return HnswGraph(vectors, layers, entry)
@@ -0,0 +1,310 @@
+"""
+In-process vector index of the law chunks.
+
+Holds the same points as the Qdrant collection (chunk embeddings and
+payloads) and answers the calls the request path makes on
+AsyncQdrantClient (query_points, query_batch_points, count, scroll) with
+Qdrant's own response models, so semantic search, law details and agent
+retrieval run unchanged on either store. Used when Qdrant cannot be reached
+(VECTOR_STORE=auto) or instead of it (VECTOR_STORE=local): queries are
+answered in-process, with no network hop.
+
+Built by scripts/build_vector_index.py. Layout of the index directory:
+    meta.json         format version, embedding model id, dimension,
+                      point count, index kind, HNSW parameters, build time
+    vectors.npy       float32 (count, dimension), L2-normalized; memory-mapped
+    payloads.json     point payloads, as imported into Qdrant
+    hnsw_<l>.npy      HNSW neighbour table of layer l (hnsw index only)
+    hnsw_<l>_ids.npy  ids of the points on layer l >= 1
+
+Index kinds:
+    flat  exact inner product with every vector; a few thousand chunks
+          take well under a millisecond, faster than any graph walk
+    hnsw  approximate, for HNSW_MIN_POINTS points and more
+Similarities are cosine, as in the Qdrant collection. Filtered queries
+score exactly the points passing the filter, whatever the index kind.
+"""
+
+import json
+import logging
+import shutil
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.core.qdrant_schema import article_fields
+
+from .filters import group_by_field, must_conditions, payload_matcher
+from .hnsw import HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH, HNSW_M, HnswGraph, build_hnsw
+
+logger = logging.getLogger(__name__)
+
+VECTOR_INDEX_FORMAT_VERSION = 1
+
+FLAT = "flat"
+HNSW = "hnsw"
+
+# Points from which the builder picks an HNSW graph over a flat scan
+HNSW_MIN_POINTS = 50_000
+
+# Distinct filters whose matching points are remembered
+FILTER_CACHE_SIZE = 256
+
+# Keyword fields whose exact matches start from their points
+KEYWORD_FIELDS = ("slug", "so_hieu")
+
+
+class VectorIndexError(Exception):
+    """Raised when a vector index is missing, corrupt or built for another model."""
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def write_vector_index(
+    path: Path,
+    vectors: np.ndarray,
+    payloads: Sequence[dict],
+    model: str,
+    kind: Optional[str] = None,
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+) -> dict:
+    """
+    Write an index directory, replacing any previous one whole.
+
+    `kind` defaults to hnsw from HNSW_MIN_POINTS points, flat below.
+    Returns the index metadata.
+    """
+    path = Path(path)
+    vectors = _normalized(np.asarray(vectors, dtype=np.float32))
+    if len(vectors) != len(payloads):
+        raise ValueError(f"{len(vectors)} vectors for {len(payloads)} payloads")
+    kind = kind or (HNSW if len(vectors) >= HNSW_MIN_POINTS else FLAT)
+
+    staging = path.with_name(path.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    np.save(staging / "vectors.npy", vectors)
+    with open(staging / "payloads.json", "w", encoding="utf-8") as f:
+        json.dump(list(payloads), f, ensure_ascii=False)
+
+    meta = {
+        "format": VECTOR_INDEX_FORMAT_VERSION,
+        "model": model,
+        "dimension": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+        "count": len(vectors),
+        "kind": kind,
+        "built_at": time.time(),
+    }
+    if kind == HNSW:
+        graph = build_hnsw(vectors, m=m, ef_construction=ef_construction)
+        for level, (ids, table) in enumerate(graph.layers):
+            np.save(staging / f"hnsw_{level}.npy", table)
+            if ids is not None:
+                np.save(staging / f"hnsw_{level}_ids.npy", ids)
+        meta.update(levels=len(graph.layers), entry_point=graph.entry_point, m=m)
+
+    with open(staging / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    previous = path.with_name(path.name + ".old")
+    shutil.rmtree(previous, ignore_errors=True)
+    if path.exists():
+        path.rename(previous)
+    staging.rename(path)
+    shutil.rmtree(previous, ignore_errors=True)
+    return meta
+
+
+class LocalVectorIndex:
+    """
+    Memory-mapped index answering the request path's Qdrant calls.
+
+    `collection_name` arguments are accepted for call compatibility and
+    ignored: an index holds one collection.
+
+    Raises:
+        VectorIndexError: If the index is missing or corrupt, or was
+            embedded by another model than `expected_model`
+    """
+
+    def __init__(self, path: str, expected_model: Optional[str] = None):
+        self.path = Path(path)
+        try:
+            with open(self.path / "meta.json", "r", encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("format") != VECTOR_INDEX_FORMAT_VERSION:
+                raise VectorIndexError(f"Unsupported vector index format {self.meta.get('format')}")
+            if expected_model and self.meta.get("model") != expected_model:
+                raise VectorIndexError(
+                    f"Vector index embedded by '{self.meta.get('model')}', queries by '{expected_model}'"
+                )
+
+            self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+            with open(self.path / "payloads.json", "r", encoding="utf-8") as f:
+                self.payloads: List[dict] = json.load(f)
+
+            self.graph: Optional[HnswGraph] = None
+            if self.meta["kind"] == HNSW:
+                layers = []
+                for level in range(self.meta["levels"]):
+                    table = np.load(self.path / f"hnsw_{level}.npy", mmap_mode="r")
+                    ids = np.load(self.path / f"hnsw_{level}_ids.npy", mmap_mode="r") if level else None
+                    layers.append((ids, table))
+                self.graph = HnswGraph(self.vectors, layers, self.meta["entry_point"])
+        except VectorIndexError:
+            raise
+        except (OSError, ValueError, KeyError) as e:
+            raise VectorIndexError(f"Cannot load vector index from {self.path}: {str(e)}") from e
+
+        if len(self.vectors) != len(self.payloads):
+            raise VectorIndexError(f"Vector index {self.path} has {len(self.vectors)} vectors "
+                                   f"for {len(self.payloads)} payloads")
+
+        # Indexes built before slug and nam were imported get them at load
+        for payload in self.payloads:
+            if "slug" not in payload:
+                payload.update(article_fields(payload.get("loai_van_ban", ""), payload.get("so_hieu", "")))
+
+        self._by_keyword = {field: group_by_field(self.payloads, field) for field in KEYWORD_FIELDS}
+        self._filter_cache: Dict[str, np.ndarray] = {}
+
+    @property
+    def count_points(self) -> int:
+        return len(self.payloads)
+
+    def _matching(self, payload_filter: Optional[models.Filter]) -> Optional[np.ndarray]:
+        """Positions of the points passing a filter, None for no filter."""
+        matcher: Optional[Callable[[dict], bool]] = payload_matcher(payload_filter)
+        if matcher is None:
+            return None
+
+        key = payload_filter.model_dump_json()
+        positions = self._filter_cache.get(key)
+        if positions is not None:
+            return positions
+
+        candidates: Sequence[int] = range(len(self.payloads))
+        for condition in must_conditions(payload_filter):
+            # Article lookups start from the article's points
+            if condition.key in self._by_keyword and isinstance(condition.match, models.MatchValue):
+                candidates = self._by_keyword[condition.key].get(condition.match.value, [])
+                break
+        positions = np.array([i for i in candidates if matcher(self.payloads[i])], dtype=np.int64)
+
+        if len(self._filter_cache) >= FILTER_CACHE_SIZE:
+            self._filter_cache.clear()
+        self._filter_cache[key] = positions
+        return positions
+
+    def search(
+        self,
+        query: Sequence[float],
+        k: int,
+        payload_filter: Optional[models.Filter] = None,
+    ) -> List[Tuple[float, int]]:
+        """Top `k` (similarity, position), best first."""
+        if k <= 0 or not self.payloads:
+            return []
+        vector = _normalized(np.asarray(query, dtype=np.float32))
+        positions = self._matching(payload_filter)
+
+        if positions is None and self.graph is not None:
+            return self.graph.search(vector, k, ef=max(HNSW_EF_SEARCH, k))
+
+        if positions is None:
+            similarities = self.vectors @ vector
+        else:
+            if not len(positions):
+                return []
+            similarities = self.vectors[positions] @ vector
+        if k < len(similarities):
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(len(similarities))
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        found = top if positions is None else positions[top]
+        return list(zip(similarities[top].tolist(), found.tolist()))
+
+    async def query_points(
+        self,
+        collection_name: Optional[str] = None,
+        query: Optional[Sequence[float]] = None,
+        query_filter: Optional[models.Filter] = None,
+        limit: int = 10,
+        offset: int = 0,
+        with_payload: bool = True,
+    ) -> models.QueryResponse:
+        offset = offset or 0
+        hits = self.search(query, offset + limit, query_filter)[offset:]
+        return models.QueryResponse(points=[
+            models.ScoredPoint(
+                id=position,
+                version=0,
+                score=similarity,
+                payload=self.payloads[position] if with_payload else None,
+            )
+            for similarity, position in hits
+        ])
+
+    async def query_batch_points(
+        self,
+        collection_name: Optional[str] = None,
+        requests: Sequence[models.QueryRequest] = (),
+    ) -> List[models.QueryResponse]:
+        """One response per request, as query_points answers it (raw vector queries only)."""
+        return [
+            await self.query_points(
+                query=request.query,
+                query_filter=request.filter,
+                limit=request.limit or 10,
+                offset=request.offset or 0,
+                with_payload=request.with_payload is not False,
+            )
+            for request in requests
+        ]
+
+    async def count(
+        self,
+        collection_name: Optional[str] = None,
+        count_filter: Optional[models.Filter] = None,
+        exact: bool = True,
+    ) -> models.CountResult:
+        positions = self._matching(count_filter)
+        return models.CountResult(count=self.count_points if positions is None else len(positions))
+
+    async def scroll(
+        self,
+        collection_name: Optional[str] = None,
+        scroll_filter: Optional[models.Filter] = None,
+        limit: int = 10,
+        offset: Optional[int] = None,
+        with_payload: bool = True,
+        with_vectors: bool = False,
+    ) -> Tuple[List[models.Record], Optional[int]]:
+        """Points in id order from `offset`, and the id to continue from (None at the end)."""
+        positions = self._matching(scroll_filter)
+        if positions is None:
+            positions = np.arange(self.count_points)
+        start = int(np.searchsorted(positions, offset or 0))
+        page = positions[start:start + limit].tolist()
+        records = [
+            models.Record(
+                id=position,
+                payload=self.payloads[position] if with_payload else None,
+                vector=self.vectors[position].tolist() if with_vectors else None,
+            )
+            for position in page
+        ]
+        following = start + limit
+        return records, int(positions[following]) if following < len(positions) else None
+
+    async def close(self) -> None:
+        """Nothing to release; the mapping closes with the process."""
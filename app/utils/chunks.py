@@ -0,0 +1,124 @@
+"""
+Splitting of articles into vector database chunks, and their reassembly.
+
+scripts/import_local.py and scripts/build_vector_index.py split each
+article into overlapping chunks (RecursiveCharacterTextSplitter,
+CHUNK_OVERLAP characters of overlap); joining them back needs the
+overlap removed once.
+
+A long article has several chunks near a query, which would take
+several result slots with overlapping text; collapse_by_article keeps
+one result per article, its best chunk merged with the retrieved chunks
+adjacent to it.
+"""
+
+from typing import Dict, Hashable, List, Sequence, TypeVar
+
+CHUNK_SIZE = 800
+CHUNK_OVERLAP = 150
+
+# Chunks fetched per wanted article before collapsing by article
+CHUNK_OVERFETCH = 3
+
+Point = TypeVar("Point")
+
+# Overlap configured for the splitter, with slack for whitespace trimming
+MAX_CHUNK_OVERLAP = 200
+
+# Shorter common text is coincidence ("a" ending one chunk and starting the next)
+MIN_CHUNK_OVERLAP = 10
+
+
+def split_article(content: str) -> List[str]:
+    """Chunks of an article's content, in order (chunk_index)."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    return splitter.split_text(content)
+
+
+def _overlap(left: str, right: str, max_overlap: int) -> int:
+    """Length of the longest suffix of `left` that is a prefix of `right`."""
+    for length in range(min(len(left), len(right), max_overlap), MIN_CHUNK_OVERLAP - 1, -1):
+        if left.endswith(right[:length]):
+            return length
+    return 0
+
+
+def merge_chunks(chunks: Sequence[str], max_overlap: int = MAX_CHUNK_OVERLAP) -> str:
+    """
+    Join consecutive chunks of one text, dropping the text they share.
+
+    Chunks that do not overlap are joined with a space (the splitter cut
+    them at a separator).
+
+    Examples:
+        ["Điều 1. Phạm vi điều chỉnh", "Phạm vi điều chỉnh của Luật"]
+            -> "Điều 1. Phạm vi điều chỉnh của Luật"
+    """
+    parts: List[str] = []
+    previous = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if not parts:
+            parts.append(chunk)
+        else:
+            shared = _overlap(previous, chunk, max_overlap)
+            parts.append(chunk[shared:] if shared else " " + chunk)
+        previous = chunk
+    return "".join(parts)
+
+
+def _chunk_text(payload: dict) -> str:
+    return payload.get("page_content") or payload.get("combine_Article_Content", "")
+
+
+def chunk_article_key(payload: dict) -> Hashable:
+    """Article of a chunk payload: (law name, so_hieu), as article numbers repeat across laws."""
+    return payload.get("loai_van_ban", ""), payload.get("so_hieu", "")
+
+
+def _merge_adjacent(best: Point, chunks: Sequence[Point]) -> Point:
+    """`best` with its text extended over the retrieved chunks next to it."""
+    by_index: Dict[int, Point] = {}
+    for point in chunks:
+        index = (point.payload or {}).get("chunk_index")
+        if index is not None:
+            by_index.setdefault(index, point)
+
+    first = last = (best.payload or {}).get("chunk_index")
+    if first is None:
+        # Imported before chunk_index existed: adjacency unknown
+        return best
+    while first - 1 in by_index:
+        first -= 1
+    while last + 1 in by_index:
+        last += 1
+    if first == last:
+        return best
+
+    text = merge_chunks([_chunk_text(by_index[index].payload) for index in range(first, last + 1)])
+    return best.model_copy(update={"payload": {**best.payload, "page_content": text, "chunk_index": first}})
+
+
+def collapse_by_article(points: Sequence[Point]) -> List[Point]:
+    """
+    One point per article (law name and so_hieu), in order of each
+    article's best chunk; `points` are vector search hits, best first.
+
+    The kept point has the best chunk's score; its page_content is the
+    contiguous run of retrieved chunks around the best one, merged
+    without their overlap. Other chunks of the article are dropped.
+
+    Examples:
+        Điều 5 #1 (0.9), Điều 7 #0 (0.8), Điều 5 #2 (0.7), Điều 5 #4 (0.6)
+            -> Điều 5 #1-2 (0.9), Điều 7 #0 (0.8)
+    """
+    articles: Dict[Hashable, List[Point]] = {}
+    for point in points:
+        articles.setdefault(chunk_article_key(point.payload or {}), []).append(point)
+    return [
+        chunks[0] if len(chunks) == 1 else _merge_adjacent(chunks[0], chunks)
+        for chunks in articles.values()
+    ]
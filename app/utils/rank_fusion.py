@@ -0,0 +1,36 @@
+"""
+Reciprocal rank fusion of result rankings.
+
+BM25F scores and cosine similarities live on unrelated scales, so the
+lexical and dense rankings of hybrid retrieval are merged by rank alone:
+a result scores sum(weight / (k + rank)) over the rankings it appears
+in, ranks counted from 1 (Cormack et al., 2009). k = 60 damps the
+difference between the very first ranks so that agreement between the
+rankings outweighs a single first place.
+"""
+
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]],
+    k: int = RRF_K,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fused (key, score) list, best first; ties keep first-seen order.
+
+    A key repeated within one ranking (several chunks of one article)
+    counts once, at its first position, and the keys after it move up.
+
+    Examples:
+        [["a", "b"], ["b", "c"]] -> [("b", 1/62 + 1/61), ("a", 1/61), ("c", 1/62)]
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: Dict[Hashable, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, key in enumerate(dict.fromkeys(ranking), start=1):
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,47 @@
+"""
+Opaque pagination cursors for search results.
+
+A cursor is URL-safe base64 of a small JSON object recording where the
+previous page stopped (a score position in fast mode, a Qdrant offset
+in semantic mode) together with a fingerprint of the query, so it
+cannot be replayed against a different search.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor is malformed or belongs to another query."""
+
+
+def query_fingerprint(*parts: Any) -> str:
+    """Short stable hash of the parameters that define a result list."""
+    text = "\x1f".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Serialize a cursor state into an opaque URL-safe token."""
+    raw = json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Dict[str, Any]:
+    """
+    Parse a cursor and check it was issued for the query `fingerprint`.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or for another query
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise InvalidCursorError("Malformed search cursor") from e
+
+    if not isinstance(state, dict) or state.get("q") != fingerprint:
+        raise InvalidCursorError("Search cursor does not belong to this query")
+    return state
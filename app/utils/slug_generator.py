@@ -15,6 +15,8 @@ def normalize_text(text: str) -> str:
         "Điều 1" -> "Dieu 1"
         "Phạm vi" -> "Pham vi"
     """
+    # "Đ"/"đ" are base letters, not D + combining mark, so NFD keeps them
+    text = text.replace('Đ', 'D').replace('đ', 'd')
     # Decompose Vietnamese characters
     nfd = unicodedata.normalize('NFD', text)
     # Remove combining characters (accents, diacritics)
@@ -103,6 +105,17 @@ def create_law_slug(law_id: str, law_title: str = None) -> str:
     return slug
 
 
+def fold_legacy_slug(slug: str) -> str:
+    """
+    Current form of a slug generated before Đ/đ folding.
+    
+    Examples:
+        "đieu-1-luat-doanh-nghiep-2020" -> "dieu-1-luat-doanh-nghiep-2020"
+        "dieu-1" -> "dieu-1"
+    """
+    return slug.replace('đ', 'd')
+
+
 if __name__ == "__main__":
     # Test examples
     test_cases = [
@@ -2,26 +2,41 @@ import axiosInstance from "@/shared/api/axiosInstance";
 
 export interface LawItem {
   id?: string;
+  key?: string;
   title: string;
   type: string;
   year?: string;
   authority?: string;
   description?: string;
   content?: string;
+  snippet?: string;
+  highlights?: [number, number][];
   articles?: string[];
 }
 
 export interface SearchResponse {
   results: LawItem[];
   total: number;
+  total_exact?: boolean;
+  next_cursor?: string | null;
+  facets?: Record<string, { value: string; count: number }[]>;
   filters_applied?: {
     law_name?: string;
     document_type?: string;
     article_number?: string;
     year?: string;
+    chapter?: string;
+    article_range?: string;
   };
 }
 
+export interface SuggestItem {
+  text: string;
+  kind: "law" | "article" | "title";
+  law_name?: string | null;
+  key?: string | null;
+}
+
 export interface SavedLaw {
   id: number;
   law_id: string;
@@ -54,7 +69,9 @@ export async function searchLaws(
   article_filter?: string,
   skip: number = 0,
   limit: number = 20,
-  mode: "fast" | "semantic" = "fast",
+  mode: "fast" | "semantic" | "hybrid" = "fast",
+  cursor?: string,
+  view: "full" | "compact" = "full",
 ): Promise<SearchResponse> {
   const response = await axiosInstance.post("/search/search", null, {
     params: {
@@ -66,12 +83,24 @@ export async function searchLaws(
       article_filter,
       skip,
       limit,
+      cursor,
+      view,
     },
   });
 
   return response.data;
 }
 
+export async function suggestLaws(
+  q: string,
+  limit: number = 8,
+): Promise<SuggestItem[]> {
+  const response = await axiosInstance.get("/search/suggest", {
+    params: { q, limit },
+  });
+  return response.data.suggestions;
+}
+
 export async function getLawDetail(
   lawId: string,
   source: "auto" | "json" | "qdrant" = "auto",
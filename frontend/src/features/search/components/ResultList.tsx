@@ -2,37 +2,70 @@ import { useSearchStore } from "../model/searchStore";
 import { useTrackingStore } from "../model/trackingStore";
 import { Link, useNavigate } from "react-router-dom";
 import { useState } from "react";
-import { saveLawAndCreateSession } from "../api/searchApi";
+import {
+  getLawDetail,
+  saveLawAndCreateSession,
+  type LawItem,
+} from "../api/searchApi";
+
+// Render a snippet with its [start, end) highlight offsets as <mark>s
+function HighlightedSnippet({
+  text,
+  highlights = [],
+}: {
+  text: string;
+  highlights?: [number, number][];
+}) {
+  const parts: React.ReactNode[] = [];
+  let last = 0;
+  highlights.forEach(([start, end], i) => {
+    if (start > last) parts.push(text.slice(last, start));
+    parts.push(
+      <mark key={i} className="bg-yellow-100 text-gray-900 rounded px-0.5">
+        {text.slice(start, end)}
+      </mark>,
+    );
+    last = end;
+  });
+  if (last < text.length) parts.push(text.slice(last));
+  return <>{parts}</>;
+}
 
 export default function ResultList() {
-  const { results, keyword, loading, loadingMore, hasMore, loadMore } =
+  const { results, total, keyword, loading, loadingMore, hasMore, loadMore } =
     useSearchStore();
   const { saveLaw } = useTrackingStore();
   const navigate = useNavigate();
   const [savingId, setSavingId] = useState<string | null>(null);
   const [savedLaws, setSavedLaws] = useState<Set<string>>(new Set());
 
-  const handleSaveLaw = async (e: React.MouseEvent, law: any) => {
+  const handleSaveLaw = async (e: React.MouseEvent, law: LawItem) => {
     e.preventDefault();
     e.stopPropagation();
+    const lawId = law.id;
+    if (!lawId) return;
 
-    setSavingId(law.id);
+    setSavingId(lawId);
     try {
+      // Compact search results leave out the full text; fetch it for saving
+      const content =
+        law.content ?? (await getLawDetail(law.key || lawId, "json")).content;
+
       // Save law first
       await saveLaw(
-        law.id,
+        lawId,
         law.title,
         law.type,
         law.year,
         law.authority,
-        law.content,
+        content,
       );
-      setSavedLaws((prev) => new Set([...prev, law.id]));
+      setSavedLaws((prev) => new Set([...prev, lawId]));
 
       // Then create session and navigate
-      const result = await saveLawAndCreateSession(law.id);
+      const result = await saveLawAndCreateSession(law.key || lawId);
       // Use slug for URL if available, otherwise fall back to law.id
-      const lawPath = result.slug || law.id;
+      const lawPath = result.slug || lawId;
       navigate(`/law-detail/${lawPath}`, {
         state: { sessionId: result.session_id },
       });
@@ -76,13 +109,13 @@ export default function ResultList() {
   return (
     <div className="space-y-6">
       <div className="text-sm text-gray-600">
-        Tìm thấy <strong>{results.length}</strong> kết quả
+        Tìm thấy <strong>{Math.max(total, results.length)}</strong> kết quả
       </div>
 
       <div className="space-y-3">
         {results.map((law) => (
-          <div key={law.id} className="flex gap-3 items-start">
-            <Link to={`/law/${law.id}?keyword=${keyword}`} className="flex-1">
+          <div key={law.key || law.id} className="flex gap-3 items-start">
+            <Link to={`/law/${law.key || law.id}?keyword=${keyword}`} className="flex-1">
               <div className="bg-white p-4 rounded-lg shadow hover:shadow-md transition cursor-pointer border border-gray-100 hover:border-blue-400">
                 <div className="mb-2">
                   {law.id && (
@@ -114,8 +147,15 @@ export default function ResultList() {
                   )}
                 </div>
 
-                <p className="text-sm text-gray-600 line-clamp-2 leading-relaxed">
-                  {law.description || law.content?.substring(0, 150)}
+                <p className="text-sm text-gray-600 line-clamp-3 leading-relaxed">
+                  {law.snippet ? (
+                    <HighlightedSnippet
+                      text={law.snippet}
+                      highlights={law.highlights}
+                    />
+                  ) : (
+                    law.description || law.content?.substring(0, 150)
+                  )}
                 </p>
 
                 <div className="mt-3 flex items-center text-blue-600 text-sm font-medium group">
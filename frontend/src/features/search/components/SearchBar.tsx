@@ -1,7 +1,48 @@
+import { useEffect, useState } from "react";
+import { useNavigate } from "react-router-dom";
 import { useSearchStore } from "../model/searchStore";
+import { suggestLaws, type SuggestItem } from "../api/searchApi";
+
+const KIND_LABELS: Record<SuggestItem["kind"], string> = {
+  law: "Luật",
+  article: "Điều",
+  title: "Tiêu đề",
+};
 
 export default function SearchBar() {
   const { keyword, setKeyword } = useSearchStore();
+  const navigate = useNavigate();
+  const [suggestions, setSuggestions] = useState<SuggestItem[]>([]);
+  const [open, setOpen] = useState(false);
+
+  // Search-as-you-type: completions are answered from memory, so a short
+  // debounce is enough
+  useEffect(() => {
+    const q = keyword.trim();
+    if (!q) {
+      setSuggestions([]);
+      return;
+    }
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      suggestLaws(q)
+        .then((items) => !cancelled && setSuggestions(items))
+        .catch(() => !cancelled && setSuggestions([]));
+    }, 100);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [keyword]);
+
+  const choose = (item: SuggestItem) => {
+    setOpen(false);
+    if (item.kind === "law" || !item.key) {
+      setKeyword(item.text);
+      return;
+    }
+    navigate(`/law/${encodeURIComponent(item.key)}`);
+  };
 
   return (
     <div className="bg-gradient-to-r from-blue-500 to-blue-600 p-8 rounded-xl shadow-lg">
@@ -14,7 +55,13 @@ export default function SearchBar() {
       <div className="relative">
         <input
           value={keyword}
-          onChange={(e) => setKeyword(e.target.value)}
+          onChange={(e) => {
+            setKeyword(e.target.value);
+            setOpen(true);
+          }}
+          onFocus={() => setOpen(true)}
+          onBlur={() => setTimeout(() => setOpen(false), 150)}
+          onKeyDown={(e) => e.key === "Escape" && setOpen(false)}
           className="w-full p-4 rounded-lg bg-white border-2 border-blue-500 focus:outline-none focus:ring-2 focus:ring-blue-300 text-lg"
           placeholder="Nhập từ khóa: Điều, luật, quyền, ..."
         />
@@ -26,6 +73,29 @@ export default function SearchBar() {
             ✕
           </button>
         )}
+        {open && suggestions.length > 0 && (
+          <ul className="absolute z-10 left-0 right-0 mt-1 bg-white rounded-lg shadow-lg divide-y max-h-96 overflow-y-auto">
+            {suggestions.map((item) => (
+              <li key={`${item.kind}-${item.key || item.text}`}>
+                <button
+                  onMouseDown={(e) => e.preventDefault()}
+                  onClick={() => choose(item)}
+                  className="w-full text-left px-4 py-2 hover:bg-blue-50"
+                >
+                  <span className="text-xs text-blue-600 mr-2">
+                    {KIND_LABELS[item.kind]}
+                  </span>
+                  <span className="text-gray-800">{item.text}</span>
+                  {item.law_name && (
+                    <span className="block text-xs text-gray-500">
+                      {item.law_name}
+                    </span>
+                  )}
+                </button>
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
     </div>
   );
@@ -8,6 +8,8 @@ interface SearchState {
   loadingMore: boolean;
   currentPage: number;
   skip: number;
+  total: number;
+  nextCursor: string | null;
   hasMore: boolean;
   setKeyword: (k: string) => void;
   setCurrentPage: (page: number) => void;
@@ -24,10 +26,20 @@ export const useSearchStore = create<SearchState>((set, get) => ({
   loadingMore: false,
   currentPage: 1,
   skip: 0,
+  total: 0,
+  nextCursor: null,
   hasMore: true,
 
   setKeyword: async (keyword) => {
-    set({ keyword, currentPage: 1, skip: 0, results: [], hasMore: true });
+    set({
+      keyword,
+      currentPage: 1,
+      skip: 0,
+      total: 0,
+      nextCursor: null,
+      results: [],
+      hasMore: true,
+    });
     await get().filterResults();
   },
 
@@ -36,9 +48,9 @@ export const useSearchStore = create<SearchState>((set, get) => ({
   },
 
   loadMore: async () => {
-    const { keyword, skip, results } = get();
+    const { keyword, skip, results, nextCursor } = get();
 
-    if (!keyword.trim() || !get().hasMore) {
+    if (!keyword.trim() || !get().hasMore || !nextCursor) {
       return;
     }
 
@@ -52,18 +64,19 @@ export const useSearchStore = create<SearchState>((set, get) => ({
         undefined,
         undefined,
         undefined,
-        newSkip,
+        0,
         ITEMS_PER_PAGE,
         "fast",
+        nextCursor,
+        "compact",
       );
 
-      const newResults = [...results, ...response.results];
-      const hasMore = response.results.length === ITEMS_PER_PAGE;
-
       set({
-        results: newResults,
+        results: [...results, ...response.results],
         skip: newSkip,
-        hasMore,
+        total: response.total,
+        nextCursor: response.next_cursor ?? null,
+        hasMore: Boolean(response.next_cursor),
       });
     } catch (error) {
       console.error("Load more error:", error);
@@ -92,18 +105,20 @@ export const useSearchStore = create<SearchState>((set, get) => ({
         0,
         ITEMS_PER_PAGE,
         "fast",
+        undefined,
+        "compact",
       );
 
-      const hasMore = response.results.length === ITEMS_PER_PAGE;
-
       set({
         results: response.results,
-        hasMore,
+        total: response.total,
+        nextCursor: response.next_cursor ?? null,
+        hasMore: Boolean(response.next_cursor),
         skip: 0,
       });
     } catch (error) {
       console.error("Search error:", error);
-      set({ results: [] });
+      set({ results: [], total: 0, nextCursor: null });
     } finally {
       set({ loading: false });
     }
@@ -0,0 +1,91 @@
+"""
+Compare the raw list-of-dicts corpus with the columnar LawCorpus store.
+
+Reports retained memory (tracemalloc) and the latency of building a
+20-item search page and of a detail lookup from each representation.
+Run: python scripts/bench_corpus.py
+"""
+
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.schemas.search import LawItem
+from app.services.law_index import LawCorpus, normalize_text
+
+DATA_FILE = Path(__file__).parent.parent / "app" / "core" / "raw_law_data.json"
+PAGE = 20
+REPEAT = 200
+
+
+def measure(build):
+    """Return (object, retained bytes) for `build()`."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, retained
+
+
+def timed(fn) -> float:
+    """Mean latency of `fn()` in microseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / REPEAT
+
+
+def load_raw():
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    raw, raw_bytes = measure(load_raw)
+    corpus, corpus_bytes = measure(lambda: LawCorpus.from_records(load_raw()))
+
+    ordinals = range(len(corpus) - PAGE, len(corpus))
+    target = raw[-1]["article_id"]
+
+    def raw_page():
+        # Previous path: lowercase fields and build an item for every hit
+        for item in raw[-PAGE:]:
+            item["article_title"].lower(), item["law_name"].lower(), item["content"].lower()
+            LawItem(
+                id=item["article_id"], title=item["law_name"], type="Luật",
+                description=item["article_title"][:200], content=item["content"],
+            )
+
+    def corpus_page():
+        for ordinal in ordinals:
+            LawItem(
+                id=corpus.article_ids[ordinal], title=corpus.law_name(ordinal), type="Luật",
+                description=corpus.article_titles[ordinal][:200], content=corpus.contents[ordinal],
+            )
+
+    def raw_detail():
+        for item in raw:
+            if item.get("article_id", "").lower() == target.lower():
+                return item
+
+    def corpus_detail():
+        key = normalize_text(target)
+        for ordinal, article_id_key in enumerate(corpus.article_id_keys):
+            if article_id_key == key:
+                return ordinal
+
+    print(f"{'':<16} {'memory MB':>10} {'page us':>9} {'detail us':>10}")
+    print(f"{'list of dicts':<16} {raw_bytes / 2**20:>10.2f} {timed(raw_page):>9.1f} {timed(raw_detail):>10.1f}")
+    print(f"{'LawCorpus':<16} {corpus_bytes / 2**20:>10.2f} {timed(corpus_page):>9.1f} {timed(corpus_detail):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
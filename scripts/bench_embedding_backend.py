@@ -0,0 +1,98 @@
+"""
+Latency and memory of the torch and ONNX int8 embedding backends.
+
+Each backend is loaded in its own process, so resident memory covers
+its runtime (PyTorch or ONNX Runtime) as well as the weights. Reports
+the RSS after loading and warming up, single query latency (p50 / p95)
+and the time of a 16 text batch, on article texts from
+raw_law_data.json.
+Run: python scripts/bench_embedding_backend.py [--model PATH_OR_NAME] [--onnx-dir DIR]
+"""
+
+import argparse
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DATA_FILE = Path(__file__).parent.parent / "app" / "core" / "raw_law_data.json"
+
+
+def rss_mb() -> float:
+    """Resident memory of this process (Linux)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def load_texts(count: int) -> list:
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    return [
+        f"{article.get('article_id', '')} {article.get('content', '')[:300]}"
+        for article in articles[:count]
+    ]
+
+
+def run_backend(backend: str, model: str, onnx_dir: str, texts: list, results) -> None:
+    base = rss_mb()
+    from app.core.embedding_backend import load_embeddings
+
+    embeddings = load_embeddings(model, backend=backend, onnx_dir=onnx_dir)
+    embeddings.embed_documents(texts[:16])  # Warm up
+
+    single = []
+    for text in texts:
+        start = time.perf_counter()
+        embeddings.embed_query(text)
+        single.append((time.perf_counter() - start) * 1000)
+
+    batches = []
+    for i in range(0, len(texts) - 15, 16):
+        start = time.perf_counter()
+        embeddings.embed_documents(texts[i:i + 16])
+        batches.append((time.perf_counter() - start) * 1000)
+
+    results[backend] = {
+        "rss": rss_mb() - base,
+        "p50": statistics.median(single),
+        "p95": statistics.quantiles(single, n=20)[18],
+        "batch": statistics.median(batches),
+    }
+
+
+def main():
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--onnx-dir", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--texts", type=int, default=128)
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts)
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        results = manager.dict()
+        for backend in ("torch", "onnx"):
+            process = context.Process(
+                target=run_backend, args=(backend, args.model, args.onnx_dir, texts, results)
+            )
+            process.start()
+            process.join()
+
+        print(f"{len(texts)} texts, model {args.model}")
+        print(f"{'backend':<8} {'RSS MB':>8} {'p50 ms':>8} {'p95 ms':>8} {'16-batch ms':>12}")
+        for backend, r in results.items():
+            print(f"{backend:<8} {r['rss']:>8.0f} {r['p50']:>8.1f} {r['p95']:>8.1f} {r['batch']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
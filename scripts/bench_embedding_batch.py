@@ -0,0 +1,97 @@
+"""
+Throughput of query embedding with N concurrent requests.
+
+Each simulated request embeds one distinct query (article titles from
+raw_law_data.json) from an asyncio task, the way search and retrieval
+do. Three strategies are compared:
+    inline   embed_query on the event loop thread (blocks every request)
+    thread   embed_query in the default executor, one forward pass per query
+    batched  EmbeddingBatcher (EMBEDDING_BATCH_SIZE / EMBEDDING_BATCH_WAIT_MS)
+Reports queries per second and p50 / p95 latency per request.
+Run: python scripts/bench_embedding_batch.py [--model PATH_OR_NAME]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DATA_FILE = Path(__file__).parent.parent / "app" / "core" / "raw_law_data.json"
+
+CONCURRENCY = (1, 4, 16, 32)
+
+
+def load_queries(count: int) -> list:
+    """Distinct article titles, without the "Điều N." prefix."""
+    with open(DATA_FILE, encoding="utf-8") as f:
+        titles = dict.fromkeys(item["article_title"].split(".", 1)[-1].strip() for item in json.load(f))
+    return [title for title in titles if title][:count]
+
+
+async def run(embed, queries: list, concurrency: int):
+    """(queries per second, latencies) of embedding `queries`, `concurrency` at a time."""
+    remaining = iter(queries)
+    latencies = []
+
+    async def client():
+        for query in remaining:
+            start = time.perf_counter()
+            await embed(query)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return len(queries) / (time.perf_counter() - start), latencies
+
+
+def percentile(values: list, fraction: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def main():
+    from app.core.config import settings
+    from app.core.embedding_batcher import EmbeddingBatcher
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--queries", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--wait-ms", type=float, default=settings.EMBEDDING_BATCH_WAIT_MS)
+    args = parser.parse_args()
+
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    embeddings = HuggingFaceEmbeddings(model_name=args.model)
+    queries = load_queries(args.queries)
+    embeddings.embed_documents(queries[:args.batch_size])  # Warm up
+    batcher = EmbeddingBatcher(embeddings.embed_documents, args.batch_size, args.wait_ms)
+
+    async def inline(query):
+        return embeddings.embed_query(query)
+
+    async def thread(query):
+        return await embeddings.aembed_query(query)
+
+    strategies = {"inline": inline, "thread": thread, "batched": batcher.embed}
+
+    print(f"{len(queries)} queries, batch size {args.batch_size}, wait {args.wait_ms:.0f} ms")
+    print(f"{'in flight':>10}{'strategy':>10}{'q/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for concurrency in CONCURRENCY:
+        for name, embed in strategies.items():
+            rate, latencies = await run(embed, queries, concurrency)
+            print(
+                f"{concurrency:>10}{name:>10}{rate:>10.1f}"
+                f"{statistics.median(latencies) * 1000:>10.1f}{percentile(latencies, 0.95) * 1000:>10.1f}"
+            )
+    print(f"\nbatched: {batcher.texts} texts in {batcher.batches} forward passes")
+    batcher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Throughput of semantic-search Qdrant calls with N requests in flight.
+
+A local stand-in answers Qdrant's REST query endpoint after a fixed
+delay (the time a real search spends in HNSW and on the network), so
+the benchmark measures how the API's access layer overlaps requests,
+not Qdrant itself. Two layers are compared, both issuing the same
+query_points call from asyncio tasks the way the API's request handlers
+do:
+    sync   QdrantClient called inside the coroutine (blocks the event
+           loop: requests run one after another)
+    async  AsyncQdrantClient configured as in app/core/clients.py
+           (requests overlap on pooled keep-alive connections)
+The stand-in runs in its own process and counts the TCP connections it
+accepted, to show they are reused. Throughput grows with the requests in
+flight until the CPU (client and stand-in together) is saturated. Run: python scripts/bench_qdrant_async.py [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+COLLECTION = "bench"
+CONCURRENCY = (1, 2, 4, 8, 16, 32)
+VECTOR = [0.1] * 384
+
+POINT = {
+    "id": 1,
+    "version": 0,
+    "score": 0.83,
+    "payload": {"so_hieu": "Điều 5", "loai_van_ban": "Luật Doanh nghiệp 2020", "page_content": "..."},
+}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Qdrant REST stand-in: every query returns one point after `latency`."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    latency = 0.02
+    connections = None  # Shared counter of accepted connections
+
+    def setup(self):
+        super().setup()
+        with self.connections.get_lock():
+            self.connections.value += 1
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+        body = json.dumps({"result": {"points": [POINT]}, "status": "ok", "time": self.latency}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(latency: float, connections, ready) -> None:
+    """Run the stand-in in its own process, off the benchmark's GIL."""
+    StandIn.latency = latency
+    StandIn.connections = connections
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    server.daemon_threads = True
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+async def run(call, concurrency: int, requests: int) -> float:
+    """Requests per second of `requests` calls, `concurrency` at a time."""
+    remaining = iter(range(requests))
+
+    async def client():
+        for _ in remaining:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--requests", type=int, default=320)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    context = multiprocessing.get_context("spawn")
+    connections, ready = context.Value("i", 0), context.Queue()
+    server = context.Process(target=serve, args=(args.latency_ms / 1000, connections, ready), daemon=True)
+    server.start()
+    port = ready.get()
+
+    options = dict(host="127.0.0.1", port=port, timeout=settings.QDRANT_TIMEOUT, check_compatibility=False)
+    sync_client = QdrantClient(**options)
+    # app.core.clients.qdrant_http_limits (that module needs the model packages)
+    limits = httpx.Limits(
+        max_connections=settings.QDRANT_POOL_SIZE,
+        max_keepalive_connections=settings.QDRANT_POOL_SIZE,
+    )
+    async_client = AsyncQdrantClient(**options, limits=limits)
+
+    async def sync_call():
+        sync_client.query_points(collection_name=COLLECTION, query=VECTOR, limit=10, with_payload=True)
+
+    async def async_call():
+        await asyncio.wait_for(
+            async_client.query_points(collection_name=COLLECTION, query=VECTOR, limit=10, with_payload=True),
+            settings.QDRANT_TIMEOUT,
+        )
+
+    print(f"Stand-in latency {args.latency_ms:.0f} ms, {args.requests} requests per run")
+    print(f"{'in flight':>10}{'sync req/s':>14}{'async req/s':>14}{'speedup':>10}{'connections':>13}")
+    for concurrency in CONCURRENCY:
+        sync_rate = await run(sync_call, concurrency, args.requests)
+        before = connections.value
+        async_rate = await run(async_call, concurrency, args.requests)
+        opened = connections.value - before
+        print(f"{concurrency:>10}{sync_rate:>14.1f}{async_rate:>14.1f}{async_rate / sync_rate:>9.1f}x{opened:>13}")
+
+    await async_client.close()
+    sync_client.close()
+    server.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Benchmark fast-mode keyword search as the corpus grows.
+
+Compares the old linear substring scan (first k hits in file order)
+with the inverted index, both unranked and BM25F top-k ranked, on
+synthetic corpora made by replicating raw_law_data.json.
+Run: python scripts/bench_search.py
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.law_index import InvertedIndex, BM25FScorer
+
+DATA_FILE = Path(__file__).parent.parent / "app" / "core" / "raw_law_data.json"
+
+QUERIES = [
+    "ly hôn",
+    "thừa kế theo di chúc",
+    "người lao động",
+    "công ty cổ phần",
+    "tài sản chung của vợ chồng",
+    "tội giết người",
+]
+SCALES = [1, 4, 16]
+LIMIT = 20
+REPEAT = 20
+
+
+def build_corpus(dataset: list, scale: int) -> list:
+    """Replicate the dataset `scale` times under distinct law names."""
+    corpus = []
+    for copy in range(scale):
+        for item in dataset:
+            corpus.append({**item, "law_name": f"{item['law_name']} #{copy}"})
+    return corpus
+
+
+def linear_scan(corpus: list, keyword: str, limit: int) -> list:
+    """Previous implementation: lowercase every field of every article."""
+    keyword_lower = keyword.lower()
+    results = []
+    for ordinal, item in enumerate(corpus):
+        if (
+            keyword_lower in item["article_title"].lower()
+            or keyword_lower in item["law_name"].lower()
+            or keyword_lower in item["content"].lower()
+        ):
+            results.append(ordinal)
+            if len(results) >= limit:
+                break
+    return results
+
+
+def timed(fn, *args) -> float:
+    """Mean latency of `fn(*args)` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(*args)
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        dataset = json.load(f)
+
+    print(
+        f"{'articles':>9} {'build ms':>9} {'scan ms':>9} "
+        f"{'index ms':>9} {'bm25f ms':>9} {'speedup':>8}"
+    )
+
+    for scale in SCALES:
+        corpus = build_corpus(dataset, scale)
+
+        start = time.perf_counter()
+        index = InvertedIndex.build(
+            (item["article_title"], item["law_name"], item["content"])
+            for item in corpus
+        )
+        scorer = BM25FScorer(index, (3.0, 1.5, 1.0))
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def ranked(query):
+            return scorer.top_k(index.resolve_terms(query), index.iter_matches(query), LIMIT)
+
+        # Queries not present anywhere force the scan through the whole corpus
+        queries = QUERIES + ["điều khoản không tồn tại xyz"]
+
+        scan_ms = sum(timed(linear_scan, corpus, q, LIMIT) for q in queries) / len(queries)
+        index_ms = sum(timed(index.search, q, LIMIT) for q in queries) / len(queries)
+        ranked_ms = sum(timed(ranked, q) for q in queries) / len(queries)
+
+        print(
+            f"{len(corpus):>9} {build_ms:>9.1f} {scan_ms:>9.3f} "
+            f"{index_ms:>9.3f} {ranked_ms:>9.3f} {scan_ms / ranked_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure per-worker memory of the corpus with N concurrent worker processes.
+
+Each worker loads the corpus the way an API worker does, runs a few
+searches, and reports its memory from /proc/self/smaps_rollup while all
+workers are alive (PSS splits shared pages between the processes that
+map them). Two modes are compared:
+    json      every worker parses the JSON and builds its indexes on its
+              own heap (no snapshot)
+    snapshot  every worker maps the same compiled snapshot
+Linux only. Run: python scripts/bench_workers.py [--workers 8]
+"""
+
+import argparse
+import multiprocessing
+import sys
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+QUERIES = ["hợp đồng", "ly hôn", "tai san chung vo chong", '"người lao động"', "Điều 5"]
+FIELDS = ("Rss", "Pss", "Private", "Shared")
+
+
+def memory_kb() -> dict:
+    """Rss / Pss / private / shared KB of this process."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "Rss": values["Rss"],
+        "Pss": values["Pss"],
+        "Private": values["Private_Clean"] + values["Private_Dirty"],
+        "Shared": values["Shared_Clean"] + values["Shared_Dirty"],
+    }
+
+
+def worker(mode: str, barrier, results) -> None:
+    from app.services.corpus_manager import CorpusManager, get_json_file_path, get_snapshot_path
+    from app.services.json_search_service import search_json_page
+
+    before = memory_kb()
+    if mode == "json":
+        manager = CorpusManager(get_json_file_path(), Path("/nonexistent.snapshot"), compile_snapshot=False)
+    else:
+        manager = CorpusManager(get_json_file_path(), get_snapshot_path())
+    current = manager.get()
+    # Only this manager's version: the global corpus_manager would map the snapshot in json mode too
+    for query in QUERIES:
+        search_json_page(query, corpus_version=current)
+        current.suggester.suggest(query)
+
+    # Measure while every worker is alive and mapped
+    barrier.wait()
+    after = memory_kb()
+    barrier.wait()
+    results.put({field: (after[field], after[field] - before[field]) for field in FIELDS})
+
+
+def run(mode: str, workers: int) -> list:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    # Compile the snapshot up front so workers only map it
+    from app.services.corpus_manager import corpus_manager
+    print(f"Corpus: {corpus_manager.get().source}\n")
+
+    print(f"{args.workers} workers, MB per worker (corpus delta after imports in brackets)")
+    print(f"{'mode':<10}" + "".join(f"{field:>18}" for field in FIELDS) + f"{'total PSS':>12}")
+    for mode in ("json", "snapshot"):
+        measurements = run(mode, args.workers)
+        row = f"{mode:<10}"
+        for field in FIELDS:
+            total = sum(m[field][0] for m in measurements) / len(measurements) / 1024
+            delta = sum(m[field][1] for m in measurements) / len(measurements) / 1024
+            row += f"{total:>10.1f} [{delta:>4.1f}]"
+        row += f"{sum(m['Pss'][0] for m in measurements) / 1024:>12.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compile raw_law_data.json and its search indexes into a binary snapshot.
+
+The API memory-maps the snapshot at startup instead of parsing JSON, and
+all workers share its pages. The API compiles a missing or stale
+snapshot itself on first load; run this to compile it ahead of a deploy
+(or where the app directory is read-only). A running server picks the
+new snapshot up via POST /admin/corpus/reload.
+Run: python scripts/build_law_snapshot.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.corpus_manager import (
+    build_json_corpus,
+    content_version,
+    get_json_file_path,
+    get_snapshot_path,
+)
+from app.services.law_index import LawSnapshot, write_snapshot
+
+
+def main():
+    json_path = get_json_file_path()
+    snapshot_path = get_snapshot_path()
+
+    if not json_path.exists():
+        print(f"❌ File not found: {json_path}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    corpus, index, lookup = build_json_corpus(json_path)
+    json_ms = (time.perf_counter() - start) * 1000
+
+    version = content_version(json_path)
+    size = write_snapshot(
+        snapshot_path, corpus, index, lookup,
+        source_path=json_path, corpus_version=version,
+    )
+    print(f"✅ Wrote {snapshot_path} ({size / 2**20:.2f} MB, corpus version {version})")
+    print(f"   {len(corpus)} articles, {index.term_count} terms")
+
+    start = time.perf_counter()
+    snapshot = LawSnapshot(snapshot_path)
+    mmap_ms = (time.perf_counter() - start) * 1000
+
+    assert len(snapshot.corpus) == len(corpus)
+    print(f"   Cold load: JSON parse + index build {json_ms:.1f} ms, snapshot mmap {mmap_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
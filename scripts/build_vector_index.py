@@ -0,0 +1,133 @@
+"""
+Build the in-process vector index (VECTOR_STORE=local / auto fallback).
+
+Sources:
+    json    split raw_law_data.json into chunks as import_local.py does
+            and embed them with the configured backend
+    qdrant  copy the points, vectors included, of the Qdrant collection,
+            so both stores serve identical vectors
+The index kind is flat below HNSW_MIN_POINTS points and hnsw above,
+unless --index says otherwise. A running API loads it at startup.
+Run: python scripts/build_vector_index.py [--source json|qdrant] [--index auto|flat|hnsw]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.embedding_backend import embedding_model_id, load_embeddings
+from app.core.qdrant_schema import article_fields
+from app.services.corpus_manager import get_json_file_path
+from app.services.vector_index import FLAT, HNSW, LocalVectorIndex, write_vector_index
+from app.utils.chunks import split_article
+
+QDRANT_SCROLL_BATCH = 512
+
+
+def chunks_from_json(batch_size: int):
+    """Embedded chunks of every article of the corpus file."""
+    with open(get_json_file_path(), "r", encoding="utf-8") as f:
+        dataset = json.load(f)
+
+    payloads = []
+    for article in dataset:
+        content = article.get("content", "")
+        if not content.strip():
+            continue
+        law_name, article_id = article.get("law_name", ""), article.get("article_id", "")
+        fields = article_fields(law_name, article_id)
+        for chunk_index, chunk in enumerate(split_article(content)):
+            payloads.append({
+                # Same payload as scripts/import_local.py
+                "so_hieu": article_id,
+                "loai_van_ban": law_name,
+                "page_content": chunk,
+                "chunk_index": chunk_index,
+                **fields,
+            })
+    print(f"📖 {len(dataset)} articles, {len(payloads)} chunks")
+
+    embeddings = load_embeddings(
+        settings.EMBEDDING_MODEL,
+        backend=settings.EMBEDDING_BACKEND,
+        onnx_dir=settings.EMBEDDING_ONNX_DIR,
+    )
+    vectors = []
+    for start in range(0, len(payloads), batch_size):
+        texts = [payload["page_content"] for payload in payloads[start:start + batch_size]]
+        vectors.extend(embeddings.embed_documents(texts))
+        print(f"   -> Embedded {min(start + batch_size, len(payloads))}/{len(payloads)} chunks...")
+    return np.array(vectors, dtype=np.float32), payloads
+
+
+def points_from_qdrant():
+    """Vectors and payloads of every point of the Qdrant collection."""
+    from qdrant_client import QdrantClient
+
+    client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT, timeout=60)
+    vectors, payloads = [], []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=settings.COLLECTION_NAME,
+            limit=QDRANT_SCROLL_BATCH,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        for point in points:
+            vectors.append(point.vector)
+            payloads.append(point.payload or {})
+        print(f"   -> Copied {len(payloads)} points...")
+        if offset is None:
+            break
+    client.close()
+    return np.array(vectors, dtype=np.float32), payloads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", choices=("json", "qdrant"), default="json")
+    parser.add_argument("--index", choices=("auto", FLAT, HNSW), default="auto")
+    parser.add_argument("--output", default=settings.VECTOR_INDEX_DIR)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.source == "json":
+        vectors, payloads = chunks_from_json(args.batch_size)
+    else:
+        vectors, payloads = points_from_qdrant()
+    print(f"✓ {len(payloads)} vectors in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    meta = write_vector_index(
+        Path(args.output),
+        vectors,
+        payloads,
+        model=embedding_model_id(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND),
+        kind=None if args.index == "auto" else args.index,
+    )
+    print(f"✅ Wrote {args.output} ({meta['kind']}, {meta['count']} x {meta['dimension']}) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    # Load it back the way the API does
+    index = LocalVectorIndex(args.output, expected_model=meta["model"])
+    probe = index.vectors[0] if index.count_points else None
+    if probe is not None:
+        start = time.perf_counter()
+        hits = index.search(probe, 10)
+        print(f"   Self-query: top hit {hits[0][1]} (score {hits[0][0]:.4f}) "
+              f"in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Export the embedding model to ONNX with int8 dynamic quantization.
+
+Writes model.onnx, model_int8.onnx, the tokenizer and the pooling config
+to EMBEDDING_ONNX_DIR, then checks that the quantized model agrees with
+the torch model (cosine similarity on article titles). Set
+EMBEDDING_BACKEND=onnx to use it in the API and in import_local.py;
+re-import the collection when switching, so that stored chunks and
+queries are embedded by the same model.
+Run: python scripts/export_onnx_embeddings.py [--model PATH_OR_NAME] [--output DIR]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.embedding_backend import ONNX_QUANTIZED_FILE, OnnxEmbeddings, export_onnx_model
+
+DATA_FILE = Path(__file__).parent.parent / "app" / "core" / "raw_law_data.json"
+
+# Lowest acceptable cosine similarity between torch and int8 vectors
+MIN_COSINE = 0.98
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--samples", type=int, default=256)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    output = export_onnx_model(args.model, args.output)
+    print(f"✅ Exported {args.model} to {output} in {time.perf_counter() - start:.1f}s")
+    for path in sorted(output.iterdir()):
+        print(f"   {path.name}: {path.stat().st_size / 2**20:.1f} MB")
+
+    with open(DATA_FILE, "r", encoding="utf-8") as f:
+        articles = json.load(f)
+    texts = [
+        f"{article.get('article_id', '')} {article.get('content', '')[:300]}"
+        for article in articles[:args.samples]
+    ]
+
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(args.model, device="cpu").encode(texts, batch_size=32)
+    quantized = np.array(OnnxEmbeddings(str(output), ONNX_QUANTIZED_FILE).embed_documents(texts))
+    cosine = (reference * quantized).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(quantized, axis=1)
+    )
+    print(f"   Parity with torch on {len(texts)} texts: "
+          f"mean cosine {cosine.mean():.5f}, min {cosine.min():.5f}")
+
+    if cosine.min() < MIN_COSINE:
+        print(f"❌ Quantized model drifts below cosine {MIN_COSINE}, keep EMBEDDING_BACKEND=torch")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
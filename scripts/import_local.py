@@ -1,17 +1,44 @@
+"""
+Import raw_law_data.json into the Qdrant collection.
+
+Pipeline:
+    chunk    articles are split into chunks in the main process
+    embed    batches of chunks go through embed_documents in a process
+             pool sized to the cores (one model and one thread per process)
+    upsert   concurrent threads write the embedded batches to Qdrant
+Bounded queues between the stages give backpressure: at most
+2 * workers batches are being embedded and 2 * upsert workers batches
+wait for Qdrant, so memory stays flat however large the corpus. Progress
+is reported in chunks/s, with an ETA by articles.
+Run: python scripts/import_local.py [--workers N] [--batch-size N]
+         [--upsert-workers N] [--upsert-batch-size N] [--dry-run]
+"""
+
+import argparse
 import json
+import multiprocessing
 import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
 from dotenv import load_dotenv
 from uuid import uuid4
 
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.models import PointStruct, VectorParams, Distance
 
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
+load_dotenv()
 
+# Allow importing app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-load_dotenv()
+from app.core.embedding_backend import load_embeddings
+from app.core.qdrant_schema import article_fields, ensure_payload_indexes
+from app.utils.chunks import split_article
 
 # =============================
 # CONFIG
@@ -21,37 +48,201 @@ QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "law_data")
 
+# Must match the API's embedding settings (app/core/config.py)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_DIR = os.getenv(
+    "EMBEDDING_ONNX_DIR", str(Path(__file__).parent.parent / "models" / "embedding-onnx")
+)
+
 DATA_FILE = "../data/raw_law_data.json"
 
+VECTOR_SIZE = 384
+
+# Chunks per embed_documents call. Torch gains from batching. The ONNX
+# default is single-core tuning: one int8 worker embeds 17.6 chunks/s at
+# batch 1 and 13.0 at batch 16 (padding and dynamic quantization cost
+# more than batching saves). Batch 1 costs ~0.3 ms of IPC per chunk in
+# the main process against ~57 ms of embedding, so the dispatcher only
+# becomes the bottleneck around 190 workers. Past that, or if a many-core
+# run measures faster, pass a larger --batch-size
+EMBED_BATCH_SIZE = {"torch": 64, "onnx": 1}
+
+# Points per upsert, and concurrent upserts
+UPSERT_BATCH_SIZE = 64
+UPSERT_WORKERS = 4
+
+# Seconds between progress lines
+PROGRESS_INTERVAL = 5.0
+
+
 # =============================
-# INIT CLIENTS
+# EMBEDDING WORKERS
 # =============================
 
-client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+# Model of a pool process, loaded once by _init_worker
+_worker_embeddings = None
 
-print("🔄 Loading embedding model...")
-embeddings_model = HuggingFaceEmbeddings(
-    model_name="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
-    model_kwargs={"device": "cpu"},
-)
 
-VECTOR_SIZE = 384
+def _init_worker():
+    global _worker_embeddings
+    if EMBEDDING_BACKEND == "torch":
+        import torch
+
+        # The pool already runs one process per core
+        torch.set_num_threads(1)
+    _worker_embeddings = load_embeddings(
+        EMBEDDING_MODEL,
+        backend=EMBEDDING_BACKEND,
+        onnx_dir=EMBEDDING_ONNX_DIR,
+        model_kwargs={"device": "cpu"},
+        threads=1,
+    )
+
+
+def _embed_batch(texts):
+    # float32 arrays pickle far smaller and faster than lists of floats
+    return np.asarray(_worker_embeddings.embed_documents(texts), dtype=np.float32)
+
 
 # =============================
-# TEXT SPLITTER (IMPORTANT)
+# PIPELINE STAGES
 # =============================
 
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=800,
-    chunk_overlap=150,
-)
+def iter_chunk_batches(dataset, batch_size):
+    """Batches of chunk payloads in corpus order, with the count of articles chunked so far."""
+    batch = []
+    for articles_done, article in enumerate(dataset, start=1):
+        content = article.get("content", "")
+
+        if not content.strip():
+            continue
+
+        law_name, article_id = article.get("law_name", ""), article.get("article_id", "")
+        # Canonical key and year, for exact lookups and the year filter
+        fields = article_fields(law_name, article_id)
+        for chunk_index, chunk in enumerate(split_article(content)):
+            batch.append({
+                # 👇 MUST MATCH retrieval_agent.py
+                "so_hieu": article_id,
+                "loai_van_ban": law_name,
+                "page_content": chunk,
+                # Order of the chunk in its article, for reassembly
+                "chunk_index": chunk_index,
+                **fields,
+            })
+            if len(batch) == batch_size:
+                yield batch, articles_done
+                batch = []
+
+    if batch:
+        yield batch, len(dataset)
+
+
+class Upserter:
+    """Upsert threads, each with its own client, draining a bounded queue of point batches.
+
+    The first failed upsert stops every thread; later batches are neither
+    written nor counted, and put/check/close raise the error.
+    """
+
+    def __init__(self, workers, dry_run=False):
+        self.dry_run = dry_run
+        self.queue = queue.Queue(maxsize=2 * workers)
+        self.uploaded = 0
+        self.error = None
+        self._failed = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def _run(self):
+        client = None if self.dry_run else QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, timeout=60)
+        try:
+            while not self._failed.is_set():
+                points = self.queue.get()
+                if points is None or self._failed.is_set():
+                    break
+                if client is not None:
+                    client.upsert(collection_name=COLLECTION_NAME, points=points)
+                with self._lock:
+                    self.uploaded += len(points)
+        except Exception as e:
+            with self._lock:
+                if self.error is None:
+                    self.error = e
+            self._failed.set()
+        finally:
+            if client is not None:
+                client.close()
+
+    def check(self):
+        if self._failed.is_set():
+            raise self.error
+
+    def _put(self, item):
+        # Blocks while Qdrant is behind, but not once the threads have stopped
+        while True:
+            self.check()
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    def put(self, points):
+        self._put(points)
+
+    def close(self):
+        for _ in self._threads:
+            try:
+                self._put(None)
+            except Exception:
+                break
+        if self._failed.is_set():
+            # Unblock threads still waiting on the queue
+            for _ in self._threads:
+                try:
+                    self.queue.put_nowait(None)
+                except queue.Full:
+                    break
+        for thread in self._threads:
+            thread.join()
+        self.check()
+
+
+class Progress:
+    def __init__(self, total_articles):
+        self.total_articles = total_articles
+        self.articles = 0
+        self.embedded = 0
+        self.start = time.perf_counter()
+        self._last = self.start
+
+    def rate(self):
+        return self.embedded / max(time.perf_counter() - self.start, 1e-9)
+
+    def report(self, uploaded, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = now
+        elapsed = now - self.start
+        fraction = self.articles / self.total_articles if self.total_articles else 1.0
+        eta = elapsed / fraction - elapsed if fraction else 0.0
+        print(
+            f"   -> {self.embedded} chunks embedded, {uploaded} uploaded | "
+            f"{self.articles}/{self.total_articles} articles | "
+            f"{self.rate():.1f} chunks/s | ETA {eta:.0f}s"
+        )
 
 
 # =============================
 # MAIN IMPORT FUNCTION
 # =============================
 
-def import_to_qdrant():
+def import_to_qdrant(workers, batch_size, upsert_workers, upsert_batch_size=UPSERT_BATCH_SIZE, dry_run=False):
 
     if not os.path.exists(DATA_FILE):
         print(f"❌ File not found: {DATA_FILE}")
@@ -62,73 +253,110 @@ def import_to_qdrant():
     with open(DATA_FILE, "r", encoding="utf-8") as f:
         dataset = json.load(f)
 
-    # Create collection if not exists
-    try:
-        client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=VectorParams(
-                size=VECTOR_SIZE,
-                distance=Distance.COSINE,
-            ),
-        )
-        print(f"✅ Created collection: {COLLECTION_NAME}")
-    except Exception:
-        print(f"ℹ️ Collection '{COLLECTION_NAME}' already exists")
+    if not dry_run:
+        client = QdrantClient(host=QDRANT_HOST, port=QDRANT_PORT)
+
+        # Create collection if not exists
+        try:
+            client.create_collection(
+                collection_name=COLLECTION_NAME,
+                vectors_config=VectorParams(
+                    size=VECTOR_SIZE,
+                    distance=Distance.COSINE,
+                ),
+            )
+            print(f"✅ Created collection: {COLLECTION_NAME}")
+        except Exception:
+            print(f"ℹ️ Collection '{COLLECTION_NAME}' already exists")
 
-    points = []
-    total_chunks = 0
+        # Index the filtered payload fields before upserting
+        ensure_payload_indexes(client, COLLECTION_NAME)
+        client.close()
 
+    print(f"🔄 Loading embedding model ({EMBEDDING_BACKEND}) in {workers} processes, "
+          f"{batch_size} chunks per call...")
     print(f"🚀 Processing {len(dataset)} law articles...")
 
-    for article in dataset:
-
-        law_name = article.get("law_name", "")
-        article_id = article.get("article_id", "")
-        content = article.get("content", "")
-
-        if not content.strip():
-            continue
-
-        # Split into chunks
-        chunks = text_splitter.split_text(content)
-
-        for chunk_index, chunk in enumerate(chunks):
-
-            vector = embeddings_model.embed_query(chunk)
-
-            payload = {
-                # 👇 MUST MATCH retrieval_agent.py
-                "so_hieu": article_id,
-                "loai_van_ban": law_name,
-                "page_content": chunk,
-            }
+    progress = Progress(len(dataset))
+    upserter = Upserter(upsert_workers, dry_run=dry_run)
+    pending = {}
+    points = []
 
-            point = PointStruct(
+    def upload(future):
+        payloads = pending.pop(future)
+        vectors = future.result()
+        points.extend(
+            PointStruct(
                 id=str(uuid4()),  # unique id
-                vector=vector,
+                vector=vector.tolist(),
                 payload=payload,
             )
-
-            points.append(point)
-            total_chunks += 1
-
-            # Batch upload
-            if len(points) >= 64:
-                client.upsert(
-                    collection_name=COLLECTION_NAME,
-                    points=points,
-                )
-                print(f"   -> Uploaded {total_chunks} chunks...")
-                points = []
-
-    if points:
-        client.upsert(
-            collection_name=COLLECTION_NAME,
-            points=points,
+            for vector, payload in zip(vectors, payloads)
         )
-
-    print(f"\n🎉 DONE! Total chunks indexed: {total_chunks}")
+        while len(points) >= upsert_batch_size:
+            upserter.put(points[:upsert_batch_size])
+            del points[:upsert_batch_size]
+        progress.embedded += len(payloads)
+        progress.report(upserter.uploaded)
+
+    # Spawned workers do not inherit the parent's threads (upserters)
+    context = multiprocessing.get_context("spawn")
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker) as pool:
+            try:
+                for payloads, articles_done in iter_chunk_batches(dataset, batch_size):
+                    # Stop chunking and embedding as soon as an upsert fails
+                    upserter.check()
+                    future = pool.submit(_embed_batch, [payload["page_content"] for payload in payloads])
+                    pending[future] = payloads
+                    progress.articles = articles_done
+
+                    # Backpressure: wait for the embedders before chunking further
+                    if len(pending) >= 2 * workers:
+                        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                        for finished in done:
+                            upload(finished)
+
+                while pending:
+                    done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        upload(finished)
+            except BaseException:
+                # Drop queued embeddings instead of finishing them on exit
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        if points:
+            upserter.put(points)
+        upserter.close()
+    except Exception as e:
+        try:
+            upserter.close()
+        except Exception:
+            pass
+        print(f"❌ Import stopped: {e!r}. Only {upserter.uploaded} chunks were uploaded, "
+              f"the collection '{COLLECTION_NAME}' is incomplete")
+        raise
+
+    progress.report(upserter.uploaded, force=True)
+    elapsed = time.perf_counter() - progress.start
+    print(f"\n🎉 DONE! Total chunks indexed: {upserter.uploaded} "
+          f"in {elapsed:.1f}s ({progress.rate():.1f} chunks/s)")
 
 
 if __name__ == "__main__":
-    import_to_qdrant()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Embedding processes")
+    parser.add_argument("--batch-size", type=int, default=EMBED_BATCH_SIZE.get(EMBEDDING_BACKEND, 64),
+                        help="Chunks per embedding call (the ONNX default of 1 is tuned on one core)")
+    parser.add_argument("--upsert-workers", type=int, default=UPSERT_WORKERS)
+    parser.add_argument("--upsert-batch-size", type=int, default=UPSERT_BATCH_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Chunk and embed only, write nothing")
+    args = parser.parse_args()
+
+    import_to_qdrant(
+        args.workers,
+        args.batch_size,
+        args.upsert_workers,
+        upsert_batch_size=args.upsert_batch_size,
+        dry_run=args.dry_run,
+    )
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Script chuyển slug của luật đã lưu sang dạng hiện tại (gộp Đ/đ thành d).
+Chạy một lần sau khi cập nhật: python scripts/migrate_saved_law_slugs.py
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db.session import SessionLocal
+from app.services.tracking_service import TrackingService
+
+def migrate_saved_law_slugs():
+    """Rewrite legacy saved-law slugs in place"""
+    print("Migrating saved law slugs...")
+    
+    db = SessionLocal()
+    try:
+        migrated, conflicts = TrackingService.migrate_legacy_slugs(db)
+        print(f"✓ {migrated} slugs migrated")
+        for slug in conflicts:
+            print(f"  ! Kept '{slug}': its current form is already saved")
+    except Exception as e:
+        db.rollback()
+        print(f"✗ Error migrating slugs: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate_saved_law_slugs()
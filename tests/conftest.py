@@ -0,0 +1,17 @@
+"""Dữ liệu dùng chung cho các test"""
+
+import pytest
+
+
+@pytest.fixture
+def documents():
+    """(article_title, content) of four small articles"""
+    return [
+        ("Điều 1. Phạm vi điều chỉnh", "Luật Doanh nghiệp quy định về doanh nghiệp"),
+        (
+            "Điều 51. Quyền yêu cầu giải quyết",
+            "Vợ, chồng có quyền yêu cầu Tòa án giải quyết ly hôn",
+        ),
+        ("Điều 56. Ly hôn theo yêu cầu của một bên", "Khi vợ hoặc chồng yêu cầu ly hôn"),
+        ("Điều 609. Quyền thừa kế", "Cá nhân có quyền lập di chúc để định đoạt tài sản"),
+    ]
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 import json
@@ -16,6 +17,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 # Import Graph của bạn
 from app.services.law_agent.graph import app as agent_app
+from app.core.clients import init_clients, close_clients
 from app.core.config import settings
 
 # 1. Cấu hình Model chấm điểm (Dùng GPT-4o-mini hoặc GPT-3.5 cho rẻ)
@@ -23,6 +25,20 @@ from app.core.config import settings
 evaluator_llm = ChatOpenAI(model="gpt-4o-mini", api_key=settings.OPENAI_API_KEY)
 evaluator_embeddings = OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY)
 
+async def run_agent(test_data):
+    # Các node của graph là async: chạy toàn bộ trên một event loop,
+    # cùng các client (Qdrant/vector index) mà retriever cần
+    init_clients()
+    outputs = []
+    try:
+        for item in test_data:
+            print(f" -> Đang test: {item['question']}")
+            inputs = {"query": item["question"], "chat_history": ""} # Tạm thời chưa test history
+            outputs.append(await agent_app.ainvoke(inputs))
+    finally:
+        await close_clients()
+    return outputs
+
 def run_evaluation():
     print("🚀 Bắt đầu quá trình Evaluation...")
     
@@ -36,16 +52,11 @@ def run_evaluation():
     contexts = []
 
     # 3. Chạy từng câu hỏi qua Chatbot
-    for item in test_data:
-        q = item["question"]
-        print(f" -> Đang test: {q}")
-        
-        # Gọi Chatbot
-        inputs = {"query": q, "chat_history": ""} # Tạm thời chưa test history
-        output = agent_app.invoke(inputs)
-        
+    outputs = asyncio.run(run_agent(test_data))
+
+    for item, output in zip(test_data, outputs):
         # Thu thập kết quả
-        questions.append(q)
+        questions.append(item["question"])
         ground_truths.append(item["ground_truth"])
         answers.append(output.get("generation", "Error"))
         
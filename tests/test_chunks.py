@@ -0,0 +1,57 @@
+"""Tests cho chunks module"""
+from qdrant_client import models
+
+from app.utils.chunks import collapse_by_article, merge_chunks
+
+
+def test_merge_chunks_drops_overlap():
+    """Test overlapping chunks are joined back into the original text"""
+    text = (
+        "Điều 1. Phạm vi điều chỉnh Luật này quy định về việc thành lập, tổ chức quản lý, "
+        "tổ chức lại, giải thể và hoạt động có liên quan của doanh nghiệp."
+    )
+    assert merge_chunks([text[:70], text[45:120], text[95:]]) == text
+    assert merge_chunks([text]) == text
+    assert merge_chunks([]) == ""
+
+
+def test_merge_chunks_without_overlap():
+    """Test chunks sharing only a few characters are not merged"""
+    assert merge_chunks(["Khoản 1 a", "a) Điểm a", ""]) == "Khoản 1 a a) Điểm a"
+
+
+def test_collapse_by_article_merges_adjacent_chunks():
+    """Test search hits are collapsed to one per article, adjacent chunks merged"""
+    text = (
+        "Người nào trộm cắp tài sản của người khác "
+        "trị giá từ 2.000.000 đồng trở lên thì bị phạt tù."
+    )
+    chunks = [text[:40], text[25:70], text[55:]]
+
+    def hit(point_id, score, law, article, index, content):
+        payload = {
+            "loai_van_ban": law,
+            "so_hieu": article,
+            "chunk_index": index,
+            "page_content": content,
+        }
+        return models.ScoredPoint(id=point_id, version=0, score=score, payload=payload)
+
+    hits = [
+        hit(1, 0.9, "Bộ luật Hình sự", "Điều 173", 1, chunks[1]),
+        hit(2, 0.8, "Bộ luật Dân sự", "Điều 173", 0, "Quyền chiếm hữu"),
+        hit(3, 0.7, "Bộ luật Hình sự", "Điều 173", 0, chunks[0]),
+        hit(4, 0.6, "Bộ luật Hình sự", "Điều 173", 2, chunks[2]),
+        hit(5, 0.5, "Bộ luật Hình sự", "Điều 174", 3, "Tội lừa đảo"),
+        hit(6, 0.4, "Bộ luật Hình sự", "Điều 174", 5, "không liền kề"),
+    ]
+    collapsed = collapse_by_article(hits)
+
+    assert [point.id for point in collapsed] == [1, 2, 5]
+    assert collapsed[0].score == 0.9
+    assert collapsed[0].payload["page_content"] == text
+    assert collapsed[0].payload["chunk_index"] == 0
+    # Non-adjacent chunks of an article are dropped
+    assert collapsed[2].payload["page_content"] == "Tội lừa đảo"
+    # The input hits are left unchanged
+    assert hits[0].payload["page_content"] == chunks[1]
@@ -0,0 +1,47 @@
+"""Tests cho citation module"""
+
+from app.services.law_index import ArticleLookup, CitationResolver, LawCorpus, extract_provision
+
+
+def test_citation_parse_and_resolve():
+    """Test citations with clause, point and law aliases resolve to articles"""
+    corpus = LawCorpus.from_records([
+        {
+            "article_id": "Điều 5",
+            "article_title": "Điều 5. A",
+            "content": (
+                "Điều 5. A 1. Một theo khoản 2 Điều 3. "
+                "2. Hai gồm: a) Thứ nhất; b) Thứ hai; c) Khác"
+            ),
+            "law_name": "Luật Doanh nghiệp 2020",
+        },
+        {
+            "article_id": "Điều 5",
+            "article_title": "Điều 5. B",
+            "content": "Nội dung",
+            "law_name": "Bộ luật Hình sự (Văn bản hợp nhất 2017)",
+        },
+    ])
+    resolver = CitationResolver(corpus.law_names)
+    lookup = ArticleLookup(corpus)
+
+    citation = resolver.parse("điểm b khoản 2 Điều 5 LDN")
+    assert (citation.article, citation.clause, citation.point) == ("5", "2", "b")
+    assert citation.law_name == "Luật Doanh nghiệp 2020" and citation.exact
+    assert citation.label() == "Điểm b khoản 2 Điều 5 Luật Doanh nghiệp 2020"
+    assert resolver.resolve(citation, lookup) == [0]
+
+    penal = "Bộ luật Hình sự (Văn bản hợp nhất 2017)"
+    assert resolver.parse("Dieu 5 bo luat hinh su quy dinh gi?").law_name == penal
+    assert resolver.parse("BLHS 2017 điều 5").exact
+    assert resolver.resolve(resolver.parse("Điều 5"), lookup) == [0, 1]
+    assert resolver.resolve(resolver.parse("Điều 5"), lookup, default_law=penal) == [1]
+    assert not resolver.parse("mức phạt theo Điều 5 LDN với doanh nghiệp").exact
+    assert resolver.parse("ly hôn") is None
+
+    content = corpus.contents[0]
+    # "khoản 2 Điều 3." inside clause 1 is not a clause marker
+    assert extract_provision(content, "1") == "1. Một theo khoản 2 Điều 3."
+    assert extract_provision(content, "2", "b") == "b) Thứ hai;"
+    assert extract_provision(content, "2", "c") == "c) Khác"
+    assert extract_provision(content, "3") is None
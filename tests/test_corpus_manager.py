@@ -0,0 +1,85 @@
+"""Tests cho corpus_manager module"""
+
+import json
+import time
+
+from app.services.corpus_manager import CorpusManager, content_version
+
+
+def test_corpus_manager_reload_swaps_versions(tmp_path):
+    """Test reload activates a new version while old references stay usable"""
+    json_path = tmp_path / "raw_law_data.json"
+    records = [
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Ly hôn",
+            "content": "Ly hôn",
+            "law_name": "Luật A",
+        },
+    ]
+    json_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+
+    manager = CorpusManager(json_path, tmp_path / "law_corpus.snapshot")
+    first = manager.get()
+    assert first.version == content_version(json_path)
+    # The missing snapshot is compiled (and recompiled when the JSON changes)
+    assert first.source == "snapshot law_corpus.snapshot"
+    in_heap = CorpusManager(json_path, tmp_path / "other.snapshot", compile_snapshot=False).get()
+    assert in_heap.source == "JSON file raw_law_data.json"
+    assert first.index.search("ly hôn") == [0]
+
+    records.append(
+        {
+            "article_id": "Điều 2",
+            "article_title": "Điều 2. Thừa kế",
+            "content": "Thừa kế",
+            "law_name": "Luật A",
+        },
+    )
+    json_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+
+    second = manager.reload()
+    assert second is manager.get() and second is not first
+    assert second.version != first.version
+    assert second.index.search("thừa kế") == [1]
+    # A request holding the old version still sees the old corpus
+    assert first.index.search("thừa kế") == []
+
+    # A failed reload keeps the active version
+    json_path.write_text("not json", encoding="utf-8")
+    assert manager.reload() is second
+    assert manager.info()["last_error"]
+
+
+def test_corpus_reload_request_reaches_other_workers(tmp_path):
+    """A reload requested in one worker is picked up by another sharing the snapshot directory"""
+    json_path = tmp_path / "raw_law_data.json"
+    records = [
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Ly hôn",
+            "content": "Ly hôn",
+            "law_name": "Luật A",
+        },
+    ]
+    json_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    workers = [CorpusManager(json_path, tmp_path / "law_corpus.snapshot") for _ in range(2)]
+    first = workers[1].get()
+
+    records.append(
+        {
+            "article_id": "Điều 2",
+            "article_title": "Điều 2. Thừa kế",
+            "content": "Thừa kế",
+            "law_name": "Luật A",
+        },
+    )
+    json_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    workers[0].request_reload()
+
+    # The next request after the poll interval starts the reload in the background
+    workers[1]._next_poll = 0.0
+    deadline = time.monotonic() + 10
+    while workers[1].get() is first and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert workers[1].get().index.search("thừa kế") == [1]
@@ -0,0 +1,73 @@
+"""Tests cho embedding_backend module"""
+
+import numpy as np
+import pytest
+
+from app.core.embedding_backend import (
+    ONNX_MODEL_FILE,
+    OnnxEmbeddings,
+    embedding_model_id,
+    export_onnx_model,
+    load_embeddings,
+)
+
+WORDS = "tội trộm cắp tài sản thủ tục ly hôn hợp đồng mua bán nhà đất thuế thu nhập cá nhân".split()
+TEXTS = ["tội trộm cắp tài sản", "thủ tục ly hôn", "hợp đồng mua bán nhà đất " * 8, "thuế"]
+
+
+def build_sentence_model(path):
+    """Small randomly initialized BERT with mean pooling, saved as a sentence-transformers model."""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    hf_dir = path / "hf"
+    hf_dir.mkdir()
+    vocab = hf_dir / "vocab.txt"
+    special = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    vocab.write_text("\n".join(special + WORDS), encoding="utf-8")
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(str(hf_dir))
+
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(WORDS) + 5, hidden_size=64, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=128,
+    )
+    BertModel(config).save_pretrained(str(hf_dir))
+
+    model = SentenceTransformer(
+        modules=[models.Transformer(str(hf_dir), max_seq_length=32), models.Pooling(64, "mean")],
+        device="cpu",
+    )
+    model.save(str(path / "model"))
+    return model, str(path / "model")
+
+
+def test_onnx_export_matches_torch_model(tmp_path):
+    """Exported fp32 and int8 models embed like the torch model (cosine agreement)."""
+    model, model_dir = build_sentence_model(tmp_path)
+    output = export_onnx_model(model_dir, str(tmp_path / "onnx"))
+
+    reference = model.encode(TEXTS)
+    for file_name, min_cosine in ((ONNX_MODEL_FILE, 0.9999), ("model_int8.onnx", 0.99)):
+        vectors = np.array(OnnxEmbeddings(str(output), file_name).embed_documents(TEXTS))
+        cosine = (reference * vectors).sum(axis=1) / (
+            np.linalg.norm(reference, axis=1) * np.linalg.norm(vectors, axis=1)
+        )
+        assert vectors.shape == reference.shape
+        assert cosine.min() > min_cosine, (file_name, cosine)
+
+    # Dynamic quantization scales activations per batch: batchmates shift a vector slightly
+    embeddings = load_embeddings(model_dir, backend="onnx", onnx_dir=str(output))
+    query = embeddings.embed_query(TEXTS[0])
+    assert np.allclose(query, embeddings.embed_documents(TEXTS)[0], atol=1e-2)
+
+
+def test_onnx_backend_requires_exported_model(tmp_path):
+    """Selecting the ONNX backend without an export fails fast; vectors are cached per backend."""
+    with pytest.raises(RuntimeError, match="export_onnx_embeddings"):
+        load_embeddings("some-model", backend="onnx", onnx_dir=str(tmp_path))
+
+    assert embedding_model_id("some-model", "torch") == "some-model"
+    assert embedding_model_id("some-model", "onnx") != "some-model"
@@ -0,0 +1,58 @@
+"""Tests cho embedding_batcher module"""
+
+import asyncio
+
+import pytest
+
+from app.core.embedding_batcher import EmbeddingBatcher
+
+
+def test_concurrent_queries_share_one_batch():
+    """Queries submitted together are embedded in one call, each getting its own vector."""
+    calls = []
+
+    def embed_documents(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(embed_documents, max_batch_size=8, max_wait_ms=50)
+
+    async def main():
+        texts = ["ly hôn", "thừa kế", "ly hôn", "a"]
+        return await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    try:
+        vectors = asyncio.run(main())
+    finally:
+        batcher.close()
+
+    assert vectors == [[6.0], [7.0], [6.0], [1.0]]
+    # Duplicates are embedded once
+    assert calls == [["ly hôn", "thừa kế", "a"]]
+
+
+def test_batch_size_limit_and_errors():
+    """Batches are capped at max_batch_size; a failing batch fails its callers only."""
+    calls = []
+
+    def embed_documents(texts):
+        calls.append(len(texts))
+        if "lỗi" in texts:
+            raise ValueError("model error")
+        return [[0.0] for _ in texts]
+
+    batcher = EmbeddingBatcher(embed_documents, max_batch_size=2, max_wait_ms=50)
+
+    async def main():
+        ok = await asyncio.gather(*(batcher.embed(f"q{n}") for n in range(5)))
+        with pytest.raises(ValueError):
+            await batcher.embed("lỗi")
+        return ok, await batcher.embed("sau lỗi")
+
+    try:
+        ok, after = asyncio.run(main())
+    finally:
+        batcher.close()
+
+    assert len(ok) == 5 and after == [0.0]
+    assert max(calls) <= 2
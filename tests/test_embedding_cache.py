@@ -0,0 +1,80 @@
+"""Tests cho embedding_cache module"""
+
+import asyncio
+
+from app.core.embedding_cache import EmbeddingCache, normalize_query, pack_vector, unpack_vector
+
+
+def test_normalized_keys_and_packing():
+    """Near-repeated queries share a key; vectors round-trip through float32 bytes."""
+    assert normalize_query("  Thủ tục  LY HÔN? ") == "thủ tục ly hôn"
+    assert normalize_query("thủ tục ly hôn") == "thủ tục ly hôn"
+    # Diacritics change the meaning, they are kept
+    assert normalize_query("bán nhà") != normalize_query("ban nhà")
+
+    vector = [0.25, -1.5, 3.0]
+    data = pack_vector(vector)
+    assert len(data) == 4 * len(vector)
+    assert unpack_vector(data) == vector
+    assert unpack_vector(b"abc") is None
+
+
+def test_memory_tier_lru_and_hit_rate():
+    """Repeats are served from memory, the oldest entry is evicted first."""
+    computed = []
+
+    async def compute(text):
+        computed.append(text)
+        return [float(len(text))]
+
+    cache = EmbeddingCache(compute, "test-model", max_entries=2, use_redis=False)
+
+    async def main():
+        await cache.embed("ly hôn")
+        await cache.embed("Ly hôn?")
+        await cache.embed("thừa kế")
+        await cache.embed("di chúc")  # Evicts "ly hôn"
+        await cache.embed("ly hôn")
+
+    asyncio.run(main())
+
+    assert computed == ["ly hôn", "thừa kế", "di chúc", "ly hôn"]
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 4
+    assert stats["hit_rate"] == 0.2
+
+
+def test_redis_down_does_not_stall_the_event_loop(monkeypatch):
+    """With Redis down, lookups back off instead of reconnecting on every query."""
+    from app.core import redis_client
+    from app.core.config import settings
+
+    # Nothing listens on port 1: the connection is refused
+    monkeypatch.setattr(settings, "REDIS_PORT", 1)
+    monkeypatch.setattr(redis_client, "_redis_client", None)
+    monkeypatch.setattr(redis_client, "_binary_redis_client", None)
+    monkeypatch.setattr(redis_client, "_retry_at", 0.0)
+
+    async def compute(text):
+        return [1.0]
+
+    cache = EmbeddingCache(compute, "test-model", use_redis=True)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        assert await cache.embed("ly hôn") == [1.0]
+        task.cancel()
+        return ticks
+
+    # The loop kept running while the Redis lookup was off on a thread
+    assert asyncio.run(main()) > 0
+    assert redis_client._retry_at > 0
+    assert redis_client.get_binary_redis() is None
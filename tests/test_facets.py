@@ -0,0 +1,47 @@
+"""Tests cho facets module"""
+
+from app.services.law_index import FacetIndex, LawCorpus, bitmap_from_ordinals, bitmap_ordinals
+
+
+def test_facet_bitmaps_and_counts():
+    """Test facet values, chapter recovery and counts with other filters applied"""
+    corpus = LawCorpus.from_records([
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Phạm vi",
+            "content": "Phạm vi",
+            "law_name": "Luật A",
+        },
+        {
+            "article_id": "Điều 2",
+            "article_title": "Điều 2. Giải thích",
+            "content": "Theo Chương V của Luật này. Chương II THÀNH LẬP",
+            "law_name": "Luật A",
+        },
+        {
+            "article_id": "Điều 3",
+            "article_title": "Điều 3. Thành lập",
+            "content": "Thành lập",
+            "law_name": "Luật A",
+        },
+        {
+            "article_id": "Điều 101",
+            "article_title": "Điều 101. Khác",
+            "content": "Khác",
+            "law_name": "Luật B",
+        },
+    ])
+    facets = FacetIndex.build(corpus)
+
+    assert list(bitmap_ordinals(bitmap_from_ordinals([0, 9, 3], 10))) == [0, 3, 9]
+    assert list(bitmap_ordinals(facets.bitmaps["chapter"]["Luật A - Chương I"])) == [0, 1]
+    assert list(bitmap_ordinals(facets.bitmaps["chapter"]["Luật A - Chương II"])) == [2]
+    assert list(bitmap_ordinals(facets.bitmaps["article_range"]["Điều 101-200"])) == [3]
+
+    everything = bitmap_from_ordinals(range(4), 4)
+    counts = facets.counts(everything, {"law_name": "Luật A"})
+    # The selected facet keeps counting every law; the others are narrowed
+    assert counts["law_name"] == [("Luật A", 3), ("Luật B", 1)]
+    assert counts["article_range"] == [("Điều 1-100", 3)]
+    assert facets.filter_bitmap({"law_name": "Luật A", "article_range": "Điều 101-200"}) == 0
+    assert facets.filter_bitmap({}) is None
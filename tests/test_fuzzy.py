@@ -0,0 +1,32 @@
+"""Tests cho fuzzy module"""
+
+from app.services.law_index import FuzzyTermMatcher, InvertedIndex
+from app.services.law_index.fuzzy import bounded_edit_distance, fold
+
+
+def test_fold_and_edit_distance():
+    """Test diacritic folding and bounded edit distance"""
+    assert fold("đơn phương") == "don phuong"
+    assert bounded_edit_distance("phuong", "phuong", 1) == 0
+    assert bounded_edit_distance("phuogn", "phuong", 2) == 2
+    assert bounded_edit_distance("phuogn", "phuong", 1) is None
+    assert bounded_edit_distance("ke", "kethua", 2) is None
+
+
+def test_fuzzy_matcher_accentless_and_typos(documents):
+    """Test accent-less, mis-accented and misspelled queries find the articles"""
+    index = InvertedIndex.build(documents)
+    matcher = FuzzyTermMatcher(index)
+
+    def search(query):
+        return list(index.iter_group_matches(matcher.resolve_terms(query)))
+
+    assert search("ly hon") == [1, 2]
+    assert search("ly hôn") == [1, 2]
+    assert search("quyen thua ke") == [3]
+    assert search("quyen thưà k") == [3]
+    assert search("yeu cau giai quyét") == [1]
+    assert search("thùa ke di chuc") == [3]
+    # Exact terms with diacritics are not widened to their folded siblings
+    assert matcher.resolve_token("hôn") == ["hôn"]
+    assert search("hon nhan") == []
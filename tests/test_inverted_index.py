@@ -0,0 +1,36 @@
+"""Tests cho inverted_index module"""
+
+from app.services.law_index import InvertedIndex, tokenize
+from app.services.law_index.inverted_index import intersect_postings
+
+
+def test_tokenize():
+    """Test tokenizer lowercases and splits on word boundaries"""
+    assert tokenize("Ly hôn, đơn phương!") == ["ly", "hôn", "đơn", "phương"]
+    assert tokenize("") == []
+
+
+def test_intersect_postings():
+    """Test intersection of sorted posting lists"""
+    assert list(intersect_postings([[1, 3, 5, 7], [3, 4, 7], [0, 3, 7, 9]])) == [3, 7]
+    assert list(intersect_postings([[1, 2], [3, 4]])) == []
+    assert list(intersect_postings([])) == []
+
+
+def test_search_all_terms(documents):
+    """Test search returns documents containing every term in corpus order"""
+    index = InvertedIndex.build(documents)
+    assert index.doc_count == 4
+    assert index.search("ly hôn") == [1, 2]
+    assert index.search("LY HÔN yêu cầu") == [1, 2]
+    assert index.search("ly hôn thừa kế") == []
+    assert index.search("ly hôn", limit=1) == [1]
+
+
+def test_search_prefix_last_term(documents):
+    """Test the last query term is matched as a prefix when incomplete"""
+    index = InvertedIndex.build(documents)
+    assert index.search("quyền thừa k") == [3]
+    assert index.search("thừ") == [3]
+    # Only the trailing term may be a prefix
+    assert index.search("thừ kế") == []
@@ -0,0 +1,56 @@
+"""Tests cho json_search_service module"""
+
+import json
+
+import pytest
+
+from app.services.corpus_manager import CorpusManager
+from app.services.json_search_service import search_json_page
+from app.utils.search_cursor import InvalidCursorError
+
+
+def test_search_page_total_and_cursor(tmp_path):
+    """Test cursor pages cover the ranking once, in order, with an exact total"""
+    json_path = tmp_path / "raw_law_data.json"
+    records = [
+        {
+            "article_id": f"Điều {i}",
+            "article_title": f"Điều {i}. Ly hôn",
+            "content": "Ly hôn " * (i % 4 + 1),
+            "law_name": "Luật A",
+        }
+        for i in range(1, 24)
+    ]
+    json_path.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    version = CorpusManager(json_path, tmp_path / "missing.snapshot").get()
+
+    everything = search_json_page("ly hôn", limit=100, corpus_version=version)
+    expected = [item.key for item in everything.results]
+    page = search_json_page("ly hôn", limit=5, corpus_version=version)
+    assert page.total == 23 and page.total_exact
+
+    keys = [item.key for item in page.results]
+    while page.next_cursor:
+        page = search_json_page("ly hôn", limit=5, cursor=page.next_cursor, corpus_version=version)
+        assert page.total == 23
+        keys += [item.key for item in page.results]
+    assert keys == expected
+
+    cursor = search_json_page("ly hôn", limit=5, corpus_version=version).next_cursor
+    with pytest.raises(InvalidCursorError):
+        search_json_page("hôn", cursor=cursor, corpus_version=version)
+    with pytest.raises(InvalidCursorError):
+        search_json_page("ly hôn", cursor="not-a-cursor", corpus_version=version)
+
+    filtered = search_json_page(
+        "ly hôn",
+        corpus_version=version,
+        facet_filters={"article_range": "Điều 1-100"},
+        with_facets=True,
+    )
+    assert filtered.total == 23
+    assert [(f.value, f.count) for f in filtered.facets["law_name"]] == [("Luật A", 23)]
+    other_law = search_json_page(
+        "ly hôn", corpus_version=version, facet_filters={"law_name": "Luật B"}
+    )
+    assert other_law.total == 0
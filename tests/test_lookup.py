@@ -0,0 +1,41 @@
+"""Tests cho lookup module"""
+
+from app.services.law_index import ArticleLookup, LawCorpus, article_key
+
+
+def test_article_lookup_disambiguates_laws():
+    """Test article lookup by canonical key, (law_name, article_id) and bare id"""
+    corpus = LawCorpus.from_records([
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Phạm vi",
+            "content": "...",
+            "law_name": "Luật Doanh nghiệp 2020",
+        },
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Phạm vi",
+            "content": "...",
+            "law_name": "Bộ luật Dân sự 2015",
+        },
+        {
+            "article_id": "Điều 1",
+            "article_title": "Điều 1. Trùng",
+            "content": "...",
+            "law_name": "Bộ luật Dân sự 2015",
+        },
+    ])
+    assert len(corpus) == 2  # duplicate (article_id, law_name) dropped
+
+    lookup = ArticleLookup(corpus)
+    key = article_key("Bộ luật Dân sự 2015", "Điều 1")
+    assert lookup.key_of(1) == key
+    assert lookup.resolve(key) == 1
+    assert lookup.resolve("điều 1", law_name="bộ luật dân sự 2015") == 1
+    assert lookup.resolve("Điều 1", law_name="Luật khác") is None
+    # Bare article id keeps the first article in corpus order
+    assert lookup.resolve("Điều 1") == 0
+    assert lookup.resolve("Điều 99") is None
+    # Slugs made before Đ/đ folding still resolve
+    assert lookup.resolve(key.replace("dieu", "đieu")) == 1
+    assert lookup.resolve("đieu-1") == 0
@@ -0,0 +1,52 @@
+"""Tests cho qdrant_schema module"""
+
+from qdrant_client import QdrantClient, models
+
+from app.core.qdrant_schema import (
+    article_fields,
+    backfill_article_fields,
+    build_filter,
+    ensure_payload_indexes,
+    law_year,
+)
+
+LAW_NAMES = ["Luật Doanh nghiệp 2020", "Bộ luật Dân sự 2015", "Bộ luật Dân sự 2015"]
+
+
+def test_article_fields_from_law_name():
+    """The year comes from the law name; the slug is the canonical article key"""
+    assert law_year("Luật Doanh nghiệp 2020") == "2020"
+    assert law_year("Bộ luật Hình sự (Văn bản hợp nhất 2017)") == "2017"
+    assert law_year("Luật Đất đai") == ""
+    assert article_fields("Luật Doanh nghiệp 2020", "Điều 1") == {
+        "slug": "dieu-1-luat-doanh-nghiep-2020",
+        "nam": "2020",
+    }
+
+
+def test_backfill_adds_fields_to_old_points():
+    """Points imported without slug/nam get them once, and the year filter then matches"""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "law_data", vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE)
+    )
+    client.upsert("law_data", points=[
+        models.PointStruct(id=i, vector=[1.0, float(i)], payload={
+            "so_hieu": "Điều 1",
+            "loai_van_ban": law_name,
+            "page_content": "...",
+            "chunk_index": 0,
+        })
+        for i, law_name in enumerate(LAW_NAMES)
+    ])
+
+    ensure_payload_indexes(client, "law_data")
+    assert backfill_article_fields(client, "law_data") == 0
+
+    records, _ = client.scroll("law_data", limit=10)
+    assert sorted(record.payload["slug"] for record in records) == [
+        "dieu-1-bo-luat-dan-su-2015", "dieu-1-bo-luat-dan-su-2015", "dieu-1-luat-doanh-nghiep-2020",
+    ]
+    assert client.count("law_data", count_filter=build_filter(year_filter="2015")).count == 2
+    # No point has an issuing authority: the filter is not applied
+    assert build_filter(authority_filter="Quốc hội") is None
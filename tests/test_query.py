@@ -0,0 +1,40 @@
+"""Tests cho query module"""
+
+from app.services.law_index import SEARCH_FIELDS, InvertedIndex, QueryEvaluator, parse_query
+
+
+def test_parse_query():
+    """Test query syntax parsing and plain keyword detection"""
+    assert parse_query("ly hôn", SEARCH_FIELDS) is None
+    assert parse_query("AND") is None
+    assert repr(parse_query('title:"ly hôn" OR NOT thế vị', SEARCH_FIELDS)) == (
+        "OrQuery(children=(PhraseQuery(tokens=('ly', 'hôn'), field=0), "
+        "NotQuery(child=PhraseQuery(tokens=('thế', 'vị'), field=None))))"
+    )
+    # Unbalanced input degrades instead of failing
+    assert repr(parse_query("(di chúc")) == (
+        "AndQuery(children=(TermQuery(token='di', field=None), "
+        "TermQuery(token='chúc', field=None)))"
+    )
+
+
+def test_phrase_and_boolean_queries(documents):
+    """Test phrases, AND/OR/NOT and field prefixes on the positional index"""
+    index = InvertedIndex.build(
+        (title, "Luật Hôn nhân và Gia đình", content) for title, content in documents
+    )
+    evaluator = QueryEvaluator(index)
+
+    def search(query):
+        return evaluator.evaluate(parse_query(query, SEARCH_FIELDS))
+
+    assert search('"yêu cầu ly hôn"') == [2]
+    assert search('"ly hôn yêu cầu"') == []
+    assert search('"vợ chồng"') == [1]  # punctuation between tokens is ignored
+    assert search("ly hôn AND NOT quyền") == [2]
+    assert search("di chúc OR doanh nghiệp") == [0, 3]
+    assert search("(di chúc OR doanh nghiệp) NOT phạm vi điều chỉnh") == [3]
+    assert search('title:"ly hôn"') == [2]
+    assert search('content:"ly hôn"') == [1, 2]
+    assert search("law:hôn NOT yêu cầu") == [0, 3]
+    assert evaluator.term_groups(parse_query("ly hôn NOT quyền")) == [["ly"], ["hôn"]]
@@ -0,0 +1,19 @@
+"""Tests cho rank_fusion module"""
+
+import pytest
+
+from app.utils.rank_fusion import reciprocal_rank_fusion
+
+
+def test_reciprocal_rank_fusion():
+    """Keys found by both rankings come first; repeats in one ranking count once"""
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "b", "c"]], k=60)
+
+    assert [key for key, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+    # "c" follows the repeated "b" at rank 2
+    assert fused[2][1] == pytest.approx(1 / 62)
+
+    weighted = reciprocal_rank_fusion([["a"], ["c"]], weights=[1.0, 2.0])
+    assert [key for key, _ in weighted] == ["c", "a"]
+    assert reciprocal_rank_fusion([]) == []
@@ -0,0 +1,48 @@
+"""Tests cho ranking module"""
+
+import pytest
+
+from app.services.law_index import BM25FScorer, InvertedIndex
+
+
+def test_bm25f_top_k(documents):
+    """Test BM25F ranks a title hit above a content-only hit"""
+    index = InvertedIndex.build(documents)
+    scorer = BM25FScorer(index, field_weights=(3.0, 1.0))
+    groups = index.resolve_terms("ly hôn")
+
+    top = scorer.top_k(groups, index.iter_matches("ly hôn"), k=2)
+    assert [ordinal for _, ordinal in top] == [2, 1]
+    assert top[0][0] > top[1][0] > 0
+
+    # k bounds the result size
+    assert len(scorer.top_k(groups, index.iter_matches("ly hôn"), k=1)) == 1
+    assert scorer.top_k(groups, index.iter_matches("ly hôn"), k=0) == []
+
+
+def test_bm25f_rank_any_matches_any_term(documents):
+    """Test any-term ranking scores like score() and keeps partial matches"""
+    index = InvertedIndex.build(documents)
+    scorer = BM25FScorer(index, field_weights=(3.0, 1.0))
+    groups = index.resolve_terms("ly hôn di chúc")
+
+    top = scorer.rank_any(groups, k=10)
+    # Document 0 has none of the terms; the title hit ranks first
+    assert sorted(ordinal for _, ordinal in top) == [1, 2, 3]
+    assert top[0][1] == 2
+    for score, ordinal in top:
+        assert score == pytest.approx(scorer.score(ordinal, groups))
+    assert len(scorer.rank_any(groups, k=1)) == 1
+
+
+def test_bm25f_coverage_weights_query_terms_by_idf(documents):
+    """Test coverage is the IDF share of query tokens a document contains"""
+    index = InvertedIndex.build(documents)
+    scorer = BM25FScorer(index, field_weights=(3.0, 1.0))
+    groups = index.resolve_terms("ly hôn di chúc")
+
+    assert scorer.coverage(0, groups) == 0.0
+    # "ly hôn" is in two documents, "di chúc" only in document 3: rarer, heavier
+    assert 0.0 < scorer.coverage(2, groups) < 0.5 < scorer.coverage(3, groups) < 1.0
+    assert scorer.coverage(3, index.resolve_terms("di chúc")) == 1.0
+    assert scorer.coverage(3, []) == 0.0
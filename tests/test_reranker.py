@@ -0,0 +1,51 @@
+"""Tests cho reranker module"""
+
+import asyncio
+import time
+
+from app.core.reranker import CrossEncoderReranker
+
+
+def overlap_scores(pairs):
+    """Relevance as the number of query words found in the passage."""
+    return [len(set(query.split()) & set(passage.split())) for query, passage in pairs]
+
+
+def test_rerank_orders_by_cross_encoder_score():
+    """Passages scored in time are ordered by score, best first."""
+    reranker = CrossEncoderReranker(overlap_scores, batch_size=2)
+    passages = ["thuế thu nhập", "tội trộm cắp tài sản", "hợp đồng mua bán", "trộm cắp"]
+
+    order, scored = asyncio.run(reranker.rerank("tội trộm cắp tài sản", passages, budget_ms=1000))
+    reranker.close()
+
+    assert scored == 4
+    assert order[:2] == [1, 3]
+    assert sorted(order) == [0, 1, 2, 3]
+
+
+def test_rerank_degrades_to_retrieval_order_past_budget():
+    """Batches past the budget are not waited for; unscored passages keep their order."""
+    calls = []
+
+    def slow_scores(pairs):
+        calls.append(len(pairs))
+        if len(calls) > 1:
+            time.sleep(0.2)
+        return overlap_scores(pairs)
+
+    reranker = CrossEncoderReranker(slow_scores, batch_size=2)
+    passages = ["a", "b c", "d", "c"]
+
+    start = time.perf_counter()
+    order, scored = asyncio.run(reranker.rerank("c", passages, budget_ms=50))
+    elapsed = time.perf_counter() - start
+
+    # First batch scored and reordered, second left in retrieval order
+    assert scored == 2
+    assert order == [1, 0, 2, 3]
+    assert elapsed < 0.15
+
+    order, scored = asyncio.run(reranker.rerank("c", passages, budget_ms=0))
+    reranker.close()
+    assert (order, scored) == ([0, 1, 2, 3], 0)
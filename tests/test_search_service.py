@@ -0,0 +1,88 @@
+"""Tests cho search_service module"""
+
+import asyncio
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient, models
+
+from app.core.config import settings
+from app.core.qdrant_schema import article_fields
+from app.services import search_service
+from app.services.search_service import fetch_article_page
+from app.services.vector_index import LocalVectorIndex, write_vector_index
+from app.utils.chunks import chunk_article_key, collapse_by_article
+
+
+def test_article_pages_resume_from_chunk_rank(tmp_path):
+    """Cursor pages read from a chunk rank match the collapsed ranking, no repeats or short pages"""
+    rng = np.random.default_rng(0)
+    payloads = []
+    for article in range(30):
+        law = "Bộ luật Dân sự" if article % 2 else "Bộ luật Hình sự"
+        for chunk_index in range(1 + article % 4):
+            payloads.append({
+                "so_hieu": f"Điều {article // 2}",
+                "loai_van_ban": law,
+                "page_content": f"{article}-{chunk_index}",
+                "chunk_index": chunk_index,
+            })
+    vectors = rng.normal(size=(len(payloads), 16)).astype(np.float32)
+    write_vector_index(tmp_path / "index", vectors, payloads, model="test-model")
+    index = LocalVectorIndex(str(tmp_path / "index"))
+    query = rng.normal(size=16).tolist()
+
+    async def main():
+        everything = (await index.query_points(query=query, limit=len(payloads))).points
+        expected = [chunk_article_key(point.payload) for point in collapse_by_article(everything)]
+
+        pages, start, more = [], 0, True
+        while more:
+            page = await fetch_article_page(index, query, None, start, 4)
+            pages.append([chunk_article_key(point.payload) for point in page.articles])
+            start, more = page.next_start, page.more
+        return expected, pages
+
+    expected, pages = asyncio.run(main())
+    assert [key for page in pages for key in page] == expected
+    assert all(len(page) == 4 for page in pages[:-1])
+    assert len(expected) == 30
+
+
+def test_law_detail_by_canonical_key(monkeypatch):
+    """Keys and (article, law) pairs resolve to one law; a bare shared article id does not"""
+    articles = [
+        ("Luật Doanh nghiệp 2020", "Điều 1", "Phạm vi điều chỉnh"),
+        ("Bộ luật Dân sự 2015", "Điều 1", "Bộ luật này quy định"),
+        ("Bộ luật Dân sự 2015", "Điều 700", "Quyền sử dụng đất"),
+    ]
+    client = AsyncQdrantClient(":memory:")
+    monkeypatch.setattr(search_service, "get_vector_store", lambda: client)
+
+    async def detail(law_id, law_name=None):
+        law = await search_service.get_law_detail(law_id, law_name)
+        return law and (law.key, law.title)
+
+    async def main():
+        await client.create_collection(
+            settings.COLLECTION_NAME,
+            vectors_config=models.VectorParams(size=3, distance=models.Distance.COSINE),
+        )
+        await client.upsert(settings.COLLECTION_NAME, points=[
+            models.PointStruct(id=i, vector=[float(i == j) for j in range(3)], payload={
+                "so_hieu": article_id,
+                "loai_van_ban": law_name,
+                "page_content": content,
+                "chunk_index": 0,
+                **article_fields(law_name, article_id),
+            })
+            for i, (law_name, article_id, content) in enumerate(articles)
+        ])
+
+        civil = ("dieu-1-bo-luat-dan-su-2015", "Bộ luật Dân sự 2015")
+        assert await detail("dieu-1-bo-luat-dan-su-2015") == civil
+        assert await detail("đieu-1-bo-luat-dan-su-2015") == civil
+        assert await detail("Điều 1", "bộ luật dân sự 2015") == civil
+        assert await detail("Điều 1") is None
+        assert await detail("dieu-700") == ("dieu-700-bo-luat-dan-su-2015", "Bộ luật Dân sự 2015")
+
+    asyncio.run(main())
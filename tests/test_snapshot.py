@@ -0,0 +1,69 @@
+"""Tests cho snapshot module"""
+
+from app.services.law_index import (
+    ArticleLookup,
+    BM25FScorer,
+    FuzzyTermMatcher,
+    InvertedIndex,
+    LawCorpus,
+    LawSnapshot,
+    PrefixSuggester,
+    QueryEvaluator,
+    SnapshotError,
+    parse_query,
+    write_snapshot,
+)
+
+
+def test_snapshot_roundtrip(tmp_path, documents):
+    """Test a memory-mapped snapshot answers like the in-memory index"""
+    corpus = LawCorpus.from_records([
+        {
+            "article_id": f"Điều {i}",
+            "article_title": title,
+            "content": content,
+            "law_name": "Luật Hôn nhân và Gia đình 2014",
+        }
+        for i, (title, content) in enumerate(documents, start=1)
+    ])
+    index = InvertedIndex.build(corpus.search_fields(o) for o in range(len(corpus)))
+    lookup = ArticleLookup(corpus)
+
+    path = tmp_path / "law_corpus.snapshot"
+    write_snapshot(path, corpus, index, lookup)
+    snapshot = LawSnapshot(path)
+
+    assert list(snapshot.corpus.article_ids) == list(corpus.article_ids)
+    assert snapshot.corpus.law_name(2) == "Luật Hôn nhân và Gia đình 2014"
+    assert snapshot.index.search("ly hôn") == index.search("ly hôn")
+    assert snapshot.index.search("thừ") == index.search("thừ")
+    assert snapshot.lookup.resolve(lookup.key_of(3)) == 3
+    query = parse_query('"yêu cầu ly hôn"')
+    assert QueryEvaluator(snapshot.index).evaluate(query) == [2]
+    assert QueryEvaluator(index).evaluate(query) == [2]
+
+    weights = (3.0, 1.5, 1.0)
+    groups = index.resolve_terms("yêu cầu ly hôn")
+    expected = BM25FScorer(index, weights).top_k(groups, index.iter_matches("yêu cầu ly hôn"), 3)
+    matches = snapshot.index.iter_matches("yêu cầu ly hôn")
+    actual = BM25FScorer(snapshot.index, weights).top_k(groups, matches, 3)
+    assert actual == expected
+
+    # Fuzzy and autocomplete tables are mapped, not rebuilt
+    matcher = FuzzyTermMatcher(index)
+    for query in ("yeu cau ly hon", "thua ke", "hon nhn"):
+        assert snapshot.matcher.resolve_terms(query) == matcher.resolve_terms(query)
+    suggester = PrefixSuggester.build(corpus, lookup)
+    assert snapshot.suggester.suggest("dieu 1") == suggester.suggest("dieu 1")
+    assert snapshot.suggester.suggest("hon nhan")[0].text == "Luật Hôn nhân và Gia đình 2014"
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test a file without the snapshot header is rejected"""
+    path = tmp_path / "not_a_snapshot"
+    path.write_bytes(b"{}" * 64)
+    try:
+        LawSnapshot(path)
+        assert False, "expected SnapshotError"
+    except SnapshotError:
+        pass
@@ -0,0 +1,21 @@
+"""Tests cho snippets module"""
+
+from app.services.law_index import make_snippet
+
+
+def test_make_snippet_highlights_terms():
+    """Test snippets are cut around query terms with offsets into the snippet"""
+    sentence = "Vợ, chồng có quyền yêu cầu Tòa án giải quyết ly hôn. "
+    text = "Phần mở đầu " * 30 + sentence + "Phần kết " * 30
+    snippet, highlights = make_snippet(text, {"ly", "hôn"}, fragment_length=60)
+
+    assert snippet.startswith("… ") and snippet.endswith(" …")
+    assert len(snippet) < 80
+    assert [snippet[start:end] for start, end in highlights] == ["ly", "hôn"]
+
+    # Without matches the snippet is the start of the text
+    snippet, highlights = make_snippet(
+        "Ly hôn theo yêu cầu của một bên", {"thừa"}, fragment_length=12
+    )
+    assert (snippet, highlights) == ("Ly hôn theo …", [])
+    assert make_snippet("", {"ly"}) == ("", [])
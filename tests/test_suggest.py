@@ -0,0 +1,51 @@
+"""Tests cho suggest module"""
+
+from app.services.law_index import ArticleLookup, LawCorpus, PrefixSuggester
+
+
+def test_prefix_suggester_completions():
+    """Test folded prefix completion of law names, article ids and titles"""
+    corpus = LawCorpus.from_records([
+        {
+            "article_id": "Điều 12",
+            "article_title": "Điều 12. Quyền yêu cầu ly hôn",
+            "content": "",
+            "law_name": "Luật Hôn nhân và Gia đình 2014",
+        },
+        {
+            "article_id": "Điều 120",
+            "article_title": "Điều 120. Hợp đồng",
+            "content": "",
+            "law_name": "Bộ luật Dân sự 2015",
+        },
+        {
+            "article_id": "Điều 12",
+            "article_title": "Điều 12. Hôn nhân",
+            "content": "",
+            "law_name": "Bộ luật Dân sự 2015",
+        },
+    ])
+    suggester = PrefixSuggester.build(corpus, ArticleLookup(corpus))
+
+    # Accent-less subject of a law name, ranked before article titles
+    suggestions = suggester.suggest("hon nh")
+    assert [(item.kind, item.text) for item in suggestions] == [
+        ("law", "Luật Hôn nhân và Gia đình 2014"),
+        ("title", "Điều 12. Hôn nhân"),
+    ]
+
+    # Exact article id first, then longer ids; one entry per article
+    suggestions = suggester.suggest("Điều 12")
+    assert [item.text for item in suggestions][:3] == ["Điều 12", "Điều 12", "Điều 120"]
+    assert {item.law_name for item in suggestions[:2]} == {
+        "Luật Hôn nhân và Gia đình 2014",
+        "Bộ luật Dân sự 2015",
+    }
+    assert len({id(item) for item in suggestions}) == len(suggestions)
+    assert all(item.key for item in suggestions if item.kind != "law")
+
+    accentless = suggester.suggest("quyen yeu")
+    assert [item.text for item in accentless] == ["Điều 12. Quyền yêu cầu ly hôn"]
+    assert suggester.suggest("dieu 12", limit=1)[0].kind == "article"
+    assert suggester.suggest("xyz") == []
+    assert suggester.suggest("   ") == []
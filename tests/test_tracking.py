@@ -0,0 +1,71 @@
+"""Tests cho tracking_service module"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.db.session import Base
+from app.services.law_index import article_key
+from app.services.tracking_service import TrackingService
+
+
+def make_db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.User(id=1, email="user@example.com", hashed_password="x"))
+    db.commit()
+    return db
+
+
+def test_save_law_dedups_on_canonical_key():
+    """Equal article ids of two laws are saved separately, the same article once"""
+    db = make_db()
+    enterprise = article_key("Luật Doanh nghiệp 2020", "Điều 1")
+    civil = article_key("Bộ luật Dân sự 2015", "Điều 1")
+
+    first = TrackingService.save_law(db, 1, "Điều 1", "Luật Doanh nghiệp 2020", law_key=enterprise)
+    second = TrackingService.save_law(db, 1, "Điều 1", "Bộ luật Dân sự 2015", law_key=civil)
+    again = TrackingService.save_law(db, 1, "Điều 1", "Bộ luật Dân sự 2015", law_key=civil)
+
+    assert first.id != second.id and again.id == second.id
+    assert (first.slug, second.slug) == (enterprise, civil)
+    assert TrackingService.is_law_saved(db, 1, civil)
+    assert TrackingService.unsave_law(db, 1, civil)
+    assert TrackingService.find_saved_law(db, 1, civil) is None
+    assert TrackingService.find_saved_law(db, 1, enterprise).id == first.id
+
+
+def test_legacy_slugs_migrate_once():
+    """Rows saved before Đ/đ folding are migrated once; legacy links and current keys then match"""
+    db = make_db()
+    legacy = "đieu-1-luat-doanh-nghiep-2020"
+    db.add(
+        models.SavedLaw(
+            user_id=1, law_id="Điều 1", law_title="Luật Doanh nghiệp 2020", slug=legacy
+        )
+    )
+    db.commit()
+
+    key = article_key("Luật Doanh nghiệp 2020", "Điều 1")
+    assert key == "dieu-1-luat-doanh-nghiep-2020"
+    assert TrackingService.migrate_legacy_slugs(db) == (1, [])
+    assert TrackingService.migrate_legacy_slugs(db) == (0, [])
+    assert TrackingService.find_saved_law_by_slug(db, key).slug == key
+    assert TrackingService.find_saved_law_by_slug(db, legacy).slug == key
+
+    # Saving the article again returns the migrated row instead of a duplicate
+    saved = TrackingService.save_law(db, 1, "Điều 1", "Luật Doanh nghiệp 2020", law_key=key)
+    assert saved.slug == key
+    assert db.query(models.SavedLaw).count() == 1
+
+
+def test_bare_article_id_only_matches_rows_without_law():
+    """A bare "Điều 1" does not pick one law's saved article over another's"""
+    db = make_db()
+    TrackingService.save_law(db, 1, "Điều 1", "Luật Doanh nghiệp 2020",
+                             law_key=article_key("Luật Doanh nghiệp 2020", "Điều 1"))
+    assert TrackingService.find_saved_law(db, 1, "Điều 1") is None
+
+    untitled = TrackingService.save_law(db, 1, "Điều 2", "")
+    assert TrackingService.find_saved_law(db, 1, "Điều 2").id == untitled.id
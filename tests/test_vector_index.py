@@ -0,0 +1,123 @@
+"""Tests cho vector_index module"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.core.qdrant_schema import build_filter
+from app.services.vector_index import (
+    FLAT,
+    HNSW,
+    LocalVectorIndex,
+    VectorIndexError,
+    build_hnsw,
+    write_vector_index,
+)
+from qdrant_client import models
+
+PAYLOADS = [
+    {
+        "so_hieu": "Điều 173",
+        "loai_van_ban": "Bộ luật Hình sự",
+        "page_content": "Tội trộm cắp tài sản",
+        "chunk_index": 0,
+    },
+    {
+        "so_hieu": "Điều 173",
+        "loai_van_ban": "Bộ luật Hình sự",
+        "page_content": "phạt tù từ 02 năm",
+        "chunk_index": 1,
+    },
+    {
+        "so_hieu": "Điều 51",
+        "loai_van_ban": "Luật Hôn nhân và gia đình",
+        "page_content": "Quyền yêu cầu ly hôn",
+        "chunk_index": 0,
+    },
+    {
+        "so_hieu": "Điều 430",
+        "loai_van_ban": "Bộ luật Dân sự",
+        "page_content": "Hợp đồng mua bán tài sản",
+        "chunk_index": 0,
+    },
+]
+
+
+def clustered_vectors(count, dimension, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(10, dimension))
+    vectors = centers[rng.integers(0, 10, count)] + 0.5 * rng.normal(size=(count, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def test_flat_index_answers_qdrant_calls(tmp_path):
+    """Search, count and scroll behave like the Qdrant collection, filters included."""
+    vectors = clustered_vectors(len(PAYLOADS), 8)
+    meta = write_vector_index(tmp_path / "index", vectors * 3, PAYLOADS, model="test-model")
+    assert meta["kind"] == FLAT
+
+    index = LocalVectorIndex(str(tmp_path / "index"), expected_model="test-model")
+
+    async def main():
+        response = await index.query_points("law_data", query=vectors[2].tolist(), limit=2)
+        assert response.points[0].id == 2
+        assert response.points[0].score == pytest.approx(1.0, abs=1e-5)
+        assert response.points[0].payload["so_hieu"] == "Điều 51"
+
+        # Text filters match by words, case-insensitively
+        penal = build_filter(type_filter="hình sự")
+        response = await index.query_points(
+            "law_data", query=vectors[3].tolist(), query_filter=penal, limit=10
+        )
+        assert sorted(point.id for point in response.points) == [0, 1]
+        assert (await index.count("law_data", count_filter=penal)).count == 2
+        assert (await index.count("law_data")).count == 4
+
+        article = models.Filter(must=[
+            models.FieldCondition(key="so_hieu", match=models.MatchValue(value="Điều 173")),
+        ])
+        records, offset = await index.scroll("law_data", scroll_filter=article, limit=1)
+        assert [record.payload["chunk_index"] for record in records] == [0] and offset == 1
+        records, offset = await index.scroll(
+            "law_data", scroll_filter=article, limit=1, offset=offset
+        )
+        assert [record.payload["chunk_index"] for record in records] == [1] and offset is None
+
+        # Payloads imported without slug/nam get them at load
+        by_key = models.Filter(must=[
+            models.FieldCondition(
+                key="slug", match=models.MatchValue(value="dieu-430-bo-luat-dan-su")
+            ),
+        ])
+        records, _ = await index.scroll("law_data", scroll_filter=by_key, limit=10)
+        assert [record.id for record in records] == [3] and records[0].payload["nam"] == ""
+
+    asyncio.run(main())
+
+    with pytest.raises(VectorIndexError):
+        LocalVectorIndex(str(tmp_path / "index"), expected_model="other-model")
+    with pytest.raises(VectorIndexError):
+        LocalVectorIndex(str(tmp_path / "missing"))
+
+
+def test_hnsw_index_recall_against_flat(tmp_path):
+    """The HNSW graph finds nearly all exact top-10 neighbours, from the memory-mapped files too."""
+    vectors = clustered_vectors(800, 32, seed=1)
+    payloads = [{"so_hieu": f"Điều {i}"} for i in range(len(vectors))]
+    write_vector_index(tmp_path / "index", vectors, payloads, model="test-model", kind=HNSW)
+    index = LocalVectorIndex(str(tmp_path / "index"))
+    assert index.graph is not None
+
+    queries = clustered_vectors(50, 32, seed=2)
+    recall = 0.0
+    for query in queries:
+        exact = set(np.argsort(-(vectors @ query))[:10].tolist())
+        found = [position for _, position in index.search(query, 10)]
+        recall += len(exact & set(found)) / 10
+    assert recall / len(queries) >= 0.9
+
+    # Built in memory, same graph
+    graph = build_hnsw(vectors)
+    in_memory = [position for _, position in graph.search(queries[0], 5)]
+    assert in_memory == [position for _, position in index.search(queries[0], 5)]